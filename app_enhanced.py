@@ -1,29 +1,50 @@
 import os
 import json
 import time
-from datetime import datetime, timedelta
-from flask import Flask, render_template_string, request, send_file, jsonify, redirect, url_for
+import re
+import uuid
+from datetime import datetime
+from flask import Flask, Response, g, make_response, render_template_string, request, send_file, jsonify, redirect, url_for, stream_with_context
 from dotenv import load_dotenv
 
-from collector.rss_client import fetch_feeds, load_feeds_config
-from collector.ariba_client import fetch_ariba_opportunities
-from collector.sesami_client import fetch_sesami_opportunities
-from collector.tenderboard_client import TenderBoardClient
-from collector.stlogs_client import STLogsClient
-from collector.jpmc_client import JPMCClient
-from collector.gebiz_client import GeBizClient
-from collector.html_fallback import fetch_today_opportunities
-from processor.normalize import normalize_items
-from exporter.excel import export_to_excel
-from util.date_filter import filter_by_date
+# Collectors (Selenium), normalize/date filtering (pandas) and the Excel writer
+# are imported where they are first used, so workers boot without them and
+# the index/selections pages never load them (benchmarks/bench_imports.py).
+from collector.rss_client import load_feeds_config
+from exporter.cache import ExportCache, cached_export
+from exporter.formats import EXPORT_FORMATS, EXPORT_MIMETYPES, stream_export
+from util.log import configure_logging
+from util.metrics import render as render_metrics
+from util.profiling import RequestProfile, list_profiles, profile_path, profile_requested
+from util.result_store import RESULT_TTL_HOURS, result_store
+from util.source_cache import cached_fetch, feed_item_category, gebiz_item_category
+from util.timing import RUNS, get_run, span, start_run
 from util.selection_manager import save_selection, load_selection, list_selections, delete_selection
 from util.gebiz_helper import categorize_selected_urls
+from util.feed_catalogue import catalogue
 
 load_dotenv()
+configure_logging()
+catalogue()  # index config/feeds.yaml at startup (rebuilt when the file changes)
 
 app = Flask(__name__)
-cache_items = []
-cache_metadata = None
+
+# Fetch results live in the shared result store (util/result_store.py), keyed
+# by a job id kept in this cookie, so any worker can refilter/export them
+JOB_COOKIE = 'tender_job'
+
+# Master workbook the results can be appended to (incrementally, see exporter/tender_comb.py)
+TENDER_COMB_PATH = os.environ.get('TENDER_COMB_PATH')
+
+@app.context_processor
+def tender_comb_context():
+    return {'tender_comb_enabled': bool(TENDER_COMB_PATH)}
+
+def current_job():
+    """(job id, results) of this browser's last fetch; (None, None) if it has none (or it expired)"""
+    job_id = request.cookies.get(JOB_COOKIE)
+    result = result_store().get(job_id)
+    return (job_id, result) if result is not None else (None, None)
 
 @app.route('/')
 def index():
@@ -34,6 +55,51 @@ def index():
 def fetch():
     if request.method == 'GET':
         return redirect(url_for('index'))
+    run = start_run('fetch')
+    if not profile_requested(request.values.get('profile')):
+        try:
+            return run_fetch(run)
+        finally:
+            run.finish()   # also when the fetch fails: don't leave the run attached to this worker thread
+    # Opt-in: profile this fetch and keep the flamegraph/pstats in output/profiles
+    with RequestProfile(f"fetch-{run.id}") as prof:
+        try:
+            response = run_fetch(run)
+        finally:
+            run.finish()
+    result = result_store().get(g.get('job_id'))
+    if result is not None and prof.paths:
+        # Stored results are shared with this worker's other requests: store a new dict, don't edit it
+        metadata = {**result['metadata'], 'Profile': ', '.join(p.name for p in prof.paths)}
+        result_store().put(g.job_id, {**result, 'metadata': metadata})
+    return response
+
+def sesami_search(window):
+    """
+    Sesami search options for a DateWindow.
+
+    Returns:
+        tuple: (date_mode, custom_days, start 'YYYY-MM-DD' or None, end 'YYYY-MM-DD' or None)
+    """
+    from util.date_window import PRESET_DAYS
+
+    if window.mode in ('today', 'last_24_hours'):
+        return '24h', None, None, None
+    if window.mode == 'last_7_days':
+        return '7days', None, None, None
+    if window.mode in PRESET_DAYS:
+        return 'custom', PRESET_DAYS[window.mode], None, None
+    if window.start is None:
+        return window.mode, None, None, None
+    # Explicit or computed ranges (custom, last_working_day, ...): search by dates
+    return ('custom', None, window.start.strftime('%Y-%m-%d'),
+            window.end.strftime('%Y-%m-%d') if window.end else None)
+
+def run_fetch(run):
+    from processor.normalize import normalize_items
+    from util.date_filter import filter_by_date, DateIndex
+    from util.date_window import DateWindow
+
     selected_urls = request.form.getlist('feed_url')
     use_html = request.form.get('use_html') == '1'
     use_ariba = request.form.get('use_ariba') == '1'
@@ -49,6 +115,8 @@ def fetch():
         selected_urls = json_data.get('feed_url', [])
         
     force_rss = request.form.get('force_rss') == '1' or json_data.get('force_rss') == True
+    # Collector results are shared for a while (util/source_cache.py); refresh_sources=1 scrapes anyway
+    refresh = request.form.get('refresh_sources') == '1'
     
     print("\n" + "="*80)
     print("FETCH REQUEST RECEIVED")
@@ -62,42 +130,14 @@ def fetch():
     print(f"Force RSS: {force_rss}")
     print("="*80 + "\n")
 
-    # Calculate effective dates for export naming
-    # Calculate effective dates for export naming
-    e_start = datetime.now()
-    e_end = datetime.now()
-    try:
-        if date_start:
-            e_start = datetime.strptime(date_start, '%Y-%m-%d')
-        
-        if date_end:
-            e_end = datetime.strptime(date_end, '%Y-%m-%d')
-        else:
-            # Fallbacks if no explicit end date
-            if date_mode == 'today' or date_mode == 'last_24_hours': 
-                e_end = datetime.now()
-                e_start = e_end - timedelta(days=1)
-            elif date_mode == 'last_working_day':
-                 # Keep e_end as now or calculated?
-                 # If date_start was passed (from UI calc), use it as both start/end (single day export)
-                 # UNLESS user wants range.
-                 # Actually, usually LWD is single day. 
-                 # But if user customized it...
-                 if not date_start: # Auto-calc
-                     now = datetime.now()
-                     wd = now.weekday()
-                     if wd == 0: e_start = now - timedelta(days=3)
-                     elif wd == 6: e_start = now - timedelta(days=2)
-                     else: e_start = now - timedelta(days=1)
-                     e_end = now # Include today (User Request: "until today inclusive")
-            elif date_mode == 'last_7_days': e_start = datetime.now() - timedelta(days=7)
-            # ... other presets rely on e_end = now (default)
-            
-    except Exception as e:
-        print(f"Error parsing dates for export name: {e}")
-        
-    app.config['export_date_start'] = e_start
-    app.config['export_date_end'] = e_end
+    # Resolve the date window once; every collector and the post-filter share it
+    window = DateWindow.resolve(date_mode, date_start, date_end)
+    print(f"Date Window: {window}")
+    
+    # Effective dates for export naming (naive SG time, open ends -> now)
+    e_start = window.naive_start()
+    e_end = window.naive_end()
+
 
     preset_modes = ['last_working_day', 'today', 'last_7_days', 'last_14_days', 'last_31_days', 'last_90_days', 'last_365_days']
     if date_mode == 'specific_date' and date_start:
@@ -144,33 +184,28 @@ def fetch():
          
          if rss_fetch_urls:
              print(f"Fetching {len(rss_fetch_urls)} feeds via RSS (Fast Mode)...")
-             items += fetch_feeds(selected_urls=rss_fetch_urls, date_mode=date_mode, 
-                                start_date=date_start, end_date=date_end)
+             # Date check deferred: the post-filter applies the same window once
+             from collector.rss_client import drop_undated, fetch_feeds
+             with span('collect.rss', feeds=len(rss_fetch_urls)) as s:
+                 # Feeds return their whole current content, so any window can be served from the cache
+                 rss_items = cached_fetch('rss', lambda urls: fetch_feeds(selected_urls=urls, date_mode=date_mode,
+                                                                          start_date=date_start, end_date=date_end,
+                                                                          window=window, defer_date_filter=True),
+                                          categories=rss_fetch_urls, item_category=feed_item_category,
+                                          refresh=refresh)
+                 # The post-filter keeps undated portal items, but feed entries need a date
+                 if date_mode != 'all':
+                     rss_items = drop_undated(rss_items)
+                 s['items'] = len(rss_items)
+             items += rss_items
                                 
          # 2. Fetch GeBIZ Historical/Awards Data (Selenium Advanced Search)
          if selenium_target_urls:
               try:
                   print("\n🌐 Fetching GeBIZ Historical Data (Selenium Advanced Search)...")
                   
-                  # Calculate dates for client
-                  c_start = datetime.now()
-                  c_end = datetime.now() # Default end to now
-                  
-                  now = datetime.now()
-                  if date_mode == 'last_7_days': c_start = now - timedelta(days=7)
-                  elif date_mode == 'last_14_days': c_start = now - timedelta(days=14)
-                  elif date_mode == 'last_31_days': c_start = now - timedelta(days=31)
-                  elif date_mode == 'last_90_days': c_start = now - timedelta(days=90)
-                  elif date_mode == 'last_365_days': c_start = now - timedelta(days=365)
-                  elif date_mode == 'custom' and date_start:
-                       try:
-                           c_start = datetime.strptime(date_start, '%Y-%m-%d')
-                           if date_end: c_end = datetime.strptime(date_end, '%Y-%m-%d')
-                       except Exception as e:
-                           print(f"Error parsing date strings: {e}")
-                  elif date_mode == 'last_working_day':
-                      c_start = app.config['export_date_start']
-                      c_end = app.config['export_date_end']
+                  # Dates for client (same window as the post-filter)
+                  c_start, c_end = e_start, e_end
                   
                   # Helper to categorize URLs
                   print(f"  [DEBUG] Selected URLs (Total {len(selenium_target_urls)}): {selenium_target_urls[:3]}...")
@@ -179,28 +214,35 @@ def fetch():
                   if cat_map['AWD']: print(f"  [DEBUG] AWD Categories: {cat_map['AWD']}")
                   # cat_map = {'BO': [...], 'AWD': [...]}
                   
+                  from collector.gebiz_client import GeBizClient
                   gb_client = GeBizClient()
                   
                   # Fetch BO
                   if cat_map['BO']:
                       print(f"  > Searching Business Opportunities ({len(cat_map['BO'])} categories)...")
-                      gb_items_bo = gb_client.fetch_advanced(
-                          start_date=c_start, 
-                          end_date=c_end, 
-                          categories=cat_map['BO'],
-                          search_type='BO'
-                      )
+                      with span('collect.gebiz_selenium', search_type='BO') as s:
+                          gb_items_bo = cached_fetch(
+                              'gebiz_selenium:BO',
+                              lambda cats: gb_client.fetch_advanced(start_date=c_start, end_date=c_end,
+                                                                    categories=cats, search_type='BO'),
+                              start=c_start, end=c_end, categories=cat_map['BO'],
+                              item_category=gebiz_item_category, refresh=refresh
+                          )
+                          s['items'] = len(gb_items_bo)
                       items += gb_items_bo
                       
                   # Fetch AWD
                   if cat_map['AWD']:
                       print(f"  > Searching Awards ({len(cat_map['AWD'])} categories)...")
-                      gb_items_awd = gb_client.fetch_advanced(
-                          start_date=c_start, 
-                          end_date=c_end,
-                          categories=cat_map['AWD'],
-                          search_type='AWD'
-                      )
+                      with span('collect.gebiz_selenium', search_type='AWD') as s:
+                          gb_items_awd = cached_fetch(
+                              'gebiz_selenium:AWD',
+                              lambda cats: gb_client.fetch_advanced(start_date=c_start, end_date=c_end,
+                                                                    categories=cats, search_type='AWD'),
+                              start=c_start, end=c_end, categories=cat_map['AWD'],
+                              item_category=gebiz_item_category, refresh=refresh
+                          )
+                          s['items'] = len(gb_items_awd)
                       items += gb_items_awd
 
                   print(f"✓ Added GeBIZ Selenium opportunities")
@@ -220,8 +262,8 @@ def fetch():
             # ariba_date_mode = 'custom' # Removed override: Let client map this to 'Last 7 days'
             # Update: Ariba V2 maps 'last_working_day' -> 'Last 7 days' internally.
             # We explicitly pass dates for post-filtering, but Ariba fetcher uses mode.
-            ariba_start_date = app.config['export_date_start'].strftime('%Y-%m-%d')
-            ariba_end_date = app.config['export_date_end'].strftime('%Y-%m-%d')
+            ariba_start_date = e_start.strftime('%Y-%m-%d')
+            ariba_end_date = e_end.strftime('%Y-%m-%d')
         elif date_start:
              # Ensure Ariba sees this as custom if dates are present but mode isn't preset
              ariba_date_mode = 'custom'
@@ -240,13 +282,21 @@ def fetch():
 
         # Run Ariba in headless mode (Background)
         print(f"Fetching Ariba (Headless Mode, Max {ariba_max_pages} pages)...")
-        ariba_items = fetch_ariba_opportunities(
-            headless=True, 
-            date_mode=ariba_date_mode, 
-            date_start=ariba_start_date, 
-            date_end=ariba_end_date,
-            max_pages=ariba_max_pages
-        )
+        from collector.ariba_client import fetch_ariba_opportunities
+        with span('collect.ariba') as s:
+            # Ariba searches by mode, so only the exact same search is shared
+            ariba_items = cached_fetch(
+                f"ariba:{ariba_date_mode}:{ariba_start_date}:{ariba_end_date}:{ariba_max_pages}",
+                lambda _: fetch_ariba_opportunities(
+                    headless=True, 
+                    date_mode=ariba_date_mode, 
+                    date_start=ariba_start_date, 
+                    date_end=ariba_end_date,
+                    max_pages=ariba_max_pages
+                ), refresh=refresh)
+            s['items'] = len(ariba_items)
+        # Copies: the dicts below are edited, and the originals may be the source cache's
+        ariba_items = [dict(item) for item in ariba_items]
         
         # Pre-process Ariba items for date filtering
         # Ariba v2 returns 'published' as "Closing: dd Mon yyyy"
@@ -293,54 +343,27 @@ def fetch():
     if use_sesami:
         print("\n🌐 Fetching Sesami opportunities...")
         
-        # Map date_mode to Sesami's expected format
-        s_date_mode = date_mode
-        s_start = None
-        s_end = None
-        s_custom_days = None
-
-        if date_mode in ['today', 'last_24_hours']:
-            s_date_mode = '24h'
-        elif date_mode == 'last_7_days':
-            s_date_mode = '7days'
-        elif date_mode == 'last_14_days':
-            s_date_mode = 'custom'
-            s_custom_days = 14
-        elif date_mode == 'last_31_days':
-            s_date_mode = 'custom'
-            s_custom_days = 31
-        elif date_mode == 'last_90_days':
-            s_date_mode = 'custom'
-            s_custom_days = 90
-        elif date_mode == 'last_365_days':
-            s_date_mode = 'custom'
-            s_custom_days = 365
-        elif date_mode == 'last_working_day':
-             s_date_mode = 'custom'
-             s_start = app.config['export_date_start']
-             s_end = app.config['export_date_end']
-        elif date_mode in ['custom', 'specific_date'] or date_start:
-            s_date_mode = 'custom'
-            try:
-                 if date_start: s_start = datetime.strptime(date_start, '%Y-%m-%d')
-                 if date_end: s_end = datetime.strptime(date_end, '%Y-%m-%d')
-            except: pass
+        # Sesami's search options, from the same window as the other collectors
+        s_date_mode, s_custom_days, s_start_str, s_end_str = sesami_search(window)
         
         try:
             # Correct function call (NOT class instantiation)
             # Fetch Sesami opportunities
             # Signature: fetch_sesami_opportunities(headless=True, date_mode='24h', custom_days=None, start_date=None, end_date=None)
             
-            s_start_str = s_start.strftime('%Y-%m-%d') if s_start else None
-            s_end_str = s_end.strftime('%Y-%m-%d') if s_end else None
             
-            sesami_items = fetch_sesami_opportunities(
-                headless=True, 
-                date_mode=s_date_mode,
-                custom_days=s_custom_days,
-                start_date=s_start_str,
-                end_date=s_end_str
-            )
+            from collector.sesami_client import fetch_sesami_opportunities
+            with span('collect.sesami') as s:
+                sesami_items = cached_fetch(
+                    f"sesami:{s_date_mode}:{s_custom_days}:{s_start_str}:{s_end_str}",
+                    lambda _: fetch_sesami_opportunities(
+                        headless=True, 
+                        date_mode=s_date_mode,
+                        custom_days=s_custom_days,
+                        start_date=s_start_str,
+                        end_date=s_end_str
+                    ), refresh=refresh)
+                s['items'] = len(sesami_items)
                 
             items += sesami_items
             print(f"✓ Added {len(sesami_items)} Sesami opportunities")
@@ -364,8 +387,14 @@ def fetch():
     if use_jpmc:
          print("\n🌐 Fetching JPMC opportunities...")
          try:
+             from collector.jpmc_client import JPMCClient
              jpmc_client = JPMCClient()
-             jpmc_items = jpmc_client.fetch_opportunities(date_mode=date_mode, start_date=e_start, end_date=e_end)
+             with span('collect.jpmc') as s:
+                 jpmc_items = cached_fetch(f"jpmc:{date_mode}",
+                                           lambda _: jpmc_client.fetch_opportunities(date_mode=date_mode, start_date=e_start,
+                                                                                     end_date=e_end),
+                                           start=e_start, end=e_end, refresh=refresh)
+                 s['items'] = len(jpmc_items)
              items += jpmc_items
              print(f"✓ Added {len(jpmc_items)} JPMC opportunities")
          except Exception as e:
@@ -376,8 +405,13 @@ def fetch():
     if use_tenderboard:
         print("\n🌐 Fetching TenderBoard opportunities...")
         try:
+            from collector.tenderboard_client import TenderBoardClient
             tb_client = TenderBoardClient()
-            tb_items = tb_client.fetch_opportunities(start_date=e_start, end_date=e_end)
+            with span('collect.tenderboard') as s:
+                tb_items = cached_fetch('tenderboard',
+                                        lambda _: tb_client.fetch_opportunities(start_date=e_start, end_date=e_end),
+                                        start=e_start, end=e_end, refresh=refresh)
+                s['items'] = len(tb_items)
             items += tb_items
             print(f"✓ Added {len(tb_items)} TenderBoard opportunities")
         except Exception as e:
@@ -388,23 +422,20 @@ def fetch():
     if use_stlogs:
          print("\n🌐 Fetching ST Logistics opportunities...")
          try:
-             # Prefer explicit dates from request if available
              st_start, st_end = e_start, e_end
-             if date_start:
-                 try:
-                     st_start = datetime.strptime(date_start, '%Y-%m-%d')
-                     if date_end: 
-                         st_end = datetime.strptime(date_end, '%Y-%m-%d')
-                     else:
-                         st_end = datetime.now() # Default end to now
-                 except: pass
 
+             from collector.stlogs_client import STLogsClient
              st_client = STLogsClient()
              # If we have specific dates, pretend mode is custom/specific so client logic holds
              st_mode = date_mode
              if date_start: st_mode = 'custom'
              
-             st_items = st_client.fetch_opportunities(date_mode=st_mode, start_date=st_start, end_date=st_end)
+             with span('collect.stlogs') as s:
+                 st_items = cached_fetch(f"stlogs:{st_mode}",
+                                         lambda _: st_client.fetch_opportunities(date_mode=st_mode, start_date=st_start,
+                                                                                 end_date=st_end),
+                                         start=st_start, end=st_end, refresh=refresh)
+                 s['items'] = len(st_items)
              items += st_items
              print(f"✓ Added {len(st_items)} ST Logistics opportunities")
          except Exception as e:
@@ -414,7 +445,11 @@ def fetch():
 
     # Fetch HTML fallback
     if use_html:
-        items += fetch_today_opportunities()
+        from collector.html_fallback import fetch_today_opportunities
+        with span('collect.html_fallback') as s:
+            html_items = fetch_today_opportunities()
+            s['items'] = len(html_items)
+        items += html_items
         
     # Post-processing
     print(f"DEBUG: Total Raw Items Fetched: {len(items)}")
@@ -422,17 +457,14 @@ def fetch():
     norm_items = normalize_items(items)
     print(f"DEBUG: Normalized Items: {len(norm_items)}")
     
-    # Two-stage date filtering:
-    # 1. RSS-level: rss_client.py filters GeBIZ items by 'published' date from RSS
-    # 2. Post-filter: date_filter.py does final filtering after normalization
-    
-    # Force 'custom' mode if explicit dates are provided, to ensure date_filter respects strict range
-    filter_mode = date_mode
-    if date_start:
-        filter_mode = 'custom'
-        
-    filtered_items = filter_by_date(norm_items, mode=filter_mode, start_date=date_start, end_date=date_end,
-                                   include_items_without_dates=True)
+    # Date filtering happens once, here: portal searches only narrow what is
+    # scraped, RSS items are checked against the same window after normalization
+    filter_mode = window.mode
+        
+    # Keep every normalized item indexed by date so the window can be narrowed later
+    date_index = DateIndex(norm_items)
+    filtered_items = filter_by_date(date_index, mode=filter_mode, start_date=date_start, end_date=date_end,
+                                   include_items_without_dates=True, window=window)
                                    
     print(f"DEBUG: Final Filtered Items: {len(filtered_items)}")
     if len(items) > 0 and len(filtered_items) == 0:
@@ -441,15 +473,11 @@ def fetch():
         if 'published_date' in items[0]:
             print(f"  Sample Raw Date: {items[0]['published_date']} (Type: {type(items[0]['published_date'])})")
     
-    global cache_items
-    cache_items = filtered_items
-    
     # Store metadata for export
     # Format feeds list with newlines for better Excel display
     feeds_list_str = "\n".join([u.split('/')[-1] for u in selected_urls]) if selected_urls else 'None'
     
-    global cache_metadata
-    cache_metadata = {
+    metadata = {
         'Export Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'Date Mode': date_mode,
         'Start Date': date_start,
@@ -460,41 +488,178 @@ def fetch():
         'Use ST Logistics': use_stlogs,
         'Use JPMC': use_jpmc,
         'Selected Feeds Count': len(selected_urls),
-        'Selected Feeds': feeds_list_str
+        'Selected Feeds': feeds_list_str,
+        'Timing Run': run.id,
     }
+    # Per-stage timings of this fetch go into the Settings sheet
+    metadata.update(run.finish().metadata())
+    
+    # Shared with the other workers; this browser finds it again via the cookie
+    g.job_id = uuid.uuid4().hex
+    result_store().put(g.job_id, {
+        'items': filtered_items,
+        'index': date_index,   # every normalized item by date, so /refilter can narrow the window
+        'window': window,      # the fetched range: /refilter can't go beyond what the portals searched
+        'metadata': metadata,
+        'export_start': e_start,
+        'export_end': e_end,
+    })
+    
+    feeds = load_feeds_config()
+    response = make_response(render_template_string(TEMPLATE, feeds=feeds, count=len(filtered_items), 
+                                ts=datetime.now().strftime('%Y-%m-%d %H:%M'), 
+                                date_mode=date_mode, download_ready=False))
+    response.set_cookie(JOB_COOKIE, g.job_id, max_age=int(RESULT_TTL_HOURS * 3600), httponly=True, samesite='Lax')
+    return response
+
+@app.route('/refilter', methods=['POST'])
+def refilter():
+    """
+    Re-apply the date filter to the last fetch without fetching again.
+
+    Only narrows: the portals were searched for the fetched range, so a
+    wider window is refused (fetch again for it) instead of returning
+    feed items alone for the extra days.
+    """
+    from util.date_filter import filter_by_date
+    from util.date_window import DateWindow
+    job_id, result = current_job()
+    if result is None:
+        return redirect(url_for('index'))
+    
+    date_mode = request.form.get('date_mode', 'today')
+    date_start = request.form.get('date_start') or None
+    date_end = request.form.get('date_end') or None
+    if date_mode == 'specific_date' and date_start:
+        date_end = date_start
+    window = DateWindow.resolve(date_mode, date_start, date_end)
     
     feeds = load_feeds_config()
-    return render_template_string(TEMPLATE, feeds=feeds, count=len(cache_items), 
+    fetched = result.get('window')
+    if fetched is not None and not fetched.covers(window):
+        print(f"⚠ Re-filter to {window} refused: wider than the fetched {fetched}")
+        return render_template_string(TEMPLATE, feeds=feeds, count=len(result['items']),
+                                      ts=datetime.now().strftime('%Y-%m-%d %H:%M'),
+                                      date_mode=result['metadata'].get('Date Mode'), download_ready=False,
+                                      refilter_refused=True)
+    
+    # A new dict: the stored one may be in use by a download of the previous window
+    items = filter_by_date(result['index'], window=window, include_items_without_dates=True)
+    metadata = {**result['metadata'], 'Date Mode': date_mode, 'Start Date': date_start, 'End Date': date_end}
+    result_store().put(job_id, {**result, 'items': items, 'metadata': metadata,
+                                'export_start': window.naive_start(), 'export_end': window.naive_end()})
+    
+    return render_template_string(TEMPLATE, feeds=feeds, count=len(items), 
                                 ts=datetime.now().strftime('%Y-%m-%d %H:%M'), 
                                 date_mode=date_mode, download_ready=False)
 
+def export_request(result):
+    """(format, file name without extension) for an export request of a fetch's results"""
+    s_date = result['export_start']
+    e_date = result['export_end']
+    fmt = "%y%m%d"
+    export_format = request.values.get('export_format', 'xlsx')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'xlsx'
+    return export_format, f"{s_date.strftime(fmt)}-{e_date.strftime(fmt)} Tender Export"
+
 @app.route('/export', methods=['POST'])
 def export():
-    output_dir = 'output'
-    
-    # Generate filename
-    s_date = app.config.get('export_date_start', datetime.now())
-    e_date = app.config.get('export_date_end', datetime.now())
-    fmt = "%y%m%d"
-    export_file = f"{s_date.strftime(fmt)}-{e_date.strftime(fmt)} Tender Export.xlsx"
+    job_id, result = current_job()
+    if result is None:
+        return redirect(url_for('index'))
+    items = result['items']
+    export_format, export_name = export_request(result)
+    run = start_run('export')
     
-    os.makedirs(output_dir, exist_ok=True)
-    path = os.path.join(output_dir, export_file)
-    export_to_excel(cache_items, path, metadata=cache_metadata)
+    # Exports are content-addressed: the same results/format return the existing file
+    try:
+        digest, path, cached = cached_export(items, export_name, export_format,
+                                             metadata=result['metadata'])
+    finally:
+        run.finish()
+    export_file = path.name
     
-    app.config['last_export'] = path
     feeds = load_feeds_config()
-    return render_template_string(TEMPLATE, feeds=feeds, count=len(cache_items), 
+    return render_template_string(TEMPLATE, feeds=feeds, count=len(items), 
                                 ts=datetime.now().strftime('%Y-%m-%d %H:%M'), 
                                 date_mode='exported', download_ready=True,
-                                export_filename=export_file)
+                                export_filename=export_file, export_job=digest)
+
+@app.route('/export/stream', methods=['GET', 'POST'])
+def export_stream():
+    """Stream the export straight into the response (nothing written to output/)"""
+    job_id, result = current_job()
+    if result is None:
+        return redirect(url_for('index'))
+    export_format, export_name = export_request(result)
+    # A later refilter stores a new result, so this download keeps its items
+    items = result['items']
+    metadata = result['metadata']
+    export_file = f"{export_name}{EXPORT_FORMATS[export_format][0]}"
+    
+    return Response(stream_with_context(stream_export(items, export_format, metadata=metadata)),
+                    mimetype=EXPORT_MIMETYPES[export_format],
+                    headers={'Content-Disposition': f'attachment; filename="{export_file}"'})
+
+@app.route('/export/tender-comb', methods=['POST'])
+def export_tender_comb():
+    """Add the tenders of the last fetch that aren't in the Tender Comb workbook yet (TENDER_COMB_PATH)"""
+    from exporter.excel import append_to_tender_comb
+
+    job_id, result = current_job()
+    if result is None or not TENDER_COMB_PATH:
+        return redirect(url_for('index'))
+    items = result['items']
+    # Incremental: only new rows are written, the other sheets are never loaded
+    with span('export.tender_comb') as s:
+        appended = append_to_tender_comb(items, TENDER_COMB_PATH, incremental=True)
+        s['items'] = appended or 0
+    
+    feeds = load_feeds_config()
+    return render_template_string(TEMPLATE, feeds=feeds, count=len(items), 
+                                ts=datetime.now().strftime('%Y-%m-%d %H:%M'), 
+                                date_mode=result['metadata'].get('Date Mode'), download_ready=False,
+                                comb_appended=appended)
 
-@app.route('/download')
-def download():
-    path = app.config.get('last_export')
-    if not path:
+@app.route('/download/<digest>')
+def download(digest):
+    # Looked up on disk, so any worker can serve an export made by another
+    path = ExportCache().get(digest) if re.fullmatch(r'[0-9a-f]{64}', digest) else None
+    if path is None:
         return 'No file', 404
-    return send_file(path, as_attachment=True)
+    return send_file(os.path.abspath(path), as_attachment=True)
+
+@app.route('/timings', methods=['GET'])
+def timings():
+    """Timing summaries of the recent fetch/export runs of this worker (newest first)"""
+    return jsonify([run.to_dict(spans=False) for run in reversed(RUNS)])
+
+@app.route('/timings/<run_id>', methods=['GET'])
+def timings_run(run_id):
+    """All spans of one run (only the worker that ran it has them)"""
+    run = get_run(run_id)
+    if run is None:
+        return jsonify({'success': False, 'message': 'Run not found'}), 404
+    return jsonify(run.to_dict())
+
+@app.route('/profiles', methods=['GET'])
+def profiles():
+    """Saved profiles of fetches run with profile=1 (newest first)"""
+    return jsonify(list_profiles())
+
+@app.route('/profiles/<name>', methods=['GET'])
+def profile_download(name):
+    path = profile_path(name)
+    if path is None:
+        return 'No file', 404
+    # HTML flamegraphs open in the browser, .pstats/.txt are downloaded
+    return send_file(os.path.abspath(path), as_attachment=path.suffix != '.html')
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (counters of this worker since it started)"""
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/selections/list', methods=['GET'])
 def selections_list():
@@ -1156,8 +1321,25 @@ TEMPLATE = '''
                             <p>items captured at {{ ts }}</p>
                             <p>Filter mode: <strong>{{ date_mode }}</strong></p>
                             <div style="margin-top: 15px;">
-                                <button type="button" class="btn btn-success" onclick="submitExport()">📥 Export to Excel</button>
+                                <select id="export_format" title="Export format">
+                                    <option value="xlsx">Excel (.xlsx)</option>
+                                    <option value="parquet">Parquet (.parquet)</option>
+                                    <option value="csv">CSV (.csv)</option>
+                                    <option value="ndjson">NDJSON (.ndjson)</option>
+                                </select>
+                                <button type="button" class="btn btn-success" onclick="submitExport('/export')">📥 Export</button>
+                                <button type="button" class="btn btn-success" onclick="submitExport('/export/stream')" title="Download directly without saving to output/">⬇ Download Now</button>
+                                <button type="submit" class="btn btn-primary" formaction="/refilter" title="Apply the selected date range to these results without fetching again">🔎 Re-filter Results</button>
+                                {% if tender_comb_enabled %}
+                                <button type="button" class="btn btn-success" onclick="submitExport('/export/tender-comb')" title="Add the tenders not yet in the Tender Comb workbook">📒 Append to Tender Comb</button>
+                                {% endif %}
                             </div>
+                            {% if refilter_refused %}
+                            <p style="margin-top: 10px;">⚠ That date range is wider than the fetched one: fetch again to include it.</p>
+                            {% endif %}
+                            {% if comb_appended is defined %}
+                            <p style="margin-top: 10px;">📒 Tender Comb: {% if comb_appended is none %}workbook not found{% else %}{{ comb_appended }} new items appended{% endif %}</p>
+                            {% endif %}
                         </div>
                     </div>
                     {% endif %}
@@ -1166,7 +1348,7 @@ TEMPLATE = '''
                     <div style="margin-top: 20px; padding-top: 20px; border-top: 1px solid #eee;">
                         <div class="stats-box" style="margin-bottom: 0;">
                             <h3>🎉 Export Successful!</h3>
-                            <p><a href="/download" style="color: white; text-decoration: underline; font-weight: 600;">Download {{ export_filename }}</a></p>
+                            <p><a href="/download/{{ export_job }}" style="color: white; text-decoration: underline; font-weight: 600;">Download {{ export_filename }}</a></p>
                         </div>
                     </div>
                     {% endif %}
@@ -1176,10 +1358,15 @@ TEMPLATE = '''
     </div>
     
     <script>
-        function submitExport() {
+        function submitExport(action) {
             const form = document.createElement('form');
             form.method = 'POST';
-            form.action = '/export';
+            form.action = action;
+            const format = document.createElement('input');
+            format.type = 'hidden';
+            format.name = 'export_format';
+            format.value = document.getElementById('export_format').value;
+            form.appendChild(format);
             document.body.appendChild(form);
             form.submit();
         }
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark: per-field GeBIZ summary extraction vs the combined extractor.
+
+Usage:
+    python benchmarks/bench_extract.py [--items 5000] [--repeat 5]
+"""
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.normalize import extract_tender_number, extract_calling_entity, extract_closing_info
+from processor.extract import extract_summary_fields
+
+AGENCIES = ['Ministry of Health', 'Housing and Development Board', 'NUS: Procurement Office',
+            'Singapore Institute of Technology', 'National Environment Agency']
+PUBLISHED_PATTERNS = [
+    r'(?:Published|Posted|Date)[:\s]+([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
+    r'([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})',
+]
+
+
+def make_samples(n, seed=42):
+    """Synthetic (title, summary) pairs shaped like GeBIZ RSS entries"""
+    rng = random.Random(seed)
+    samples = []
+    for i in range(n):
+        kind = i % 4
+        doc = f"HDB000ETT26{i:06d}"
+        day, month = rng.randint(1, 28), rng.randint(1, 12)
+        if kind == 0:
+            title = f"Supply of item {i} {doc}"
+            summary = (f"Agency: {rng.choice(AGENCIES)} | Document No: {doc} | "
+                       f"Closing on {day:02d}/{month:02d}/2026 17:00:00 | Published: {day:02d}/{month:02d}/2026")
+        elif kind == 1:
+            title = f"ITQ {i:08d} Provision of cleaning services"
+            summary = f"Organisation: {rng.choice(AGENCIES)} Tender for services. Closing Date: {day} Jan 2026 4:00 PM"
+        elif kind == 2:
+            title = f"Maintenance works {i}"
+            summary = f"Buyer: {rng.choice(AGENCIES)} Supply of parts. Posted {day:02d}-{month:02d}-2026"
+        else:
+            title = f"Item {i}"
+            summary = "Opportunity details will be published on the portal."
+        samples.append((title, summary))
+    return samples
+
+
+def legacy_extract(title, summary):
+    """The per-field functions as normalize_items used to call them"""
+    tender_number = extract_tender_number(title, summary)
+    calling_entity = extract_calling_entity(summary, title)
+    closing_date, closing_time = extract_closing_info(summary)
+    published_date = ''
+    for pattern in PUBLISHED_PATTERNS:
+        m = re.search(pattern, summary, re.IGNORECASE)
+        if m and m.group(1):
+            published_date = m.group(1)
+            break
+    return (tender_number, calling_entity, closing_date, closing_time, published_date)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--items', type=int, default=5000)
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+
+    samples = make_samples(args.items)
+
+    # Same answers first, then timings
+    mismatches = [s for s in samples if legacy_extract(*s) != tuple(extract_summary_fields(*s))]
+    if mismatches:
+        print(f"⚠ {len(mismatches)} mismatches, e.g. {mismatches[0]}")
+
+    def run_legacy():
+        for title, summary in samples:
+            legacy_extract(title, summary)
+
+    def run_combined():
+        for title, summary in samples:
+            extract_summary_fields(title, summary)
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=args.repeat))
+    combined = min(timeit.repeat(run_combined, number=1, repeat=args.repeat))
+
+    per_item = lambda t: t / len(samples) * 1e6
+    print(f"📊 Extraction benchmark ({len(samples)} items, best of {args.repeat})")
+    print(f"  Per-field functions: {legacy:.3f}s ({per_item(legacy):.1f} µs/item)")
+    print(f"  Combined extractor:  {combined:.3f}s ({per_item(combined):.1f} µs/item)")
+    print(f"  Speed-up: {legacy / combined:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Import-time benchmark: how long a fresh worker takes to import the app, and
+which heavy dependencies the index and selections pages pull in.
+
+Each run starts a new interpreter with `python -X importtime`, imports the
+module, then (for app_enhanced) requests / and /selections/list through the
+Flask test client. Reported per target: median wall time over --repeat runs,
+the slowest direct imports, and the heavy modules loaded (they should only
+appear once a fetch or an export needs them).
+
+Usage:
+    python benchmarks/bench_imports.py [--repeat 5] [--top 10]
+                                       [--modules app_enhanced,processor.normalize]
+                                       [--json out.json] [--compare base.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ['selenium', 'pandas', 'numpy', 'openpyxl', 'xlsxwriter', 'pyarrow', 'feedparser', 'bs4', 'requests']
+
+PROBE = """
+import sys, time
+t = time.perf_counter()
+import {module} as target
+elapsed = time.perf_counter() - t
+pages = []
+if {requests}:
+    client = target.app.test_client()
+    for path in ('/', '/selections/list'):
+        pages.append((path, client.get(path).status_code))
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print('BENCH', repr((elapsed, pages, heavy)), file=sys.stderr)
+"""
+
+
+def probe(module, requests=False):
+    """One fresh interpreter: (seconds, [(path, status)], heavy modules, {import: cumulative us})"""
+    code = PROBE.format(module=module, requests=requests, heavy=HEAVY)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                          capture_output=True, text=True)
+    result, imports = None, {}
+    for line in proc.stderr.splitlines():
+        if line.startswith('BENCH '):
+            result = eval(line[len('BENCH '):])
+        elif line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            if cumulative.strip().isdigit() and depth <= 1 and name.strip() != module:
+                # The target's direct imports (depth 1) and anything the page requests import (depth 0)
+                imports[name.strip()] = int(cumulative)
+    if result is None:
+        raise RuntimeError(f"import of {module} failed:\n{proc.stderr[-2000:]}")
+    return (*result, imports)
+
+
+def bench(module, repeat, top):
+    runs = [probe(module, requests=module == 'app_enhanced') for _ in range(repeat)]
+    seconds = statistics.median(r[0] for r in runs)
+    _, pages, heavy, imports = runs[-1]
+    print(f"\n📊 {module}: {seconds:.3f}s (median of {repeat})")
+    for name, us in sorted(imports.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"  {name:<40} {us / 1e6:8.3f}s")
+    for path, status in pages:
+        print(f"  GET {path:<36} {status}")
+    print(f"  heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+    return {'seconds': round(seconds, 4), 'heavy': heavy}
+
+
+def compare(current, baseline):
+    print("\n📊 Change vs baseline (negative = faster)")
+    for module, entry in current['runs'].items():
+        base = baseline.get('runs', {}).get(module)
+        if not base or not base['seconds']:
+            continue
+        change = (entry['seconds'] - base['seconds']) / base['seconds'] * 100
+        print(f"  {module:<28} {base['seconds']:8.3f}s -> {entry['seconds']:8.3f}s  {change:+6.1f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--modules', default='app_enhanced')
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--top', type=int, default=10, help='slowest imports to list')
+    ap.add_argument('--json', help='write the timings to this file')
+    ap.add_argument('--compare', help='timings file of an earlier run')
+    args = ap.parse_args()
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(),
+              'started': time.strftime('%Y-%m-%d %H:%M:%S'), 'runs': {}}
+    for module in [m for m in args.modules.split(',') if m]:
+        report['runs'][module] = bench(module, args.repeat, args.top)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding='utf-8')
+        print(f"\n✓ Timings saved to {args.json}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
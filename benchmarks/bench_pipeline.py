@@ -0,0 +1,169 @@
+"""
+Offline pipeline benchmark: fetch, parse, normalize, filter and export at
+several sizes, using the fixtures from benchmarks/fixtures.py. The RSS
+fixtures are served from a local HTTP server, so no portal is contacted.
+
+Stages:
+    fetch      HTTP GET of every feed fixture (transfer only)
+    parse      fetch_single_feed per feed (GET + feedparser + item extraction)
+    normalize  normalize_items over the RSS items plus as many portal items
+    filter     DateIndex build + filter_by_date over a 90-day window
+    export     export_items in each format (--formats)
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 1000,10000,100000] [--stages ...]
+                                        [--formats xlsx,csv,parquet,ndjson]
+                                        [--recorded] [--json out.json] [--compare base.json]
+
+--sizes counts all items; half of them are RSS entries. --recorded adds a run
+over benchmarks/fixtures/recorded (see `fixtures.py record`). --json saves the
+timings and --compare prints the change against a saved run.
+"""
+import argparse
+import functools
+import json
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+
+from benchmarks.fixtures import BASE_DATE, FIXTURE_DIR, generate, portal_items
+from collector.rss_client import fetch_single_feed
+from exporter.formats import EXPORT_FORMATS, export_items
+from processor.normalize import normalize_items
+from util.date_filter import DateIndex, filter_by_date
+from util.date_window import DateWindow
+
+STAGES = ['fetch', 'parse', 'normalize', 'filter', 'export']
+HEADERS = {'User-Agent': 'tender-bench'}
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(folder):
+    """Serve a fixture folder on 127.0.0.1 (random port); returns (server, base URL)"""
+    handler = functools.partial(_QuietHandler, directory=str(folder))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def timed_stage(results, name, func, items=None):
+    start = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - start
+    count = items if items is not None else (len(value) if hasattr(value, '__len__') else None)
+    results[name] = {'seconds': round(elapsed, 4), 'items': count}
+    print(f"  {name:<16} {elapsed:8.3f}s" + (f"  ({count / elapsed:,.0f}/s)" if count and elapsed else ''))
+    return value
+
+
+def run_size(label, folder, portal_count, stages, formats, out_dir):
+    """All stages over one fixture folder; returns {stage: {'seconds', 'items'}}"""
+    manifest = json.loads((folder / 'manifest.json').read_text(encoding='utf-8'))
+    server, base = serve(folder)
+    results = {}
+    print(f"\n📊 {label}: {len(manifest)} feeds + {portal_count} portal items")
+    try:
+        local = {url: f"{base}/{name}" for url, name in manifest.items()}
+
+        if 'fetch' in stages:
+            timed_stage(results, 'fetch', lambda: [requests.get(u, headers=HEADERS).content
+                                                   for u in local.values()], items=len(local))
+
+        def parse():
+            items = []
+            for url, local_url in local.items():
+                ok, feed_items, error = fetch_single_feed(local_url, HEADERS, max_retries=1)
+                for item in feed_items:
+                    item['feed_url'] = url   # categories are looked up by the real feed URL
+                items.extend(feed_items)
+            return items
+        rss_items = timed_stage(results, 'parse', parse)
+    finally:
+        server.shutdown()
+
+    raw = rss_items + portal_items(portal_count)
+    tenders = []
+    if 'normalize' in stages or 'filter' in stages or 'export' in stages:
+        tenders = timed_stage(results, 'normalize', lambda: normalize_items(raw), items=len(raw))
+        if 'normalize' not in stages:
+            del results['normalize']
+
+    if 'filter' in stages:
+        end = BASE_DATE.strftime('%Y-%m-%d')
+        start = (BASE_DATE - timedelta(days=90)).strftime('%Y-%m-%d')
+        window = DateWindow.resolve('custom', start, end)
+        timed_stage(results, 'filter', lambda: filter_by_date(DateIndex(tenders), window=window,
+                                                              include_items_without_dates=True),
+                    items=len(tenders))
+
+    if 'export' in stages:
+        for fmt in formats:
+            timed_stage(results, f'export.{fmt}',
+                        lambda: export_items(tenders, out_dir / f"{label}-export", fmt,
+                                             metadata={'Benchmark': label}),
+                        items=len(tenders))
+    return results
+
+
+def compare(current, baseline):
+    print("\n📊 Change vs baseline (negative = faster)")
+    for label, stages in current['runs'].items():
+        base_stages = baseline.get('runs', {}).get(label, {})
+        for stage, entry in stages.items():
+            base = base_stages.get(stage)
+            if not base or not base['seconds']:
+                continue
+            change = (entry['seconds'] - base['seconds']) / base['seconds'] * 100
+            print(f"  {label:<10} {stage:<16} {base['seconds']:8.3f}s -> {entry['seconds']:8.3f}s  {change:+6.1f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', default='1000,10000,100000')
+    ap.add_argument('--stages', default=','.join(STAGES))
+    ap.add_argument('--formats', default=','.join(EXPORT_FORMATS))
+    ap.add_argument('--recorded', action='store_true', help='also run over the recorded feeds')
+    ap.add_argument('--json', help='write the timings to this file')
+    ap.add_argument('--compare', help='timings file of an earlier run')
+    args = ap.parse_args()
+
+    stages = args.stages.split(',')
+    formats = [f for f in args.formats.split(',') if f]
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(),
+              'started': time.strftime('%Y-%m-%d %H:%M:%S'), 'runs': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        for size in sizes:
+            folder = generate(size // 2)
+            report['runs'][str(size)] = run_size(str(size), folder, size - size // 2, stages, formats, out_dir)
+        recorded = FIXTURE_DIR / 'recorded'
+        if args.recorded:
+            if (recorded / 'manifest.json').exists():
+                report['runs']['recorded'] = run_size('recorded', recorded, 0, stages, formats, out_dir)
+            else:
+                print(f"⚠ No recorded feeds in {recorded} (run: python benchmarks/fixtures.py record)")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding='utf-8')
+        print(f"\n✓ Timings saved to {args.json}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Offline parse benchmark over saved portal result pages.
+
+Reads the HTML snapshots written by util/snapshots.py (SNAPSHOT_DIR=...
+during a normal fetch: <dir>/<portal>/page-<n>.html) and times, per portal,
+parsing each page and selecting its result rows with the selectors the
+collectors use. The collectors read the rows through Selenium, so this
+times the markup itself (page size, row count, parser cost), not WebDriver
+round trips. Copy a debug dump such as output/ariba_debug.html to
+<dir>/ariba/page-1.html to include it.
+
+Without recorded pages, --stub writes the pages benchmarks/stub_server.py
+serves (GeBIZ, Sesami, TenderBoard) and benchmarks those.
+
+Usage:
+    python benchmarks/bench_snapshots.py [--dir benchmarks/fixtures/html] [--repeat 5]
+                                         [--stub 1000] [--json out.json] [--compare base.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import FIXTURE_DIR
+
+SNAPSHOT_DIR = FIXTURE_DIR / 'html'
+
+# Result rows as the collectors find them (find_elements(By.CSS_SELECTOR, ...))
+ROW_SELECTORS = {
+    'gebiz': 'div.formColumns_MAIN',
+    'ariba': '.sapMLIB',
+    'sesami': '#rfqTender tbody tr',
+    'tenderboard': "a[class*='OpenDeals-viewLink']",
+}
+
+
+def write_stub_pages(folder, items):
+    """The stub server's result pages for `items` entries per portal, as snapshots"""
+    from benchmarks.stub_server import (GEBIZ_PAGE_SIZE, TENDERBOARD_PAGE_SIZE, PortalData,
+                                        gebiz_results, sesami_page, tenderboard_page)
+
+    data = PortalData(items=items)
+    base = 'http://127.0.0.1:8765'
+    pages = {
+        'gebiz': [gebiz_results(data, {'page': [str(n)]}, base + '/ptn/opportunity/BOAdvancedSearch.xhtml', base)
+                  for n in range(1, -(-sum(1 for e in data.gebiz if not e['awarded']) // GEBIZ_PAGE_SIZE) + 1)],
+        'sesami': [sesami_page(data, {'length': ['100'], 'page': [str(n)]})
+                   for n in range(1, -(-len(data.sesami) // 100) + 1)],
+        'tenderboard': [tenderboard_page(data, {'page': [str(n)]}, base)
+                        for n in range(1, -(-len(data.tenderboard) // TENDERBOARD_PAGE_SIZE) + 1)],
+    }
+    for portal, htmls in pages.items():
+        (folder / portal).mkdir(parents=True, exist_ok=True)
+        for n, html in enumerate(htmls, 1):
+            (folder / portal / f"page-{n}.html").write_text(html, encoding='utf-8')
+
+
+def bench_portal(files, selector, repeat):
+    """Best-of-repeat parse + row selection over a portal's pages"""
+    from bs4 import BeautifulSoup
+
+    texts = [f.read_text(encoding='utf-8', errors='replace') for f in files]
+    best_parse = best_select = None
+    rows = 0
+    for _ in range(repeat):
+        parse = select = 0.0
+        rows = 0
+        for text in texts:
+            start = time.perf_counter()
+            soup = BeautifulSoup(text, 'html.parser')
+            parsed = time.perf_counter()
+            rows += len(soup.select(selector))
+            select += time.perf_counter() - parsed
+            parse += parsed - start
+        best_parse = parse if best_parse is None else min(best_parse, parse)
+        best_select = select if best_select is None else min(best_select, select)
+    return {'pages': len(files), 'bytes': sum(len(t.encode('utf-8')) for t in texts), 'rows': rows,
+            'parse': round(best_parse, 4), 'select': round(best_select, 4)}
+
+
+def run(folder, repeat):
+    results = {}
+    print(f"\n📊 Snapshots in {folder}")
+    for portal, selector in ROW_SELECTORS.items():
+        files = sorted((folder / portal).glob('page-*.html'))
+        if not files:
+            continue
+        r = results[portal] = bench_portal(files, selector, repeat)
+        per_page = (r['parse'] + r['select']) / r['pages'] * 1000
+        print(f"  {portal:<12} {r['pages']:4d} pages {r['bytes'] / 1024:9.0f} KB {r['rows']:6d} rows  "
+              f"parse {r['parse']:7.3f}s  select {r['select']:7.3f}s  ({per_page:.1f} ms/page)")
+    if not results:
+        print(f"⚠ No snapshots (set SNAPSHOT_DIR={folder} during a fetch, or use --stub)")
+    return results
+
+
+def compare(report, base):
+    print("\n📈 Change against the baseline (parse + select)")
+    for portal, entry in report['portals'].items():
+        old = base.get('portals', {}).get(portal)
+        if not old:
+            continue
+        before, after = old['parse'] + old['select'], entry['parse'] + entry['select']
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"  {portal:<12} {before:8.3f}s -> {after:8.3f}s  {change:+6.1f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--dir', default=str(SNAPSHOT_DIR), help='snapshot folder (<portal>/page-<n>.html)')
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--stub', type=int, help='benchmark stub-server pages with this many items per portal')
+    ap.add_argument('--json', help='write the timings to this file')
+    ap.add_argument('--compare', help='timings file of an earlier run')
+    args = ap.parse_args()
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(),
+              'started': time.strftime('%Y-%m-%d %H:%M:%S')}
+    if args.stub:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_stub_pages(Path(tmp), args.stub)
+            report['portals'] = run(Path(tmp), args.repeat)
+    else:
+        report['portals'] = run(Path(args.dir), args.repeat)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1), encoding='utf-8')
+        print(f"\n✓ Timings saved to {args.json}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
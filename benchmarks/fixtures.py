@@ -0,0 +1,192 @@
+"""
+Offline fixtures for the benchmarks: RSS XML for the feeds in config/feeds.yaml
+and raw items shaped like the Selenium portals' output.
+
+Generated fixtures are deterministic (same seed -> same bytes), so timings of
+two commits can be compared on any machine. Recorded fixtures are real
+responses saved with `record` while the portals are reachable.
+
+Usage:
+    python benchmarks/fixtures.py generate [--items 10000]   # -> benchmarks/fixtures/rss-10000/
+    python benchmarks/fixtures.py record                      # -> benchmarks/fixtures/recorded/
+
+Result-page HTML of GeBIZ/Ariba/Sesami/TenderBoard is recorded by running a
+normal fetch with SNAPSHOT_DIR=benchmarks/fixtures/html (see util/snapshots.py).
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from util.feed_catalogue import catalogue, feed_name
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures'
+BASE_DATE = datetime(2026, 1, 5, 8, 0)   # fixed, so fixtures never change with the calendar
+DAYS_SPAN = 120
+
+AGENCIES = ['Ministry of Health', 'Housing and Development Board', 'NUS: Procurement Office',
+            'Singapore Institute of Technology', 'National Environment Agency',
+            'Ministry of Education - Schools', 'Agency for Science, Technology and Research']
+
+
+def feed_urls():
+    """Every feed URL in config/feeds.yaml (file order)"""
+    return catalogue().urls()
+
+
+def fixture_name(url):
+    """Feed URL -> fixture file name (the URL's last path part)"""
+    return feed_name(url)
+
+
+def _entry(rng, i, base_date=BASE_DATE):
+    """One RSS <item> shaped like a GeBIZ entry"""
+    published = base_date - timedelta(days=rng.randint(0, DAYS_SPAN), minutes=rng.randint(0, 600))
+    closing = published + timedelta(days=rng.randint(7, 30))
+    doc = f"{rng.choice(['HDB', 'MOH', 'NEA', 'NUS'])}000ETT{published:%y}{i:06d}"
+    agency = rng.choice(AGENCIES)
+    kind = i % 4
+    if kind == 0:
+        title = f"Supply of item {i} {doc}"
+        summary = (f"Agency: {agency} | Document No: {doc} | Closing on {closing:%d/%m/%Y} 17:00:00 | "
+                   f"Published Date: {published:%d/%m/%Y}")
+    elif kind == 1:
+        title = f"ITQ {i:08d} Provision of cleaning services"
+        summary = f"Organisation: {agency} Tender for services. Closing Date: {closing:%d %b %Y} 4:00 PM"
+    elif kind == 2:
+        title = f"Maintenance works {i}"
+        summary = f"Buyer: {agency} Supply of parts. Posted {published:%d-%m-%Y}"
+    else:
+        title = f"Item {i}"
+        summary = "Opportunity details will be published on the portal."
+    pub_date = format_datetime(published) if i % 5 else ''
+    return (f"<item><title>{escape(title)}</title>"
+            f"<link>https://www.gebiz.gov.sg/ptn/opportunity/BOWide.xhtml?code={doc}</link>"
+            f"<description>{escape(summary)}</description>"
+            + (f"<pubDate>{pub_date}</pubDate>" if pub_date else '')
+            + "</item>")
+
+
+def rss_xml(url, entries, seed=0, base_date=BASE_DATE):
+    """A complete RSS 2.0 document with `entries` items for one feed URL (published up to DAYS_SPAN before base_date)"""
+    rng = random.Random(f"{seed}:{url}")
+    name = escape(fixture_name(url))
+    items = ''.join(_entry(rng, i, base_date) for i in range(entries))
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<rss version="2.0"><channel><title>{name}</title><link>{escape(url)}</link>'
+            f'<description>GeBIZ fixture</description>{items}</channel></rss>\n')
+
+
+def generate(total_items, root=FIXTURE_DIR, seed=0):
+    """
+    Write RSS fixtures holding `total_items` entries spread over every configured feed.
+
+    Returns:
+        Path: the fixture folder (one .xml per feed + manifest.json: URL -> file)
+    """
+    urls = feed_urls()
+    folder = Path(root) / f"rss-{total_items}"
+    manifest_path = folder / 'manifest.json'
+    if manifest_path.exists():
+        return folder
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    per_feed, extra = divmod(total_items, len(urls))
+    for n, url in enumerate(urls):
+        name = fixture_name(url)
+        (folder / name).write_text(rss_xml(url, per_feed + (n < extra), seed), encoding='utf-8')
+        manifest[url] = name
+    manifest_path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    return folder
+
+
+def record(urls=None, root=FIXTURE_DIR, timeout=30):
+    """Save the live responses of the configured feeds (needs network)"""
+    import requests
+
+    folder = Path(root) / 'recorded'
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for url in urls or feed_urls():
+        try:
+            resp = requests.get(url, timeout=timeout, headers={'User-Agent': 'Mozilla/5.0'})
+        except requests.RequestException as e:
+            print(f"  ✗ {url}: {e}")
+            continue
+        if resp.status_code != 200:
+            print(f"  ✗ {url}: HTTP {resp.status_code}")
+            continue
+        name = fixture_name(url)
+        (folder / name).write_bytes(resp.content)
+        manifest[url] = name
+    (folder / 'manifest.json').write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    print(f"✓ Recorded {len(manifest)} feeds -> {folder}")
+    return folder
+
+
+def portal_items(n, seed=0):
+    """Raw items as the Selenium/HTML collectors return them (Ariba, Sesami, JPMC, TenderBoard, STL, GeBIZ)"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        day = BASE_DATE - timedelta(days=rng.randint(0, DAYS_SPAN))
+        close = day + timedelta(days=rng.randint(7, 30))
+        kind = i % 6
+        if kind == 0:
+            items.append({'source': 'ariba', 'title': f'Ariba sourcing event {i}', 'link': f'https://ariba/{i}',
+                          'published': f'{day:%Y-%m-%d}', 'close_date': f'{close:%d %b %Y}',
+                          'doc_id': f'Doc{i}', 'rfi_id': f'{1110000000 + i}', 'buyer': rng.choice(AGENCIES),
+                          'category': 'Medical'})
+        elif kind == 1:
+            items.append({'source': 'sesami', 'title': f'Sesami RFQ {i}', 'link': f'https://sesami/{i}',
+                          'published': f'{day:%Y-%m-%d}', 'itq_itt': f'R{i}', 'calling_entity': 'CAG',
+                          'closing_date': f'{close:%d %b %Y} 17:00', 'category': 'Sesami Opportunity',
+                          'opportunity_amount': ''})
+        elif kind == 2:
+            items.append({'source': 'JPMC Brunei', 'title': f'JPMC tender {i}', 'ref_no': f'JPMC/{i}',
+                          'link': f'https://jpmc/{i}', 'pub_date': f'{day:%d %b %Y}',
+                          'closing_date': f'{close:%d %b %Y}'})
+        elif kind == 3:
+            items.append({'source': 'TenderBoard', 'title': f'TO2025{i:05d}A Works closing {close:%d %b %Y}',
+                          'link': f'https://tenderboard/{i}', 'buyer': rng.choice(AGENCIES),
+                          'industry': 'Construction', 'pub_date': f'{day:%d %b %Y}',
+                          'close_date': f'{close:%d %b %Y}', 'ref_no': f'TO{i}'})
+        elif kind == 4:
+            items.append({'source': 'ST Logistics (STL)', 'title': f'STL RFQ {i}', 'ref_no': f'STL{i}',
+                          'link': f'https://stl/{i}', 'pub_date': f'{day:%Y-%m-%d} 08:00:00',
+                          'closing_date': f'{close:%Y-%m-%d} 13:00:00', 'category': 'General'})
+        else:
+            search_type = 'AWD' if i % 12 == 5 else 'BO'
+            items.append({'source': 'gebiz_selenium', 'title': f'GeBIZ search result {i}', 'link': f'https://gebiz/{i}',
+                          'agency': rng.choice(AGENCIES), 'publish_date_str': f'{day:%d %b %Y} 04:00PM',
+                          'closing_date_str': f'{close:%d %b %Y} 04:00PM', 'document_no': f'NST000ETT26{i:05d}',
+                          'category': 'Business Opportunities', 'awarded_to': 'Vendor Pte Ltd' if search_type == 'AWD' else '',
+                          'award_value': '1000' if search_type == 'AWD' else '',
+                          'awarded_date_str': f'{close:%d %b %Y}' if search_type == 'AWD' else '',
+                          'search_type': search_type, '_is_award': search_type == 'AWD'})
+    return items
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest='command', required=True)
+    gen = sub.add_parser('generate', help='write deterministic RSS fixtures')
+    gen.add_argument('--items', type=int, default=10000)
+    sub.add_parser('record', help='record the live feeds')
+    args = ap.parse_args()
+
+    if args.command == 'generate':
+        folder = generate(args.items)
+        print(f"✓ RSS fixtures ({args.items} items, {len(feed_urls())} feeds) -> {folder}")
+    else:
+        record()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,377 @@
+"""
+Local stub of the tender portals for offline end-to-end and load tests.
+
+Serves, on one port:
+    /rss/<feed>.xml                          GeBIZ RSS (recorded fixture if present, else generated)
+    /ptn/opportunity/BOAdvancedSearch.xhtml  GeBIZ advanced search: categories, date ranges,
+                                             Open/Closed tabs and Next paging (form posts, like JSF)
+    /bizopps/businessOpportunities.jsp       Sesami opportunity table (page size + Next)
+    /tender-quotation/                       JPMC tender list
+    /singaporetenders                        TenderBoard open deals (Next paging)
+
+The markup carries the classes and ids the collectors look for, and the data
+is deterministic (seeded) with dates relative to today, so the normal date
+windows find results. Point the collectors at it with PORTAL_BASE_URL:
+
+    python benchmarks/stub_server.py --port 8765 --latency 0.2 &
+    PORTAL_BASE_URL=http://127.0.0.1:8765 python app_enhanced.py
+
+Usage:
+    python benchmarks/stub_server.py [--port 8765] [--items 200] [--rss-entries 20]
+                                     [--latency 0] [--seed 0]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import AGENCIES, FIXTURE_DIR, feed_urls, rss_xml
+from util.portals import PORTAL_DEFAULTS
+
+GEBIZ_PAGE_SIZE = 10
+TENDERBOARD_PAGE_SIZE = 20
+DAYS_SPAN = 60
+NO_ENTER = "if(event.key==='Enter'){event.preventDefault();}"
+
+
+def page_html(title, body):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{escape(title)}</title></head>"
+            f"<body>{body}</body></html>")
+
+
+# ---------------------------------------------------------------------------
+# Deterministic portal data
+# ---------------------------------------------------------------------------
+
+def gebiz_categories():
+    """[(main, sub)] of config/feeds.yaml, numbering ('1. ', 'a. ') removed"""
+    from util.feed_catalogue import catalogue
+    return [tuple(category.split(' > ', 1)) for category in catalogue().by_category]
+
+
+class PortalData:
+    """Result sets for every portal, built once per server"""
+
+    def __init__(self, items=200, seed=0, today=None):
+        self.today = (today or datetime.now()).replace(hour=16, minute=0, second=0, microsecond=0)
+        rng = random.Random(seed)
+        categories = gebiz_categories() or [('Others', 'Others')]
+        self.categories = categories
+
+        self.gebiz = []
+        for i in range(items):
+            main, sub = rng.choice(categories)
+            published = self.today - timedelta(days=rng.randint(0, DAYS_SPAN))
+            award = i % 3 == 2
+            self.gebiz.append({
+                'doc': f"{rng.choice(['HDB', 'MOH', 'NEA', 'NST'])}000ETT{published:%y}{i:06d}",
+                'title': f"{'Award of ' if award else ''}Provision of {sub.lower()} ({i})",
+                'agency': rng.choice(AGENCIES),
+                'main': main, 'sub': sub,
+                'published': published,
+                'closing': published + timedelta(days=rng.randint(7, 30)),
+                'awarded': published + timedelta(days=rng.randint(1, 20)) if award else None,
+                'vendor': f"Vendor {i % 17} Pte Ltd" if award else '',
+                'value': f"${rng.randint(1000, 900000):,}.00" if award else '',
+            })
+
+        self.sesami = [{
+            'buyer': rng.choice(['Changi Airport Group', 'SATS Ltd', 'Certis CISCO']),
+            'ref': f"RFQ{i:06d}", 'type': rng.choice(['RFQ', 'ITT']),
+            'title': f"Sesami opportunity {i}",
+            'start': self.today - timedelta(days=rng.randint(0, DAYS_SPAN)),
+            'doc_id': f"{i:032X}", 'hub': 'CAG',
+        } for i in range(items)]
+        for entry in self.sesami:
+            entry['closing'] = entry['start'] + timedelta(days=14)
+        self.sesami.sort(key=lambda e: e['start'], reverse=True)
+
+        self.jpmc = [{
+            'ref': f"JPMC/PD/TEN/{i:03d}/2026", 'title': f"Supply and delivery of equipment {i}",
+            'last_purchase': self.today + timedelta(days=rng.randint(-10, 30)),
+            'closing': self.today + timedelta(days=rng.randint(10, 40)),
+            'fee': f"BND {rng.randint(10, 200)}.00",
+        } for i in range(max(1, items // 4))]
+
+        self.tenderboard = [{
+            'title': f"TenderBoard deal {i}", 'buyer': rng.choice(['SAFRA', 'UWC', 'APSN', 'SINGAPORE INSTITUTE OF TECHNOLOGY']),
+            'industry': rng.choice(['Construction: General Building', 'IT: Software', 'Facilities Management']),
+            'ref': f"TO2026{i:05d}A", 'start': self.today - timedelta(days=rng.randint(0, DAYS_SPAN)),
+        } for i in range(items)]
+        for entry in self.tenderboard:
+            entry['end'] = entry['start'] + timedelta(days=21)
+        self.tenderboard.sort(key=lambda e: e['start'], reverse=True)
+
+
+def _ddmmyyyy(value):
+    digits = re.sub(r'\D', '', value or '')
+    try:
+        return datetime.strptime(digits, '%d%m%Y') if len(digits) == 8 else None
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# GeBIZ advanced search
+# ---------------------------------------------------------------------------
+
+def _date_range(label, prefix):
+    pickers = ''.join(
+        f"<div class='datePicker_MAIN'><input type='text' class='datePicker_INPUT' name='{prefix}_{side}' "
+        f"placeholder='DDMMYYYY' onkeydown=\"{NO_ENTER}\">"
+        f"<input type='image' class='datePicker_BUTTON' alt='Calendar' src='data:,' onclick='return false;'></div>"
+        for side in ('from', 'to'))
+    return f"<div class='dateRangePicker_MAIN'><label>{label}</label>{pickers}</div>"
+
+
+def gebiz_search_form(data, base):
+    options = ''.join(
+        f"<div><input type='checkbox' name='category' value='{escape(main)} > {escape(sub)}' id='{cid}'>"
+        f"<label for='{cid}'>{escape(sub)}</label></div>"
+        for n, (main, sub) in enumerate(data.categories)
+        for cid in [f"cat_{re.sub(r'[^A-Za-z0-9]+', '_', main)}_{n}"])
+    toggle = ("var d=document.getElementById('catMenu');"
+              "d.style.display=d.style.display==='block'?'none':'block';event.stopPropagation();")
+    body = (f"<h1>Advanced Search</h1><form method='post' action='{base}'>"
+            f"<label>Procurement Category</label>"
+            f"<input type='button' class='selectManyMenu_BUTTON' value='Select' onclick=\"{toggle}\">"
+            f"<div id='catMenu' class='selectManyMenu_MENULIST_DIV' style='display:none'"
+            f" onclick='event.stopPropagation()'>{options}</div>"
+            + _date_range('Published Date', 'pub') + _date_range('Closing Date', 'close')
+            + _date_range('Awarded Date', 'awd')
+            + "<input type='submit' name='action' value='Search' id='searchButton'></form>")
+    return page_html('GeBIZ Advanced Search', body)
+
+
+def _gebiz_item_html(n, entry, base):
+    parts = [
+        f"<div>{n}   Tender - {entry['doc']}</div>",
+        f"<a class='commandLink_TITLE-BLUE' href='{base}/ptn/opportunity/directlink.xhtml?docCode={entry['doc']}'>"
+        f"{escape(entry['title'])}</a>",
+        f"<div>Agency</div><div>{escape(entry['agency'])}</div>",
+        f"<div>Procurement Category: {escape(entry['main'])} ⇒ {escape(entry['sub'])}</div>",
+        f"<div>Published</div><div>{entry['published']:%d %b %Y %I:%M%p}</div>",
+        f"<div>Closing on</div><div>{entry['closing']:%d %b %Y %I:%M%p}</div>",
+    ]
+    if entry['awarded']:
+        parts += [f"<div>Awarded to</div><div>{escape(entry['vendor'])}</div>",
+                  f"<div>Award Value</div><div>{entry['value']}</div>",
+                  f"<div>Awarded</div><div>{entry['awarded']:%d %b %Y}</div>"]
+    return f"<div class='formColumns_MAIN'>{''.join(parts)}</div>"
+
+
+def gebiz_results(data, form, base, site):
+    """Results page for a posted search form (state travels in hidden inputs, like JSF view state)"""
+    state = {k: v[-1] for k, v in form.items() if k not in ('category', 'action', 'nav', 'tab_btn')}
+    categories = form.get('category', [])
+    tab = state.get('tab', 'open')
+    page = int(state.get('page', 1) or 1)
+    if 'tab_btn' in form:
+        tab, page = ('closed' if 'Closed' in form['tab_btn'][-1] else 'open'), 1
+    elif 'nav' in form:
+        page += 1
+    elif 'action' in form:
+        tab, page = 'open', 1
+
+    def matches(entry, closed):
+        if categories and f"{entry['main']} > {entry['sub']}" not in categories:
+            return False
+        if closed != bool(entry['awarded']):
+            return False
+        prefix, value = ('awd', entry['awarded']) if closed else ('pub', entry['published'])
+        start, end = _ddmmyyyy(state.get(f'{prefix}_from')), _ddmmyyyy(state.get(f'{prefix}_to'))
+        if start and value < start:
+            return False
+        if end and value > end + timedelta(days=1):
+            return False
+        return True
+
+    open_items = [e for e in data.gebiz if matches(e, False)]
+    closed_items = [e for e in data.gebiz if matches(e, True)]
+    results = closed_items if tab == 'closed' else open_items
+    pages = max(1, -(-len(results) // GEBIZ_PAGE_SIZE))
+    page = min(page, pages)
+    shown = results[(page - 1) * GEBIZ_PAGE_SIZE:page * GEBIZ_PAGE_SIZE]
+
+    hidden = ''.join(f"<input type='hidden' name='{escape(k)}' value='{escape(v)}'>"
+                     for k, v in {**state, 'tab': tab, 'page': str(page)}.items())
+    hidden += ''.join(f"<input type='hidden' name='category' value='{escape(c)}'>" for c in categories)
+    tabs = (f"<input type='submit' name='tab_btn' value='Open ({len(open_items)})'>"
+            f"<input type='submit' name='tab_btn' value='Closed ({len(closed_items)})'>")
+    if shown:
+        listing = ''.join(_gebiz_item_html((page - 1) * GEBIZ_PAGE_SIZE + n + 1, e, site) for n, e in enumerate(shown))
+    else:
+        listing = "<div>No opportunity found</div>"
+    nav = f"<input type='submit' name='nav' value='Next'{'' if page < pages else ' disabled'}>"
+    body = (f"<form method='post' action='{base}'>{hidden}{tabs}"
+            f"<div>Page {page} of {pages}</div>{listing}{nav}</form>")
+    return page_html('GeBIZ Search Results', body)
+
+
+# ---------------------------------------------------------------------------
+# Sesami, JPMC, TenderBoard list pages
+# ---------------------------------------------------------------------------
+
+def sesami_page(data, query):
+    length = int(query.get('length', ['10'])[-1])
+    page = int(query.get('page', ['1'])[-1])
+    rows = data.sesami[(page - 1) * length:page * length]
+    options = ''.join(f"<option value='{n}'{' selected' if n == length else ''}>{n}</option>" for n in (10, 25, 50, 100))
+    select = ("<select name='rfqTender_length' "
+              f"onchange=\"location.search='?length='+this.value+'&page=1'\">{options}</select>")
+    body_rows = ''.join(
+        f"<tr><td>{escape(r['buyer'])}</td><td>{r['ref']}</td><td>{r['type']}</td><td>{escape(r['title'])}</td>"
+        f"<td>{r['start']:%d %b %Y %H:%M}</td><td>{r['closing']:%d %b %Y %H:%M}</td><td>Online</td>"
+        f"<td><a href=\"javascript:viewDetail('{r['doc_id']}','{r['hub']}')\">View</a></td></tr>"
+        for r in rows) or "<tr><td class='dataTables_empty' colspan='8'>No data available in table</td></tr>"
+    last = page * length >= len(data.sesami)
+    next_link = (f"<a id='rfqTender_next' class='paginate_button next{' disabled' if last else ''}' "
+                 f"href='?length={length}&page={page if last else page + 1}'>Next</a>")
+    body = (f"{select}<table id='rfqTender'><thead><tr><th>Buyer</th><th>Ref No</th><th>Type</th>"
+            f"<th>Description</th><th>Starting Date</th><th>Closing Date</th><th>Submission</th><th></th>"
+            f"</tr></thead><tbody>{body_rows}</tbody></table>{next_link}")
+    return page_html('Sesami Business Opportunities', body)
+
+
+def _ordinal(day):
+    return f"{day}{'TH' if 10 <= day % 100 <= 20 else {1: 'ST', 2: 'ND', 3: 'RD'}.get(day % 10, 'TH')}"
+
+
+def jpmc_page(data):
+    field = "<div class='jet-listing-dynamic-field__content'>{}</div>"
+    items = ''.join(
+        "<div class='jet-listing-grid__item'>"
+        + field.format(n + 1) + field.format(e['ref'])
+        + field.format(f"{escape(e['title'])}<br>Last Date For Tender Purchase: "
+                       f"{_ordinal(e['last_purchase'].day)} {e['last_purchase']:%B %Y}".upper())
+        + field.format('N/A') + field.format(e['fee'])
+        + field.format(f"{e['closing']:%d %b %Y} @ 12:00PM") + "</div>"
+        for n, e in enumerate(data.jpmc))
+    return page_html('JPMC Tender & Quotation', f"<div class='jet-listing-grid'>{items}</div>")
+
+
+def tenderboard_page(data, query, base):
+    page = int(query.get('page', ['1'])[-1])
+    shown = data.tenderboard[(page - 1) * TENDERBOARD_PAGE_SIZE:page * TENDERBOARD_PAGE_SIZE]
+    rows = ''.join(
+        "<div class='mdl-grid'>"
+        f"<div class='mdl-cell'><img class='agency-logo' alt='{escape(e['buyer'])}' src='data:,'></div>"
+        f"<div class='mdl-cell'><a class='OpenDeals-viewLink-2203344' href='{base}/deal/{e['ref']}'>{escape(e['title'])}</a></div>"
+        f"<div class='mdl-cell'>Industry: {escape(e['industry'])}</div>"
+        f"<div class='mdl-cell'>{e['ref']}</div>"
+        f"<div class='mdl-cell'>{e['start']:%d %b} - {e['end']:%d %b}</div>"
+        "</div>"
+        for e in shown)
+    last = page * TENDERBOARD_PAGE_SIZE >= len(data.tenderboard)
+    pager = (f"<ul><li class='btn-next-page{' disabled' if last else ''}'>"
+             f"<a href='?page={page if last else page + 1}'>Next</a></li></ul>")
+    return page_html('TenderBoard Open Deals',
+                     f"<div class='OpenDeals-resultWrapper-1188477338'>{rows}</div>{pager}")
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class StubHandler(BaseHTTPRequestHandler):
+    data = None          # PortalData, set by make_server()
+    rss_entries = 20
+    latency = 0.0
+    seed = 0
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type='text/html; charset=utf-8', status=200):
+        if self.latency:
+            time.sleep(self.latency)
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _site(self):
+        return f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+    def _rss(self, name):
+        recorded = FIXTURE_DIR / 'recorded' / name
+        if recorded.is_file():
+            return recorded.read_text(encoding='utf-8', errors='replace')
+        url = f"{PORTAL_DEFAULTS['gebiz']}/rss/{name}"
+        if url not in self.server.feed_urls:
+            return None
+        return rss_xml(url, self.rss_entries, self.seed, base_date=self.data.today)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+        if path.startswith('/rss/'):
+            xml = self._rss(path[len('/rss/'):])
+            if xml is None:
+                return self._send('Not found', 'text/plain', 404)
+            return self._send(xml, 'application/rss+xml; charset=utf-8')
+        if path == '/ptn/opportunity/BOAdvancedSearch.xhtml':
+            return self._send(gebiz_search_form(self.data, path))
+        if path == '/ptn/opportunity/directlink.xhtml':
+            return self._send(page_html('GeBIZ Opportunity', f"<h1>{escape(query.get('docCode', [''])[-1])}</h1>"))
+        if path == '/bizopps/businessOpportunities.jsp':
+            return self._send(sesami_page(self.data, query))
+        if path.rstrip('/') == '/tender-quotation':
+            return self._send(jpmc_page(self.data))
+        if path == '/singaporetenders':
+            return self._send(tenderboard_page(self.data, query, self._site()))
+        if path == '/':
+            return self._send('Tender portal stub', 'text/plain')
+        self._send('Not found', 'text/plain', 404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'), keep_blank_values=True)
+        path = urlsplit(self.path).path
+        if path == '/ptn/opportunity/BOAdvancedSearch.xhtml':
+            return self._send(gebiz_results(self.data, form, path, self._site()))
+        self._send('Not found', 'text/plain', 404)
+
+
+def make_server(port=8765, items=200, rss_entries=20, latency=0.0, seed=0, host='127.0.0.1'):
+    """Build the stub server (call serve_forever() on it, e.g. in a thread)"""
+    handler = type('Handler', (StubHandler,), {
+        'data': PortalData(items, seed), 'rss_entries': rss_entries, 'latency': latency, 'seed': seed,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.feed_urls = set(feed_urls())
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--items', type=int, default=200, help='results per portal')
+    ap.add_argument('--rss-entries', type=int, default=20, help='entries per generated feed')
+    ap.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    server = make_server(args.port, args.items, args.rss_entries, args.latency, args.seed, args.host)
+    print(f"✓ Portal stub on http://{args.host}:{server.server_address[1]} "
+          f"(set PORTAL_BASE_URL to this address)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -10,14 +10,21 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from util.driver_setup import get_chrome_driver
+from util.log import Sampler, get_logger
+from util.portals import portal_url
+from util.snapshots import save_page
+from util.timing import laps, span
+
+log = get_logger(__name__)
 
 
 
 class AribaScraper:
     def __init__(self, headless=True):
-        self.driver = get_chrome_driver(headless)
+        with span('ariba.chrome_start'):
+            self.driver = get_chrome_driver(headless)
         self.wait = WebDriverWait(self.driver, 15)
-        self.base_url = 'https://portal.us.bn.cloud.ariba.com/dashboard/public/appext/comsapsbncdiscoveryui#/leads/search?anId=ANONYMOUS'
+        self.base_url = portal_url('ariba', '/dashboard/public/appext/comsapsbncdiscoveryui#/leads/search?anId=ANONYMOUS')
 
     def close(self):
         if self.driver:
@@ -197,6 +204,8 @@ class AribaScraper:
 
     def _scrape_current_page(self):
         items = []
+        details = laps('ariba.details')
+        progress = Sampler(log, every=10)
         try:
             print("[Extract] finding items...")
             # Wait for items to be present
@@ -268,7 +277,8 @@ class AribaScraper:
                 
                 if "Mock" in item_data['title']: continue
 
-                print(f"  Processing [{i+1}]: {item_data['title'][:40]}...")
+                progress.info("  Processing [%d]: %.40s...", i + 1, item_data['title'])
+                details.next(item=i + 1)
 
                 # 2. Get Details via New Tab Strategy
                 try:
@@ -398,9 +408,11 @@ class AribaScraper:
                 if item_data['title'] != 'N/A':
                     items.append(item_data)
                 
+            details.close()
             return items
 
         except Exception as e:
+            details.close()
             print(f"  [!] Extraction error: {e}")
             return []
 
@@ -423,8 +435,11 @@ class AribaScraper:
 
         previous_first_item_text = None
 
+        pages = laps('ariba.page')
         for page in range(max_pages):
+            pages.next(page=page + 1)
             print(f"[Pagination] Page {page+1}/{max_pages} (Collected: {len(all_items)}/{expected_total})")
+            save_page(self.driver, 'ariba', page + 1)
             
             # Scrape current page
             page_items = self._scrape_current_page()
@@ -507,6 +522,7 @@ class AribaScraper:
                 else:
                         print("  [Pagination] Warning: Content did not appear to change (or identical top item). Continuing anyway...")
         
+        pages.close()
         return all_items
 
     def ensure_search_context(self, keyword):
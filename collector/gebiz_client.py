@@ -13,6 +13,9 @@ from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 
 from util.driver_setup import get_chrome_driver
+from util.portals import portal_url
+from util.snapshots import save_page
+from util.timing import laps, span
 class GeBizClient:
     def setup_driver(self, headless=True):
         """Setup Chrome WebDriver with options"""
@@ -190,10 +193,12 @@ class GeBizClient:
         search_type: 'BO' (Business Opportunities) or 'AWD' (Awards)
         categories: List of category names (e.g. ['Construction', 'IT Services'])
         """
-        driver = self.setup_driver(headless=headless)
+        with span('gebiz.chrome_start'):
+            driver = self.setup_driver(headless=headless)
         items = []
+        pages = laps('gebiz.page')
         
-        url = "https://www.gebiz.gov.sg/ptn/opportunity/BOAdvancedSearch.xhtml?origin=opportunities"
+        url = portal_url('gebiz', "/ptn/opportunity/BOAdvancedSearch.xhtml?origin=opportunities")
         print(f"GeBizClient: Advanced Search ({search_type}) for {len(categories) if categories else 0} categories...")
         print(f"  Range: {start_date} to {end_date}")
         
@@ -577,7 +582,9 @@ class GeBizClient:
             # ---------------------------------------------------------
             page_num = 1
             while True:
+                pages.next(page=page_num, search_type=search_type)
                 print(f"  Processing Result Page {page_num}...")
+                save_page(driver, 'gebiz', page_num, search_type)
                 
                 src = driver.page_source
                 if "No opportunity found" in src or "No records found" in src:
@@ -639,6 +646,7 @@ class GeBizClient:
             import traceback
             traceback.print_exc()
         finally:
+            pages.close()
             driver.quit()
         
         return items
@@ -713,10 +721,11 @@ class GeBizClient:
         """Legacy Listing Fetcher (Simulated via Main Listing)"""
         # Kept for compatibility if needed, but app likely switches to fetch_advanced
         # Using the same _extract_page_items logic
-        driver = self.setup_driver(headless=True)
+        with span('gebiz.chrome_start'):
+            driver = self.setup_driver(headless=True)
         items = []
         try:
-             driver.get("https://www.gebiz.gov.sg/ptn/opportunity/BOListing.xhtml?origin=opportunities")
+             driver.get(portal_url('gebiz', "/ptn/opportunity/BOListing.xhtml?origin=opportunities"))
              wait = WebDriverWait(driver, 20)
              # Search " " to reveal
              search_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder='Enter keywords']")))
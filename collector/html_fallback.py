@@ -13,6 +13,8 @@ This fallback is provided as last resort only. It is DISABLED by default.
 import requests
 from bs4 import BeautifulSoup
 
+from util.portals import rebase
+
 # GeBIZ Today's Opportunities page
 TODAY_URL = 'https://www.gebiz.gov.sg/ptn/opportunity/BOListing.xhtml?origin=opportunities'
 
@@ -52,7 +54,7 @@ def fetch_today_opportunities():
             'Accept-Language': 'en-US,en;q=0.9',
         }
         
-        resp = requests.get(TODAY_URL, headers=headers, timeout=20)
+        resp = requests.get(rebase(TODAY_URL), headers=headers, timeout=20)
         resp.raise_for_status()
         
         print(f"HTTP Status: {resp.status_code}")
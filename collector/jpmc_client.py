@@ -7,6 +7,10 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
 
+from util.metrics import BROWSER_LAUNCHES
+from util.portals import portal_url
+from util.timing import span
+
 def setup_driver(headless=True):
     options = Options()
     if headless:
@@ -18,12 +22,17 @@ def setup_driver(headless=True):
     options.add_argument('--disable-blink-features=AutomationControlled')
     options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     
-    driver = webdriver.Chrome(options=options)
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception:
+        BROWSER_LAUNCHES.inc(status='error')
+        raise
+    BROWSER_LAUNCHES.inc(status='ok')
     return driver
 
 class JPMCClient:
     def __init__(self):
-        self.base_url = "https://jpmcbrunei.com/tender-quotation/"
+        self.base_url = portal_url('jpmc', "/tender-quotation/")
         self.driver = None
 
     def fetch_opportunities(self, date_mode='all', start_date=None, end_date=None):
@@ -32,19 +41,22 @@ class JPMCClient:
         Returns a list of dicts.
         """
         items = []
-        self.driver = setup_driver(headless=True)
+        with span('jpmc.chrome_start'):
+            self.driver = setup_driver(headless=True)
         
         try:
             print(f"JPMCClient: Navigating to {self.base_url}")
             if start_date:
                 print(f"JPMCClient: Filter mode {date_mode} ({start_date.date()} to {end_date.date() if end_date else 'Now'})")
 
-            self.driver.get(self.base_url)
-            
-            # Wait for grid items to load
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "jet-listing-grid__item"))
-            )
+            # The listing is a single page
+            with span('jpmc.page', page=1):
+                self.driver.get(self.base_url)
+                
+                # Wait for grid items to load
+                WebDriverWait(self.driver, 20).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "jet-listing-grid__item"))
+                )
             
             # Find all grid items (rows)
             grid_items = self.driver.find_elements(By.CLASS_NAME, "jet-listing-grid__item")
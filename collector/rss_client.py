@@ -1,20 +1,13 @@
-import feedparser
-import yaml
-import requests
 import time
-from pathlib import Path
 from datetime import datetime
-from functools import lru_cache
 
-@lru_cache(maxsize=1)
-def load_feeds_config():
-    """Load RSS feed configuration from YAML file"""
-    cfg = Path('config/feeds.yaml')
-    if not cfg.exists():
-        print("WARNING: config/feeds.yaml not found!")
-        return {}
-    data = yaml.safe_load(cfg.read_text()) or {}
-    return data.get('feeds', {})
+from util.feed_catalogue import catalogue, load_feeds_config  # load_feeds_config re-exported for callers
+from util.log import get_logger
+from util.metrics import RSS_BYTES, RSS_RESPONSES, RSS_RETRIES
+from util.portals import rebase
+from util.timing import span
+
+log = get_logger(__name__)
 
 def fetch_single_feed(url, headers, timeout=15, max_retries=3):
     """
@@ -29,21 +22,28 @@ def fetch_single_feed(url, headers, timeout=15, max_retries=3):
     Returns:
         tuple: (success, items, error_message)
     """
+    # Imported on first fetch: the index page only needs load_feeds_config()
+    import feedparser
+    import requests
+
     items = []
     
     for attempt in range(max_retries):
+        if attempt:
+            RSS_RETRIES.inc()
         try:
-            print(f"  Fetching: {url}")
-            print(f"    Attempt {attempt + 1}/{max_retries}...")
+            log.debug("Fetching %s (attempt %d/%d)", url, attempt + 1, max_retries)
             
             # Fetch with requests
-            resp = requests.get(url, headers=headers, timeout=timeout)
+            resp = requests.get(rebase(url), headers=headers, timeout=timeout)
+            RSS_RESPONSES.inc(status=resp.status_code)
+            RSS_BYTES.inc(len(resp.content))
             
-            print(f"    HTTP Status: {resp.status_code}")
+            log.debug("    HTTP %s, %d bytes", resp.status_code, len(resp.content))
             
             if resp.status_code != 200:
                 if attempt < max_retries - 1:
-                    print(f"    Non-200 status, retrying in 2 seconds...")
+                    log.debug("    Non-200 status, retrying in 2 seconds...")
                     time.sleep(2)
                     continue
                 else:
@@ -51,7 +51,7 @@ def fetch_single_feed(url, headers, timeout=15, max_retries=3):
             
             # Check content type
             content_type = resp.headers.get('Content-Type', '')
-            print(f"    Content-Type: {content_type}")
+            log.debug("    Content-Type: %s", content_type)
             
             # Parse RSS/XML
             feed = feedparser.parse(resp.text)
@@ -59,19 +59,19 @@ def fetch_single_feed(url, headers, timeout=15, max_retries=3):
             # Check for parsing errors
             if hasattr(feed, 'bozo') and feed.bozo:
                 bozo_exception = getattr(feed, 'bozo_exception', 'Unknown parsing error')
-                print(f"    WARNING: Feed parsing issue: {bozo_exception}")
+                log.debug("    Feed parsing issue for %s: %s", url, bozo_exception)
                 # Continue anyway, some feeds work despite bozo flag
             
             # Check if feed has entries
             if not feed.entries:
-                print(f"    WARNING: Feed has 0 entries")
+                log.debug("    Feed has 0 entries")
                 # Check if it's actually XML/RSS
                 if 'xml' not in content_type.lower() and 'rss' not in content_type.lower():
                     return False, [], f"Not XML/RSS content (got: {content_type})"
                 # Empty feed is not an error, just no items
                 return True, [], None
             
-            print(f"    ✓ Found {len(feed.entries)} entries")
+            log.debug("    ✓ Found %d entries", len(feed.entries))
             
             # Extract items
             for e in feed.entries:
@@ -140,43 +140,63 @@ def fetch_single_feed(url, headers, timeout=15, max_retries=3):
             
         except requests.exceptions.Timeout:
             error = f"Timeout after {timeout}s"
-            print(f"    ERROR: {error}")
+            RSS_RESPONSES.inc(status='timeout')
+            log.debug("    ERROR: %s", error)
             if attempt < max_retries - 1:
-                print(f"    Retrying in 3 seconds...")
+                log.debug("    Retrying in 3 seconds...")
                 time.sleep(3)
                 continue
             return False, [], error
             
         except requests.exceptions.ConnectionError as e:
             error = f"Connection error: {str(e)[:100]}"
-            print(f"    ERROR: {error}")
+            RSS_RESPONSES.inc(status='error')
+            log.debug("    ERROR: %s", error)
             if attempt < max_retries - 1:
-                print(f"    Retrying in 3 seconds...")
+                log.debug("    Retrying in 3 seconds...")
                 time.sleep(3)
                 continue
             return False, [], error
             
         except requests.exceptions.RequestException as e:
             error = f"Request error: {str(e)[:100]}"
-            print(f"    ERROR: {error}")
+            RSS_RESPONSES.inc(status='error')
+            log.debug("    ERROR: %s", error)
             if attempt < max_retries - 1:
-                print(f"    Retrying in 3 seconds...")
+                log.debug("    Retrying in 3 seconds...")
                 time.sleep(3)
                 continue
             return False, [], error
             
         except Exception as e:
             error = f"Unexpected error: {str(e)[:100]}"
-            print(f"    ERROR: {error}")
+            log.debug("    ERROR: %s", error)
             if attempt < max_retries - 1:
-                print(f"    Retrying in 3 seconds...")
+                log.debug("    Retrying in 3 seconds...")
                 time.sleep(3)
                 continue
             return False, [], error
     
     return False, [], "Max retries exceeded"
 
-def fetch_feeds(selected_urls=None, all_feeds=False, date_mode='today', start_date=None, end_date=None):
+def drop_undated(items):
+    """
+    Items whose 'published' date parses.
+
+    With defer_date_filter=True fetch_feeds leaves the window check to the
+    caller, whose post-filter keeps undated portal results; undated feed
+    entries were never passed on by the RSS stage, so the caller drops them
+    here first.
+    """
+    from util.dates import parse_date
+
+    dated = [item for item in items if parse_date(item.get('published', ''), dayfirst=False)]
+    if len(dated) < len(items):
+        log.info("📅 RSS: %d items without a published date excluded", len(items) - len(dated))
+    return dated
+
+def fetch_feeds(selected_urls=None, all_feeds=False, date_mode='today', start_date=None, end_date=None,
+                window=None, defer_date_filter=False):
     """
     Fetch items from RSS feeds with detailed logging and date filtering
     
@@ -186,45 +206,39 @@ def fetch_feeds(selected_urls=None, all_feeds=False, date_mode='today', start_da
         date_mode: 'today', 'last_7_days', 'last_24_hours', 'custom', 'specific_date', 'all'
         start_date: Start date for custom/specific_date mode (YYYY-MM-DD)
         end_date: End date for custom mode (YYYY-MM-DD)
+        window: DateWindow shared with the other stages (resolved from date_mode if None)
+        defer_date_filter: Skip the date check here because the caller filters the
+            combined results with the same window (each item is checked once);
+            the caller then drops undated items with drop_undated()
         
     Returns:
         list: List of feed items (filtered by date if date_mode != 'all')
     """
-    from dateutil import parser as date_parser
-    import pytz
-    from datetime import timedelta
+    from util.dates import parse_date
+    from util.date_window import DateWindow
     
-    print("\n" + "="*80)
-    print("RSS FEED FETCHING STARTED (GeBIZ)")
-    print("="*80)
-    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Date Mode: {date_mode}")
+    log.info("RSS FEED FETCHING STARTED (GeBIZ) at %s, date mode %s",
+             datetime.now().strftime('%Y-%m-%d %H:%M:%S'), date_mode)
     if start_date or end_date:
-        print(f"Date Range: {start_date or 'N/A'} to {end_date or 'N/A'}")
+        log.info("Date Range: %s to %s", start_date or 'N/A', end_date or 'N/A')
     
     # Collect URLs to fetch
     feed_urls = set()
     
     if selected_urls:
         feed_urls.update(selected_urls)
-        print(f"Mode: Selected feeds ({len(feed_urls)} URLs)")
+        log.info("Mode: Selected feeds (%d URLs)", len(feed_urls))
     
     if all_feeds or (not selected_urls):
         if all_feeds:
-            feeds = load_feeds_config()
-            for main, subs in feeds.items():
-                for sub, types in subs.items():
-                    for url in types.values():
-                        feed_urls.add(url)
-            print(f"Mode: All feeds ({len(feed_urls)} URLs)")
+            feed_urls.update(catalogue().urls())
+            log.info("Mode: All feeds (%d URLs)", len(feed_urls))
     
     if not feed_urls:
-        print("WARNING: No feed URLs to fetch!")
-        print("="*80 + "\n")
+        log.warning("No feed URLs to fetch!")
         return []
     
-    print(f"Total feeds to fetch: {len(feed_urls)}")
-    print("="*80 + "\n")
+    log.info("Total feeds to fetch: %d", len(feed_urls))
     
     # HTTP headers
     # HTTP headers (Mimic Chrome to avoid blocking)
@@ -244,84 +258,40 @@ def fetch_feeds(selected_urls=None, all_feeds=False, date_mode='today', start_da
     empty_count = 0
     
     for idx, url in enumerate(feed_urls, 1):
-        print(f"\n[{idx}/{len(feed_urls)}] Processing feed:")
-        
-        success, items, error = fetch_single_feed(url, headers)
+        with span('rss.feed', url=url):
+            success, items, error = fetch_single_feed(url, headers)
         
         if success:
             if items:
                 all_items.extend(items)
                 success_count += 1
-                print(f"  ✓ SUCCESS: Added {len(items)} items")
+                log.debug("[%d/%d] ✓ SUCCESS: Added %d items", idx, len(feed_urls), len(items))
             else:
                 empty_count += 1
-                print(f"  ⚠ EMPTY: Feed has no entries")
+                log.debug("[%d/%d] ⚠ EMPTY: Feed has no entries", idx, len(feed_urls))
         else:
             fail_count += 1
-            print(f"  ✗ FAILED: {error}")
+            log.warning("[%d/%d] ✗ FAILED: %s (%s)", idx, len(feed_urls), error, url,
+                        extra={'feed_url': url, 'error': error})
         
         # Small delay between requests to be polite
         if idx < len(feed_urls):
             time.sleep(0.5)
     
     # Summary
-    print("\n" + "="*80)
-    print("FETCH SUMMARY")
-    print("="*80)
-    print(f"Total feeds attempted: {len(feed_urls)}")
-    print(f"✓ Successful with items: {success_count}")
-    print(f"⚠ Empty feeds: {empty_count}")
-    print(f"✗ Failed: {fail_count}")
-    print(f"📊 Total items retrieved: {len(all_items)}")
-    print("="*80 + "\n")
+    log.info("📊 RSS fetch summary: %d feeds, %d with items, %d empty, %d failed, %d items",
+             len(feed_urls), success_count, empty_count, fail_count, len(all_items),
+             extra={'feeds': len(feed_urls), 'succeeded': success_count, 'empty': empty_count,
+                    'failed': fail_count, 'items': len(all_items)})
     
     # Apply date filtering if not 'all' mode
-    if date_mode != 'all' and all_items:
-        print("📅 Applying GeBIZ date filter...")
-        
-        sg_tz = pytz.timezone('Asia/Singapore')
-        now = datetime.now(sg_tz)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # Calculate cutoff date
-        cutoff_date = None
-        end_date_obj = None
-        
-        if start_date:
-            try:
-                cutoff_date = datetime.strptime(start_date, '%Y-%m-%d')
-                cutoff_date = sg_tz.localize(cutoff_date.replace(hour=0, minute=0, second=0, microsecond=0))
-            except:
-                print(f"⚠ Invalid start_date: {start_date}")
-        
-        if end_date:
-            try:
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-                end_date_obj = sg_tz.localize(end_date_obj.replace(hour=23, minute=59, second=59, microsecond=999999))
-            except:
-                print(f"⚠ Invalid end_date: {end_date}")
-        
-        if not cutoff_date:
-            if date_mode == 'today':
-                cutoff_date = today_start
-            elif date_mode == 'last_24_hours':
-                cutoff_date = now - timedelta(hours=24)
-            elif date_mode == 'last_7_days':
-                cutoff_date = today_start - timedelta(days=6)
-            elif date_mode == 'last_14_days':
-                cutoff_date = today_start - timedelta(days=13)
-            elif date_mode == 'last_31_days':
-                cutoff_date = today_start - timedelta(days=30)
-            elif date_mode == 'last_90_days':
-                cutoff_date = today_start - timedelta(days=89)
-            elif date_mode == 'last_365_days':
-                cutoff_date = today_start - timedelta(days=364)
-            elif date_mode in ['custom', 'specific_date']:
-                cutoff_date = today_start  # Default to today if no start_date
-        
-        print(f"   Cutoff: {cutoff_date}")
-        if end_date_obj:
-            print(f"   End: {end_date_obj}")
+    if date_mode != 'all' and all_items and defer_date_filter:
+        log.info("📅 GeBIZ date filter deferred to post-filter (%s)", window)
+    elif date_mode != 'all' and all_items:
+        log.info("📅 Applying GeBIZ date filter...")
+        if window is None:
+            window = DateWindow.resolve(date_mode, start_date, end_date)
+        log.info("   Window: %s -> %s", window.start, window.end or 'now')
         
         # Filter items
         filtered_items = []
@@ -331,55 +301,26 @@ def fetch_feeds(selected_urls=None, all_feeds=False, date_mode='today', start_da
         for item in all_items:
             pub_str = item.get('published', '')
             
-            if not pub_str:
+            # Parse date (memoized, returns SG time)
+            pub_dt = parse_date(pub_str, dayfirst=False) if pub_str else None
+            if pub_dt is None:
                 items_no_date += 1
-                continue
-            
-            # Parse date
-            try:
-                pub_dt = date_parser.parse(pub_str)
-                if pub_dt.tzinfo is None:
-                    pub_dt = sg_tz.localize(pub_dt)
-                else:
-                    pub_dt = pub_dt.astimezone(sg_tz)
-                
-                # Check date range
-                if cutoff_date and pub_dt < cutoff_date:
-                    items_out_of_range += 1
-                    continue
-                
-                if end_date_obj and pub_dt > end_date_obj:
-                    items_out_of_range += 1
-                    continue
-                
+            elif window.contains(pub_dt):
                 filtered_items.append(item)
-                
-            except:
-                items_no_date += 1
-                continue
+            else:
+                items_out_of_range += 1
         
-        print(f"   ✓ Items in range: {len(filtered_items)}")
-        print(f"   ⏭ Items without date: {items_no_date}")
-        print(f"   ⏭ Items out of range: {items_out_of_range}")
-        print(f"   📊 Filter result: {len(filtered_items)}/{len(all_items)} items")
+        log.info("   📊 Filter result: %d/%d items (%d without date, %d out of range)",
+                 len(filtered_items), len(all_items), items_no_date, items_out_of_range)
         
         all_items = filtered_items
     
     if fail_count > 0:
-        print("⚠ TROUBLESHOOTING TIPS:")
-        print("  1. Check internet connection")
-        print("  2. Verify GeBIZ website is accessible: https://www.gebiz.gov.sg")
-        print("  3. Check if corporate firewall/proxy is blocking RSS feeds")
-        print("  4. Try accessing an RSS feed directly in browser")
-        print("  5. Check if feeds have been recently updated by GeBIZ")
-        print("="*80 + "\n")
+        log.warning("⚠ %d feeds failed: check the internet connection, that https://www.gebiz.gov.sg "
+                    "is reachable and that no firewall/proxy blocks RSS feeds", fail_count)
     
     if len(all_items) == 0 and success_count == 0:
-        print("❌ NO ITEMS RETRIEVED!")
-        print("   Possible reasons:")
-        print("   - Network/firewall blocking access to www.gebiz.gov.sg")
-        print("   - All selected feeds are currently empty")
-        print("   - GeBIZ RSS service may be temporarily unavailable")
-        print("="*80 + "\n")
+        log.error("❌ NO ITEMS RETRIEVED! (network/firewall blocking www.gebiz.gov.sg, "
+                  "empty feeds or GeBIZ RSS temporarily unavailable)")
     
     return all_items
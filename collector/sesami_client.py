@@ -11,6 +11,9 @@ from dateutil import parser
 import pytz
 
 from util.driver_setup import get_chrome_driver
+from util.portals import portal_url
+from util.snapshots import save_page
+from util.timing import laps, span
 
 def setup_driver(headless=True):
     return get_chrome_driver(headless)
@@ -48,6 +51,7 @@ def fetch_sesami_opportunities(headless=True, date_mode='24h', custom_days=None,
     """
     driver = None
     opportunities = []
+    pages = laps('sesami.page')
     
     # Determine date cutoff
     sg_tz = pytz.timezone('Asia/Singapore')
@@ -86,10 +90,11 @@ def fetch_sesami_opportunities(headless=True, date_mode='24h', custom_days=None,
     
     try:
         print("🌐 Starting Chrome for Sesami...")
-        driver = setup_driver(headless)
+        with span('sesami.chrome_start'):
+            driver = setup_driver(headless)
         wait = WebDriverWait(driver, 20)
         
-        url = "https://sesami.online/bizopps/businessOpportunities.jsp"
+        url = portal_url('sesami', "/bizopps/businessOpportunities.jsp")
         print(f"📡 Loading {url}...")
         driver.get(url)
         
@@ -114,12 +119,14 @@ def fetch_sesami_opportunities(headless=True, date_mode='24h', custom_days=None,
         stop_fetching = False
         
         while not stop_fetching:
+            pages.next(page=page)
             print(f"📄 Processing Page {page}...")
             
             # Get Rows
             try:
                 # Wait for rows
                 rows = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#rfqTender tbody tr")))
+                save_page(driver, 'sesami', page)
             except:
                 print("⚠ No rows found or timeout.")
                 break
@@ -186,7 +193,7 @@ def fetch_sesami_opportunities(headless=True, date_mode='24h', custom_days=None,
                             hub_id = match.group(2)
                             # Construct GET link (assuming it works, otherwise just put the detail)
                             # Logic: JSP forms usually map params.
-                            link = f"https://sesami.online/bizopps/businessOpportunityView.jsp?documentID={doc_id}&hubID={hub_id}"
+                            link = portal_url('sesami', f"/bizopps/businessOpportunityView.jsp?documentID={doc_id}&hubID={hub_id}")
                         else:
                             link = href
                     except:
@@ -247,6 +254,7 @@ def fetch_sesami_opportunities(headless=True, date_mode='24h', custom_days=None,
         import traceback
         traceback.print_exc()
     finally:
+        pages.close()
         if driver:
             driver.quit()
             
@@ -9,6 +9,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 import json
 from util.driver_setup import get_chrome_driver
+from util.portals import portal_url
+from util.timing import span
 
 def log(msg):
     sys.stderr.write(f"{msg}\n")
@@ -19,7 +21,7 @@ def setup_driver(headless=True):
 
 class STLogsClient:
     def __init__(self):
-        self.base_url = "https://epro.stlogs.com/eProVportal/spLogin.do"
+        self.base_url = portal_url('stlogs', "/eProVportal/spLogin.do")
         self.driver = None
 
     def wait_for_loading(self, timeout=15):
@@ -52,15 +54,17 @@ class STLogsClient:
         """
         items = []
         # Run headless for speed as requested
-        self.driver = setup_driver(headless=True)
+        with span('stlogs.chrome_start'):
+            self.driver = setup_driver(headless=True)
         
         try:
             log(f"STLogs: Navigating to {self.base_url}")
-            self.driver.get(self.base_url)
-            
-            # Check for page load success
-            time.sleep(3) # Reduced to 3s as requested
-            self.wait_for_loading(15)
+            with span('stlogs.page', page=1):
+                self.driver.get(self.base_url)
+                
+                # Check for page load success
+                time.sleep(3) # Reduced to 3s as requested
+                self.wait_for_loading(15)
             
             # Shadow Root Check / Polymer Ready
             polymer_ready = False
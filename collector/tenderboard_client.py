@@ -7,13 +7,16 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from util.driver_setup import get_chrome_driver
+from util.portals import portal_url
+from util.snapshots import save_page
+from util.timing import laps, span
 
 def setup_driver(headless=True):
     return get_chrome_driver(headless)
 
 class TenderBoardClient:
     def __init__(self):
-        self.base_url = "https://www.tenderboard.biz/singaporetenders"
+        self.base_url = portal_url('tenderboard', "/singaporetenders")
         self.driver = None
 
     def fetch_opportunities(self, start_date=None, end_date=None):
@@ -22,7 +25,9 @@ class TenderBoardClient:
         Returns a list of dicts.
         """
         items = []
-        self.driver = setup_driver(headless=True)
+        with span('tenderboard.chrome_start'):
+            self.driver = setup_driver(headless=True)
+        pages = laps('tenderboard.page')
         
         try:
             print(f"TenderBoardClient: Navigating to {self.base_url}")
@@ -45,7 +50,9 @@ class TenderBoardClient:
             max_pages = 20 # Safety limit
             
             while page <= max_pages:
+                pages.next(page=page)
                 print(f"TenderBoardClient: Processing Page {page}")
+                save_page(self.driver, 'tenderboard', page)
                 
                 # Re-fetch elements on each iteration to avoid stale elements
                 links = self.driver.find_elements(By.CSS_SELECTOR, "a[class*='OpenDeals-viewLink']")
@@ -266,6 +273,7 @@ class TenderBoardClient:
         except Exception as e:
             print(f"TenderBoardClient: Fetch error: {e}")
         finally:
+            pages.close()
             if self.driver:
                 self.driver.quit()
         
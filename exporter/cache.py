@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+from exporter.formats import EXPORT_FORMATS, export_items, iter_records
+from util.log import get_logger
+from util.metrics import EXPORT_CACHE
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Content-addressed export cache
+# ---------------------------------------------------------------------------
+# Every export lives in output/exports/<digest>/, where the digest covers the
+# items, the metadata, the format and the file name. Exporting the same
+# results again returns the existing file; old entries are evicted by age
+# and then by total size (least recently used first).
+
+EXPORT_CACHE_DIR = Path(os.environ.get('OUTPUT_DIR', 'output')) / 'exports'
+EXPORT_CACHE_MAX_MB = float(os.environ.get('EXPORT_CACHE_MAX_MB', 500))
+EXPORT_CACHE_MAX_AGE_DAYS = float(os.environ.get('EXPORT_CACHE_MAX_AGE_DAYS', 7))
+
+
+def export_digest(items, fmt, metadata=None, name=''):
+    """SHA-256 of everything that ends up in an export"""
+    h = hashlib.sha256()
+    h.update(json.dumps([fmt, name, metadata or {}], sort_keys=True, default=str).encode('utf-8'))
+    for record in iter_records(items):
+        h.update(json.dumps(record, default=str).encode('utf-8'))
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+class ExportCache:
+    """Export artifacts keyed by export_digest(), with age/size eviction"""
+
+    def __init__(self, root=EXPORT_CACHE_DIR, max_bytes=EXPORT_CACHE_MAX_MB * 1024 * 1024,
+                 max_age=EXPORT_CACHE_MAX_AGE_DAYS * 86400):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def get(self, digest):
+        """Cached file for a digest (marked as recently used), or None"""
+        folder = self.root / digest
+        files = list(folder.iterdir()) if folder.is_dir() else []
+        if not files:
+            return None
+        os.utime(folder)
+        return files[0]
+
+    def put(self, digest, items, fmt, metadata=None, name='Tender Export'):
+        """Write the export into the cache (atomically) and evict old entries"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f".tmp-{uuid.uuid4().hex}"
+        path = export_items(items, tmp / name, fmt, metadata=metadata)
+        folder = self.root / digest
+        try:
+            os.rename(tmp, folder)
+        except OSError:
+            # Same export finished concurrently; keep the first one
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=digest)
+        return folder / path.name
+
+    def evict(self, keep=None):
+        """Drop entries older than max_age, then least recently used until under max_bytes"""
+        if not self.root.is_dir():
+            return
+        now = time.time()
+        entries = []
+        for folder in self.root.iterdir():
+            if not folder.is_dir() or folder.name.startswith('.tmp-'):
+                continue
+            mtime = folder.stat().st_mtime
+            size = sum(f.stat().st_size for f in folder.iterdir())
+            if folder.name != keep and now - mtime > self.max_age:
+                shutil.rmtree(folder, ignore_errors=True)
+                continue
+            entries.append((mtime, size, folder))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, folder in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if folder.name == keep:
+                continue
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            log.info("🧹 Export cache: evicted %d old exports (%.1f MB kept)", removed, total / 1024 / 1024)
+
+
+def cached_export(items, name, fmt='xlsx', metadata=None, cache=None):
+    """
+    Export through the cache.
+
+    Returns:
+        tuple: (digest, path, hit) - hit is True if an identical export already existed
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(EXPORT_FORMATS)})")
+    cache = cache or ExportCache()
+    digest = export_digest(items, fmt, metadata, name)
+    path = cache.get(digest)
+    if path is not None:
+        EXPORT_CACHE.inc(result='hit')
+        log.info("✓ Export cache hit: %s", path)
+        return digest, path, True
+    EXPORT_CACHE.inc(result='miss')
+    return digest, cache.put(digest, items, fmt, metadata=metadata, name=name), False
@@ -1,8 +1,12 @@
 
 import pandas as pd
 from pathlib import Path
+import xlsxwriter
 from openpyxl.utils import get_column_letter
 
+from processor.tender import PARSED_DATES, Tender, as_records
+from util.timing import timed
+
 # Updated column structure - Main Header and Sub Header moved to end
 COLUMNS = [
     'No.',
@@ -39,51 +43,174 @@ AWARDS_COLUMNS = [
     'Sourcing Doc No.'
 ]
 
-def adjust_column_widths(worksheet, dataframe):
+# Sheets longer than this fit their widths on a random sample of rows
+WIDTH_SAMPLE_ROWS = 50000
+
+def column_widths(dataframe, sample_rows=WIDTH_SAMPLE_ROWS):
     """
-    Auto-adjust column widths to fit content
+    Width per column that fits its content (header included)
+    
+    Args:
+        dataframe: DataFrame about to be written
+        sample_rows: measure at most this many rows (seeded sample); None = all rows
+    
+    Returns:
+        dict: column name -> width
     """
-    for idx, col in enumerate(dataframe.columns, 1):
-        column_letter = get_column_letter(idx)
-        
-        # Get max length of content in this column
-        max_length = 0
-        
-        # Check header length
-        max_length = max(max_length, len(str(col)))
-        
-        # Check all cell values in this column
-        for value in dataframe[col].astype(str):
-            max_length = max(max_length, len(value))
+    if sample_rows and len(dataframe) > sample_rows:
+        dataframe = dataframe.sample(n=sample_rows, random_state=0)
+    
+    widths = {}
+    for col in dataframe.columns:
+        # Longest value (as text) in this column, header included
+        lengths = text_lengths(dataframe[col])
+        max_length = max(len(str(col)), int(lengths.max()) if len(lengths) else 0)
         
         # Set width with extra padding to prevent premature wrapping
         # (max 100 to prevent extremely wide columns)
-        adjusted_width = min(max_length + 5, 100)
-        worksheet.column_dimensions[column_letter].width = adjusted_width
+        widths[col] = min(max_length + 5, 100)
+    return widths
+
+def text_lengths(values):
+    """len(str(value)) for every value, without stringifying whole columns"""
+    if values.dtype != object:
+        # Dates/numbers repeat a lot: stringify each distinct value once
+        return values.drop_duplicates().astype(str).str.len()
+    try:
+        lengths = values.str.len()
+    except AttributeError:
+        # No string values at all (e.g. numbers stored as objects)
+        return values.astype(str).str.len()
+    not_text = lengths.isna()
+    if not_text.any():
+        lengths[not_text] = values[not_text].astype(str).str.len()
+    return lengths
+
+def adjust_column_widths(worksheet, dataframe):
+    """
+    Auto-adjust column widths to fit content
+    """
+    for idx, (col, width) in enumerate(column_widths(dataframe).items(), 1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = width
+
+# Cell formats shared by every export sheet (XlsxWriter), keyed by name
+DATE_FORMAT = 'dd/mm/yyyy'
+CELL_FORMATS = {
+    'header': {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'},
+    'cell': {'border': 1, 'text_wrap': True, 'valign': 'top'},
+    'date': {'border': 1, 'text_wrap': True, 'valign': 'top', 'num_format': DATE_FORMAT},
+    'date_left': {'border': 1, 'text_wrap': True, 'align': 'left', 'valign': 'top', 'num_format': DATE_FORMAT},
+    'right': {'border': 1, 'text_wrap': True, 'align': 'right', 'valign': 'top'},
+    'link': {'border': 1, 'text_wrap': True, 'valign': 'top', 'font_color': '#0000FF', 'underline': 1},
+}
 
+def prepare_dates(df, items, date_cols):
+    """
+    Turn the date columns of a sheet into datetimes.
+
+    Tender records already carry their dates parsed (Asia/Singapore), so
+    those columns are taken from the *_dt fields as naive local datetimes;
+    other columns and plain dict items are parsed by pandas.
+    """
+    records = all(isinstance(item, Tender) for item in items)
+    for col in date_cols:
+        if col not in df.columns:
+            continue
+        attr = PARSED_DATES.get(col)
+        if records and attr is not None:
+            parsed = pd.to_datetime([getattr(item, attr) for item in items], utc=True, errors='coerce')
+            df[col] = parsed.tz_convert('Asia/Singapore').tz_localize(None)
+        else:
+            # Convert to datetime objects, handling errors
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+def open_workbook(path):
+    """
+    Streaming XlsxWriter workbook: rows are flushed to disk as they are
+    written (constant memory) and cells only reference the shared formats.
+    
+    Args:
+        path: file path, or a binary file object (e.g. BytesIO) to build the
+              workbook in memory without temp files
+    
+    Returns:
+        tuple: (workbook, {format name: Format})
+    """
+    in_memory = not isinstance(path, (str, Path))
+    wb = xlsxwriter.Workbook(path if in_memory else str(path), {
+        'constant_memory': not in_memory,
+        'in_memory': in_memory,
+        # Cell text is data, never formulas/links/numbers
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        'strings_to_numbers': False,
+    })
+    formats = {name: wb.add_format(props) for name, props in CELL_FORMATS.items()}
+    return wb, formats
+
+def write_sheet(wb, formats, title, df, column_formats=None, widths=None, auto_filter=True):
+    """
+    Stream a DataFrame into a new worksheet, row by row.
+    
+    Args:
+        wb, formats: from open_workbook()
+        title: sheet name
+        df: DataFrame to write (header row + one row per record)
+        column_formats: column name -> format name (default 'cell')
+        widths: column name -> width (default: column_widths(df))
+        auto_filter: add an auto filter over the written range
+    """
+    ws = wb.add_worksheet(title)
+    column_formats = column_formats or {}
+    
+    widths = widths or column_widths(df)
+    for idx, col in enumerate(df.columns):
+        if col in widths:
+            ws.set_column(idx, idx, widths[col])
+    if auto_filter and len(df.columns):
+        ws.autofilter(0, 0, len(df), len(df.columns) - 1)
+    
+    header = formats['header']
+    for idx, col in enumerate(df.columns):
+        ws.write_string(0, idx, str(col), header)
+    
+    cell_formats = [formats[column_formats.get(col, 'cell')] for col in df.columns]
+    link_idx = df.columns.get_loc('Link') if 'Link' in df.columns else -1
+    link = formats['link']
+    # NaN/NaT -> blank (but still bordered) cell
+    values = df.astype(object).where(df.notna(), None)
+    for row_idx, row in enumerate(values.itertuples(index=False, name=None), 1):
+        for idx, value in enumerate(row):
+            if idx == link_idx and isinstance(value, str) and value.startswith('http'):
+                # Negative return: URL too long / over Excel's link limit, keep as text
+                if ws.write_url(row_idx, idx, value, link) >= 0:
+                    continue
+            ws.write(row_idx, idx, value, cell_formats[idx])
+    return ws
+
+@timed('export_to_excel')
 def export_to_excel(items, path, metadata=None):
     """
     Export items to Excel with proper column structure and auto-width.
     Separates GeBIZ Awards into a different worksheet.
     Adds a Settings worksheet with run details.
+    
+    path may also be a binary file object (the workbook is then built in memory).
     """
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(path, (str, Path)):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
     
     # 1. Split items into Opportunities and Awards
     opportunities = []
     awards = []
     
-    for idx, item in enumerate(items, 1):
-        item['No.'] = idx # Temporary re-indexing, will re-do per sheet
+    for item in items:
         if item.get('_is_award'):
             awards.append(item)
         else:
             opportunities.append(item)
-            
-    # Re-index
-    for idx, item in enumerate(opportunities, 1): item['No.'] = idx
-    for idx, item in enumerate(awards, 1): item['No.'] = idx
     
     # 2. Prepare DataFrames
     # Create copies to avoid mutating original items during mapping?
@@ -115,23 +242,18 @@ def export_to_excel(items, path, metadata=None):
         processed_awards.append(pa)
 
     # 2. Prepare DataFrames
-    df_opps = pd.DataFrame(opportunities, columns=COLUMNS)
+    df_opps = pd.DataFrame(as_records(opportunities), columns=COLUMNS)
     df_awds = pd.DataFrame(processed_awards, columns=AWARDS_COLUMNS)
     
-    # Format Date Columns logic (Convert to Datetime, Don't stringify yet)
+    # Number the rows per sheet (the items are shared and never edited)
+    df_opps['No.'] = range(1, len(df_opps) + 1)
+    df_awds['No.'] = range(1, len(df_awds) + 1)
+    
     # Format Date Columns logic (Convert to Datetime, Don't stringify yet)
     # Include Awarded Date in date columns processing
     date_cols = ['Published Date', 'Closing Date', 'Date Detected', 'Awarded Date']
-    
-    def prepare_dates(df):
-        for col in date_cols:
-            if col in df.columns:
-                # Convert to datetime objects, handling errors
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-        return df
-
-    df_opps = prepare_dates(df_opps)
-    df_awds = prepare_dates(df_awds)
+    df_opps = prepare_dates(df_opps, opportunities, date_cols)
+    df_awds = prepare_dates(df_awds, awards, date_cols)
     
     # 3. Prepare Settings DataFrame
     settings_data = []
@@ -141,131 +263,49 @@ def export_to_excel(items, path, metadata=None):
     
     df_settings = pd.DataFrame(settings_data)
 
-    # Formatting Styles
-    from openpyxl.styles import Border, Side, Alignment, Font
-    thin_border = Border(left=Side(style='thin'), 
-                         right=Side(style='thin'), 
-                         top=Side(style='thin'), 
-                         bottom=Side(style='thin'))
-    wrap_align = Alignment(wrap_text=True, vertical='top')
-    
-    def apply_standard_style(ws, df):
-        # Apply style to all cells in data range
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-            for cell in row:
-                cell.border = thin_border
-                cell.alignment = wrap_align
-                
-        # Header Style
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.border = thin_border
-            
-    def make_links_clickable(ws, df):
-        if 'Link' not in df.columns: return
-        link_col_idx = df.columns.get_loc('Link') + 1
-        col_letter = get_column_letter(link_col_idx)
-        for cell in ws[col_letter]:
-            if cell.row > 1 and cell.value:
-                # Naive check if it looks like a URL
-                val = str(cell.value)
-                if val.startswith('http'):
-                    cell.hyperlink = val
-                    cell.font = Font(color="0000FF", underline="single")
-    
     print(f"Writing to {path}...")
     print(f"  Opportunities: {len(opportunities)}")
     print(f"  Awards: {len(awards)}")
     
-    with pd.ExcelWriter(path, engine='openpyxl', datetime_format='dd/mm/yyyy') as xw:
-        # Sheet 1: Opportunities
-        df_opps.to_excel(xw, index=False, sheet_name='Opportunities')
-        
-        # Sheet 2: GeBIZ Awards
-        if not df_awds.empty:
-            df_awds.to_excel(xw, index=False, sheet_name='GeBIZ Awards')
-            
-        # Sheet 3: Settings
-        if not df_settings.empty:
-            df_settings.to_excel(xw, index=False, sheet_name='Settings')
-        
-        # Formatting - Opportunities
-        ws_opps = xw.sheets['Opportunities']
-        ws_opps.auto_filter.ref = ws_opps.dimensions
-        
-        # Apply Styles
-        apply_standard_style(ws_opps, df_opps)
-        make_links_clickable(ws_opps, df_opps)
-        
-        # Apply strict Date Formatting & Alignment
-        left_align = Alignment(horizontal='left', vertical='top', wrap_text=True)
-        for col_idx, col_name in enumerate(df_opps.columns, 1):
-             if col_name in date_cols:
-                 col_letter = get_column_letter(col_idx)
-                 for cell in ws_opps[col_letter]:
-                     if cell.row > 1:
-                         cell.number_format = 'dd/mm/yyyy'
-                         cell.alignment = left_align
-        
-        # Auto-adjust column widths (Max 100 chars, including headers)
-        adjust_column_widths(ws_opps, df_opps)
-        
-        # Formatting - Awards
-        if not df_awds.empty:
-             ws_awds = xw.sheets['GeBIZ Awards']
-             ws_awds.auto_filter.ref = ws_awds.dimensions
-             apply_standard_style(ws_awds, df_awds)
-             make_links_clickable(ws_awds, df_awds)
-             
-             # Date Format
-             for col_idx, col_name in enumerate(df_awds.columns, 1):
-                 if col_name in date_cols:
-                     col_letter = get_column_letter(col_idx)
-                     for cell in ws_awds[col_letter]:
-                         if cell.row > 1:
-                             cell.number_format = 'dd/mm/yyyy'
-             
-             # Auto-width
-             adjust_column_widths(ws_awds, df_awds)
-             
-             # Right Align 'Award Value' and 'Closing Time'
-             right_align_cols = ['Award Value', 'Closing Time']
-             right_align = Alignment(horizontal='right', vertical='top', wrap_text=True)
-             
-             for col_name in right_align_cols:
-                 if col_name in df_awds.columns:
-                     col_idx = df_awds.columns.get_loc(col_name) + 1
-                     col_letter = get_column_letter(col_idx)
-                     for cell in ws_awds[col_letter]:
-                         if cell.row > 1:
-                             cell.alignment = right_align
-        
-        # Formatting - Settings
-        if not df_settings.empty:
-             ws_set = xw.sheets['Settings']
-             apply_standard_style(ws_set, df_settings)
-             ws_set.column_dimensions['A'].width = 25
-             ws_set.column_dimensions['B'].width = 80 # Wide for feeds list
+    wb, formats = open_workbook(path)
+    
+    # Sheet 1: Opportunities (dates left aligned)
+    opp_formats = {col: 'date_left' for col in date_cols}
+    write_sheet(wb, formats, 'Opportunities', df_opps, opp_formats)
     
+    # Sheet 2: GeBIZ Awards (right align 'Award Value' and 'Closing Time')
+    if not df_awds.empty:
+        awd_formats = {col: 'date' for col in date_cols}
+        awd_formats.update({'Award Value': 'right', 'Closing Time': 'right'})
+        write_sheet(wb, formats, 'GeBIZ Awards', df_awds, awd_formats)
+    
+    # Sheet 3: Settings (wide value column for the feeds list)
+    if not df_settings.empty:
+        write_sheet(wb, formats, 'Settings', df_settings, widths={'Setting': 25, 'Value': 80}, auto_filter=False)
+    
+    wb.close()
     print(f"✓ Export complete.")
 
-def append_to_tender_comb(items, tender_comb_path):
-    """Append items to existing Tender Comb workbook"""
+def append_to_tender_comb(items, tender_comb_path, incremental=False):
+    """
+    Append items to existing Tender Comb workbook
+    
+    incremental=True only adds tenders not already in the workbook (see
+    exporter.tender_comb) and leaves the other sheets untouched.
+    """
     if not Path(tender_comb_path).exists():
         print(f"Warning: Tender Comb file not found at {tender_comb_path}")
         return
+    if incremental:
+        from exporter.tender_comb import append_incremental
+        return append_incremental(items, tender_comb_path)
     
-    # Reindex items with row numbers
-    for idx, item in enumerate(items, 1):
-        item['No.'] = idx
-    
-    df = pd.DataFrame(items, columns=COLUMNS)
+    df = pd.DataFrame(as_records(items), columns=COLUMNS)
+    df['No.'] = range(1, len(df) + 1)
     
     # Convert dates to datetime objects
     date_cols = ['Published Date', 'Closing Date', 'Date Detected']
-    for col in date_cols:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
+    df = prepare_dates(df, items, date_cols)
     
     try:
         # Generate sheet name from date
@@ -0,0 +1,210 @@
+import io
+import json
+from pathlib import Path
+
+from processor.tender import COLUMN_FIELDS, Tender
+from util.log import get_logger
+from util.timing import span
+
+log = get_logger(__name__)
+
+# pandas and the Excel writer (openpyxl, XlsxWriter) are imported by the
+# writers on first use, so importing this module (EXPORT_FORMATS, the
+# download routes) stays cheap.
+
+# Machine-readable exports: one flat table (opportunities and awards together,
+# '_is_award' tells them apart) with every normalized column plus the parsed
+# dates, written in chunks so memory stays flat for months of tenders.
+DATA_COLUMNS = list(COLUMN_FIELDS) + ['published_dt', 'closing_dt', 'awarded_dt']
+DATE_COLUMNS = ['published_dt', 'closing_dt', 'awarded_dt']
+CHUNK_ROWS = 10000
+
+
+def iter_records(items):
+    """Items -> dicts with DATA_COLUMNS keys (Tender dates included)"""
+    for item in items:
+        if isinstance(item, Tender):
+            record = item.to_dict()
+            record['published_dt'] = item.published_dt
+            record['closing_dt'] = item.closing_dt
+            record['awarded_dt'] = item.awarded_dt
+        else:
+            record = {col: item.get(col) for col in DATA_COLUMNS}
+        yield record
+
+
+def iter_chunks(items, size=CHUNK_ROWS):
+    """DataFrames of at most `size` records (DATA_COLUMNS, typed date columns)"""
+    chunk = []
+    for record in iter_records(items):
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield _frame(chunk)
+            chunk = []
+    if chunk:
+        yield _frame(chunk)
+
+
+def _frame(records):
+    import pandas as pd
+
+    df = pd.DataFrame(records, columns=DATA_COLUMNS)
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors='coerce', utc=True).dt.tz_convert('Asia/Singapore')
+    return df
+
+
+def iter_csv(items):
+    """CSV text: the header, then one block per CHUNK_ROWS records"""
+    import pandas as pd
+
+    yield pd.DataFrame(columns=DATA_COLUMNS).to_csv(index=False)
+    for df in iter_chunks(items):
+        yield df.to_csv(index=False, header=False)
+
+
+def iter_ndjson(items, lines=1000):
+    """NDJSON text, `lines` records per block (dates as ISO 8601)"""
+    block = []
+    for record in iter_records(items):
+        for col in DATE_COLUMNS:
+            if record[col] is not None:
+                record[col] = record[col].isoformat()
+        block.append(json.dumps(record, ensure_ascii=False, default=str))
+        if len(block) >= lines:
+            yield '\n'.join(block) + '\n'
+            block = []
+    if block:
+        yield '\n'.join(block) + '\n'
+
+
+def export_csv(items, path, metadata=None):
+    """
+    Stream items to a UTF-8 CSV file (header once, then CHUNK_ROWS at a time).
+    Metadata is not written (plain CSV has no place for it).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for text in iter_csv(items):
+            f.write(text)
+    log.info("✓ CSV export complete: %d rows -> %s", len(items), path)
+
+
+def export_ndjson(items, path, metadata=None):
+    """
+    Stream items as newline-delimited JSON, one object per line (dates as ISO 8601).
+    Metadata is not written (every line is a record).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for text in iter_ndjson(items):
+            f.write(text)
+    log.info("✓ NDJSON export complete: %d rows -> %s", len(items), path)
+
+
+def export_parquet(items, path, metadata=None):
+    """
+    Write items to a Parquet file (zstd compressed), one row group per chunk.
+    Run metadata is stored in the file's key/value metadata under 'tender_export'.
+
+    path may also be a binary file object. Requires pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if isinstance(path, (str, Path)):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+    types = {'No.': pa.int64(), '_is_award': pa.bool_()}
+    types.update({col: pa.timestamp('ns', tz='Asia/Singapore') for col in DATE_COLUMNS})
+    schema = pa.schema([(col, types.get(col, pa.string())) for col in DATA_COLUMNS])
+    text_columns = [col for col in DATA_COLUMNS if col not in types]
+    if metadata:
+        extra = {b'tender_export': json.dumps({k: str(v) for k, v in metadata.items()}).encode('utf-8')}
+        schema = schema.with_metadata({**(schema.metadata or {}), **extra})
+
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for df in iter_chunks(items):
+            # Same schema for every chunk: text columns hold str or null only
+            for col in text_columns:
+                values = df[col]
+                df[col] = values.astype(str).where(values.notna(), None)
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+            rows += len(df)
+    log.info("✓ Parquet export complete: %d rows", rows)
+
+
+def export_xlsx(items, path, metadata=None):
+    """Excel export (exporter/excel.py, loaded on first use)"""
+    from exporter.excel import export_to_excel
+    return export_to_excel(items, path, metadata=metadata)
+
+
+# Format name -> (file extension, writer(items, path, metadata=None))
+EXPORT_FORMATS = {
+    'xlsx': ('.xlsx', export_xlsx),
+    'parquet': ('.parquet', export_parquet),
+    'csv': ('.csv', export_csv),
+    'ndjson': ('.ndjson', export_ndjson),
+}
+
+
+def export_items(items, path, fmt='xlsx', metadata=None):
+    """
+    Export items in one of EXPORT_FORMATS (the /export route and scheduled jobs).
+
+    Args:
+        items: normalized items (Tender objects or dicts)
+        path: output file; the format's extension is added if missing
+        fmt: 'xlsx', 'parquet', 'csv' or 'ndjson'
+        metadata: run details (Settings sheet / Parquet metadata)
+
+    Returns:
+        Path: the written file
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(EXPORT_FORMATS)})")
+    ext, writer = EXPORT_FORMATS[fmt]
+    path = Path(path)
+    if path.suffix != ext:
+        path = path.with_name(path.name + ext)
+    with span(f'export.{fmt}', items=len(items)):
+        writer(items, path, metadata=metadata)
+    return path
+
+
+# Format name -> download mimetype
+EXPORT_MIMETYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def stream_export(items, fmt='xlsx', metadata=None, chunk_bytes=STREAM_CHUNK_BYTES):
+    """
+    Generate an export as byte chunks for a streamed HTTP response (no file on disk).
+
+    CSV and NDJSON are produced as the records are serialized, so the first
+    bytes go out right away. xlsx and Parquet need their whole layout before
+    the closing zip directory / footer, so they are built in memory first
+    and then sent in chunk_bytes pieces.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(EXPORT_FORMATS)})")
+    if fmt in ('csv', 'ndjson'):
+        texts = iter_csv(items) if fmt == 'csv' else iter_ndjson(items)
+        for text in texts:
+            yield text.encode('utf-8')
+        return
+
+    buffer = io.BytesIO()
+    EXPORT_FORMATS[fmt][1](items, buffer, metadata=metadata)
+    data = buffer.getbuffer()
+    for start in range(0, len(data), chunk_bytes):
+        yield bytes(data[start:start + chunk_bytes])
@@ -0,0 +1,509 @@
+import io
+import json
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+from processor.tender import as_records
+from exporter.excel import COLUMNS, column_widths, prepare_dates
+
+# ---------------------------------------------------------------------------
+# Incremental append to a master Tender Comb workbook
+# ---------------------------------------------------------------------------
+# The keys of every tender already in the workbook live in a sidecar file
+# (<workbook>.keys.json), so deciding what is new never opens the workbook.
+# New rows are added by editing the xlsx package directly: only the target
+# sheet, styles.xml, the small workbook part lists and docProps/app.xml are
+# rewritten, every other sheet is copied across as-is without being parsed.
+
+DATE_COLUMNS = ['Published Date', 'Closing Date', 'Date Detected']
+DATE_FORMAT = 'dd/mm/yyyy'
+EXCEL_EPOCH = datetime(1899, 12, 30)
+WORKSHEET_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+OFFICE_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CONTENT_TYPES_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+APP_PROPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties'
+VT_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes'
+WORKSHEET_REL = f'{OFFICE_REL_NS}/worksheet'
+SHEET_NS = ('xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+ILLEGAL_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _text(value):
+    if value is None or value != value:  # None / NaN
+        return ''
+    return str(value).strip()
+
+
+def tender_key(record):
+    """Identity of a tender row: ITQ/ITT, else Link, else entity + description"""
+    ref = _text(record.get('ITQ/ITT'))
+    if ref:
+        return f"ref:{ref.upper()}"
+    link = _text(record.get('Link'))
+    if link:
+        return f"link:{link}"
+    return f"desc:{_text(record.get('Calling Entity')).lower()}|{_text(record.get('Description')).lower()}"
+
+
+def sheet_name_for(df):
+    """Daily sheet name (GeBIZ_dd_mm_yyyy from Date Detected, else today)"""
+    sheet_name = f"GeBIZ_{pd.to_datetime('today').strftime('%Y_%m_%d')}"
+    if 'Date Detected' in df and not df.empty:
+        try:
+            sheet_name = f"GeBIZ_{df['Date Detected'].iloc[0].strftime('%d_%m_%Y')}"
+        except Exception:
+            pass
+    return sheet_name
+
+
+class KeyIndex:
+    """
+    Tender keys already in a workbook, stored in <workbook>.keys.json.
+
+    The sidecar records the workbook's size/mtime; if the workbook was changed
+    by something else (e.g. edited in Excel) the keys are rebuilt once by
+    streaming the workbook read-only.
+    """
+    def __init__(self, path, keys=None):
+        self.path = Path(path)
+        self.keys = set(keys or ())
+
+    @staticmethod
+    def sidecar(path):
+        path = Path(path)
+        return path.with_name(path.name + '.keys.json')
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    @classmethod
+    def load(cls, path):
+        sidecar = cls.sidecar(path)
+        if sidecar.exists():
+            try:
+                data = json.loads(sidecar.read_text(encoding='utf-8'))
+                if data.get('workbook') == cls._stamp(path):
+                    return cls(path, data.get('keys', []))
+                print(f"⚠ {sidecar.name} is out of date, rebuilding key index")
+            except (OSError, ValueError) as e:
+                print(f"⚠ Could not read {sidecar.name}: {e}")
+        return cls.rebuild(path)
+
+    @classmethod
+    def rebuild(cls, path):
+        """Scan every sheet (read-only, streamed) for tender keys"""
+        keys = set()
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                rows = ws.iter_rows(values_only=True)
+                header = next(rows, None)
+                if not header:
+                    continue
+                columns = {name: idx for idx, name in enumerate(header)
+                           if name in ('ITQ/ITT', 'Link', 'Calling Entity', 'Description')}
+                if not columns:
+                    continue
+                for row in rows:
+                    record = {name: row[idx] for name, idx in columns.items() if idx < len(row)}
+                    if any(_text(v) for v in record.values()):
+                        keys.add(tender_key(record))
+        finally:
+            wb.close()
+        index = cls(path, keys)
+        index.save()
+        print(f"✓ Indexed {len(keys)} tender keys in {Path(path).name}")
+        return index
+
+    def save(self):
+        data = {'workbook': self._stamp(self.path), 'keys': sorted(self.keys)}
+        self.sidecar(self.path).write_text(json.dumps(data), encoding='utf-8')
+
+
+def append_incremental(items, tender_comb_path, sheet_name=None):
+    """
+    Append only the tenders not yet in the workbook.
+
+    Rows go to the daily sheet (created if missing, extended if it already
+    exists); untouched sheets are never loaded.
+
+    Returns:
+        int: number of rows appended
+    """
+    path = Path(tender_comb_path)
+    index = KeyIndex.load(path)
+
+    new_items, records = [], []
+    new_keys = set()
+    for item, record in zip(items, as_records(items)):
+        key = tender_key(record)
+        if key in index.keys or key in new_keys:
+            continue
+        new_keys.add(key)
+        new_items.append(item)
+        records.append(record)
+    if not records:
+        print(f"✓ Tender Comb already has all {len(items)} items ({path.name})")
+        return 0
+
+    df = prepare_dates(pd.DataFrame(records, columns=COLUMNS), new_items, DATE_COLUMNS)
+    sheet_name = sheet_name or sheet_name_for(df)
+
+    _append_rows(path, sheet_name, df)
+    index.keys |= new_keys
+    index.save()
+    print(f"✓ Appended {len(records)} new items to {path} (sheet: {sheet_name}, "
+          f"{len(items) - len(records)} already present)")
+    return len(records)
+
+
+# ---------------------------------------------------------------------------
+# xlsx package editing
+# ---------------------------------------------------------------------------
+# Parts are read with ElementTree (namespace-aware, whatever prefixes the
+# writer used: Excel, openpyxl and the Open XML SDK differ) but changed by
+# splicing text into the original, so namespace declarations, mc:Ignorable
+# lists and everything we don't touch stay byte for byte as written.
+
+class _Part:
+    """One XML part of the package, with the prefix it binds to its main namespace"""
+
+    def __init__(self, data, namespace):
+        self.text = data.decode('utf-8') if isinstance(data, bytes) else data
+        self.ns = namespace
+        self.namespaces = _declared_namespaces(self.text)
+        if namespace not in self.namespaces:
+            raise ValueError(f"unexpected XML part (no {namespace} namespace on the root element)")
+        self.prefix = self.namespaces[namespace]
+
+    def root(self):
+        return ET.fromstring(self.text.encode('utf-8'))
+
+    def q(self, local, namespace=None):
+        """Tag/attribute name as written in this part"""
+        prefix = self.prefix if namespace is None else self.namespaces.get(namespace)
+        return f"{prefix}:{local}" if prefix else local
+
+    def find(self, path):
+        """ElementTree find with 'm:' bound to the part's namespace"""
+        return self.root().find(path, {'m': self.ns})
+
+    def _open_tag(self, local, start=0):
+        m = re.compile(rf'<{re.escape(self.q(local))}(?=[\s/>])[^>]*?(/?)>').search(self.text, start)
+        if m is None:
+            raise ValueError(f"no <{self.q(local)}> element")
+        return m
+
+    def append_child(self, local, markup):
+        """Insert markup as the last child of the first <local> element (expanding <local/>)"""
+        m = self._open_tag(local)
+        if m.group(1):
+            tag = m.group(0)[:-2].rstrip() + '>'
+            self.text = f"{self.text[:m.start()]}{tag}{markup}</{self.q(local)}>{self.text[m.end():]}"
+        else:
+            end = self.text.index(f"</{self.q(local)}>", m.end())
+            self.text = self.text[:end] + markup + self.text[end:]
+
+    def insert_first(self, parent, markup):
+        """Insert markup right after the opening tag of the first <parent> element"""
+        m = self._open_tag(parent)
+        if m.group(1):
+            raise ValueError(f"<{self.q(parent)}> is empty")
+        self.text = self.text[:m.end()] + markup + self.text[m.end():]
+
+    def set_attr(self, local, name, value):
+        """Set an attribute on the first <local> element (added if missing)"""
+        m = self._open_tag(local)
+        tag = m.group(0)
+        attr = re.compile(rf'(\s{re.escape(name)}\s*=\s*)(["\']).*?\2')
+        if attr.search(tag):
+            tag = attr.sub(lambda a: f'{a.group(1)}"{value}"', tag, count=1)
+        else:
+            close = len(tag) - (2 if m.group(1) else 1)
+            tag = f'{tag[:close].rstrip()} {name}="{value}"{tag[close:]}'
+        self.text = self.text[:m.start()] + tag + self.text[m.end():]
+
+
+def _declared_namespaces(text):
+    """{namespace: prefix} declared on the root element ('' for the default namespace)"""
+    found = {}
+    for event, value in ET.iterparse(io.BytesIO(text.encode('utf-8')), events=('start-ns', 'start')):
+        if event == 'start':
+            break
+        prefix, uri = value
+        found.setdefault(uri, prefix)
+    return found
+
+
+def _append_rows(path, sheet_name, df):
+    with zipfile.ZipFile(path) as zin:
+        names = set(zin.namelist())
+        workbook = _Part(zin.read('xl/workbook.xml'), MAIN_NS)
+        rels = _Part(zin.read('xl/_rels/workbook.xml.rels'), PACKAGE_REL_NS)
+        styles = _Part(zin.read('xl/styles.xml'), MAIN_NS)
+
+        date_xf = _ensure_date_style(styles)
+        changed = {}
+
+        sheet_path = _find_sheet(workbook, rels, sheet_name)
+        if sheet_path:
+            sheet = zin.read(sheet_path).decode('utf-8')
+            changed[sheet_path] = _extend_sheet(sheet, df, date_xf)
+        else:
+            header_xf = _ensure_header_style(styles)
+            sheet_path = _free_sheet_path(names)
+            content_types = _Part(zin.read('[Content_Types].xml'), CONTENT_TYPES_NS)
+            _register_sheet(workbook, rels, content_types, sheet_name, sheet_path)
+            changed.update({
+                sheet_path: _new_sheet(df, header_xf, date_xf),
+                'xl/workbook.xml': workbook.text,
+                'xl/_rels/workbook.xml.rels': rels.text,
+                '[Content_Types].xml': content_types.text,
+            })
+            if 'docProps/app.xml' in names:
+                changed['docProps/app.xml'] = _add_sheet_title(zin.read('docProps/app.xml'), sheet_name)
+        changed['xl/styles.xml'] = styles.text
+
+        tmp = path.with_name(path.name + '.tmp')
+        with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                if info.filename in changed:
+                    zout.writestr(info.filename, changed.pop(info.filename))
+                else:
+                    zout.writestr(info, zin.read(info.filename))
+            for name, data in changed.items():
+                zout.writestr(name, data)
+    os.replace(tmp, path)
+
+
+def _attr(value):
+    return escape(value, {'"': '&quot;'})
+
+
+def _find_sheet(workbook, rels, sheet_name):
+    """Package path of the sheet called sheet_name, or None"""
+    for sheet in workbook.root().iterfind('m:sheets/m:sheet', {'m': MAIN_NS}):
+        if sheet.get('name') != sheet_name:
+            continue
+        rel_id = sheet.get(f'{{{OFFICE_REL_NS}}}id')
+        for rel in rels.root().iterfind('r:Relationship', {'r': PACKAGE_REL_NS}):
+            if rel.get('Id') == rel_id:
+                target = rel.get('Target')
+                return target.lstrip('/') if target.startswith('/') else posixpath.normpath(f"xl/{target}")
+    return None
+
+
+def _free_sheet_path(names):
+    n = 1
+    while f"xl/worksheets/sheet{n}.xml" in names:
+        n += 1
+    return f"xl/worksheets/sheet{n}.xml"
+
+
+def _register_sheet(workbook, rels, content_types, sheet_name, sheet_path):
+    ns = {'m': MAIN_NS, 'r': PACKAGE_REL_NS}
+    sheet_ids = [int(s.get('sheetId')) for s in workbook.root().iterfind('m:sheets/m:sheet', ns)]
+    rel_ids = {r.get('Id') for r in rels.root().iterfind('r:Relationship', ns)}
+    n = 1
+    while f"rIdTC{n}" in rel_ids:
+        n += 1
+    rel_id = f"rIdTC{n}"
+
+    if OFFICE_REL_NS in workbook.namespaces:
+        id_attr = f'{workbook.q("id", OFFICE_REL_NS)}="{rel_id}"'
+    else:
+        id_attr = f'xmlns:r="{OFFICE_REL_NS}" r:id="{rel_id}"'
+    workbook.append_child('sheets', f'<{workbook.q("sheet")} name="{_attr(sheet_name)}" '
+                                    f'sheetId="{max(sheet_ids, default=0) + 1}" {id_attr}/>')
+    rels.append_child('Relationships', f'<{rels.q("Relationship")} Id="{rel_id}" Type="{WORKSHEET_REL}" '
+                                       f'Target="/{sheet_path}"/>')
+    content_types.append_child('Types', f'<{content_types.q("Override")} PartName="/{sheet_path}" '
+                                        f'ContentType="{WORKSHEET_TYPE}"/>')
+
+
+def _add_sheet_title(data, sheet_name):
+    """
+    docProps/app.xml with the new sheet counted and listed (Excel shows these
+    as the file's properties). Left as it is when it has no sheet list.
+    """
+    try:
+        app = _Part(data, APP_PROPS_NS)
+    except ValueError:
+        return data
+    ns = {'p': APP_PROPS_NS, 'vt': VT_NS}
+    root = app.root()
+    pairs = root.find('p:HeadingPairs/vt:vector', ns)
+    titles = root.find('p:TitlesOfParts/vt:vector', ns)
+    if pairs is None or titles is None or VT_NS not in app.namespaces:
+        return data
+    # HeadingPairs: (name, count) variants, worksheets first in files Excel wrote
+    headings = [(v0.findtext('vt:lpstr', '', ns), int(v1.findtext('vt:i4', '0', ns)))
+                for v0, v1 in zip(pairs[0::2], pairs[1::2])]
+    names = [name for name, _ in headings]
+    if not headings:
+        return data
+    pair = names.index('Worksheets') if 'Worksheets' in names else 0
+    position = sum(count for _, count in headings[:pair + 1])
+
+    i4, lpstr = app.q('i4', VT_NS), app.q('lpstr', VT_NS)
+    heading_start = app._open_tag('HeadingPairs').end()
+    counts = list(re.finditer(rf'<{re.escape(i4)}>(\d+)</{re.escape(i4)}>', app.text[heading_start:]))
+    m = counts[pair]
+    start, end = heading_start + m.start(1), heading_start + m.end(1)
+    app.text = app.text[:start] + str(headings[pair][1] + 1) + app.text[end:]
+
+    titles_start = app._open_tag('TitlesOfParts').end()
+    vector = re.compile(rf'<{re.escape(app.q("vector", VT_NS))}\b[^>]*>').search(app.text, titles_start)
+    insert_at = vector.end()
+    closing = f'</{lpstr}>'
+    for _ in range(position):
+        insert_at = app.text.index(closing, insert_at) + len(closing)
+    app.text = app.text[:insert_at] + f'<{lpstr}>{escape(sheet_name)}</{lpstr}>' + app.text[insert_at:]
+    size = re.compile(r'(\ssize\s*=\s*)(["\'])\d+\2')
+    app.text = (app.text[:vector.start()] + size.sub(lambda s: f'{s.group(1)}"{len(titles) + 1}"', vector.group(0), 1)
+                + app.text[vector.end():])
+    return app.text
+
+
+def _list_index(styles, list_tag, matches, markup):
+    """Index of the first child of <list_tag> for which matches(child) is true, else append markup"""
+    container = styles.find(f'm:{list_tag}')
+    if container is None:
+        raise ValueError(f"styles.xml has no <{list_tag}> list")
+    for index, child in enumerate(container):
+        if matches(child):
+            return index
+    styles.append_child(list_tag, markup)
+    styles.set_attr(list_tag, 'count', len(container) + 1)
+    return len(container)
+
+
+def _plain_xf(num_fmt_id, font_id, flag):
+    """Matcher for a cellXfs entry with only a number format / font set"""
+    def matches(xf):
+        return (len(xf) == 0 and xf.get('numFmtId') == str(num_fmt_id) and xf.get('fontId') == str(font_id)
+                and xf.get('fillId', '0') == '0' and xf.get('borderId', '0') == '0'
+                and xf.get(flag) in ('1', 'true'))
+    return matches
+
+
+def _ensure_date_style(styles):
+    """cellXfs index of a dd/mm/yyyy date style (added to styles.xml if missing)"""
+    ns = {'m': MAIN_NS}
+    root = styles.root()
+    fmt_id = next((int(f.get('numFmtId')) for f in root.iterfind('m:numFmts/m:numFmt', ns)
+                   if f.get('formatCode') == DATE_FORMAT), None)
+    if fmt_id is None:
+        # dxfs carry numFmts of their own: stay clear of those ids too
+        fmt_id = max([int(f.get('numFmtId')) for f in root.iterfind('.//m:numFmt', ns)] + [163]) + 1
+        if root.find('m:numFmts', ns) is None:
+            styles.insert_first('styleSheet', f'<{styles.q("numFmts")} count="0"/>')   # always the first child
+        _list_index(styles, 'numFmts', lambda f: False,
+                    f'<{styles.q("numFmt")} numFmtId="{fmt_id}" formatCode="{DATE_FORMAT}"/>')
+    return _list_index(styles, 'cellXfs', _plain_xf(fmt_id, 0, 'applyNumberFormat'),
+                       f'<{styles.q("xf")} numFmtId="{fmt_id}" fontId="0" fillId="0" borderId="0" xfId="0" '
+                       f'applyNumberFormat="1"/>')
+
+
+def _ensure_header_style(styles):
+    """cellXfs index of a bold header style"""
+    ns = {'m': MAIN_NS}
+
+    def bold_calibri(font):
+        return (font.find('m:b', ns) is not None and font.find('m:i', ns) is None
+                and font.find('m:sz', ns) is not None and font.find('m:sz', ns).get('val') == '11'
+                and font.find('m:name', ns) is not None and font.find('m:name', ns).get('val') == 'Calibri')
+
+    q = styles.q
+    font_id = _list_index(styles, 'fonts', bold_calibri,
+                          f'<{q("font")}><{q("b")}/><{q("sz")} val="11"/><{q("name")} val="Calibri"/></{q("font")}>')
+    return _list_index(styles, 'cellXfs', _plain_xf(0, font_id, 'applyFont'),
+                       f'<{q("xf")} numFmtId="0" fontId="{font_id}" fillId="0" borderId="0" xfId="0" applyFont="1"/>')
+
+
+def _cell(ref, value, date_xf, q):
+    if value is None or value is pd.NaT or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, datetime):
+        serial = (value - EXCEL_EPOCH).total_seconds() / 86400
+        return f'<{q("c")} r="{ref}" s="{date_xf}"><{q("v")}>{serial!r}</{q("v")}></{q("c")}>'
+    if isinstance(value, bool):
+        return f'<{q("c")} r="{ref}" t="b"><{q("v")}>{int(value)}</{q("v")}></{q("c")}>'
+    if isinstance(value, (int, float)):
+        return f'<{q("c")} r="{ref}"><{q("v")}>{value}</{q("v")}></{q("c")}>'
+    text = escape(ILLEGAL_XML.sub('', str(value)))
+    return (f'<{q("c")} r="{ref}" t="inlineStr"><{q("is")}><{q("t")} xml:space="preserve">{text}</{q("t")}>'
+            f'</{q("is")}></{q("c")}>')
+
+
+def _rows_xml(df, first_row, first_no, date_xf, q):
+    letters = [get_column_letter(i) for i in range(1, len(df.columns) + 1)]
+    df = df.copy()
+    df['No.'] = range(first_no, first_no + len(df))
+    values = df.astype(object).where(df.notna(), None)
+    rows = []
+    for offset, row in enumerate(values.itertuples(index=False, name=None)):
+        r = first_row + offset
+        cells = ''.join(_cell(f"{letters[i]}{r}", v, date_xf, q) for i, v in enumerate(row))
+        rows.append(f'<{q("row")} r="{r}">{cells}</{q("row")}>')
+    return ''.join(rows)
+
+
+def _new_sheet(df, header_xf, date_xf):
+    last_col = get_column_letter(len(df.columns))
+    widths = column_widths(df)
+    cols = ''.join(f'<col min="{i}" max="{i}" width="{widths[c]}" customWidth="1"/>'
+                   for i, c in enumerate(df.columns, 1))
+    header = ''.join(f'<c r="{get_column_letter(i)}1" s="{header_xf}" t="inlineStr"><is><t>{escape(str(c))}</t></is></c>'
+                     for i, c in enumerate(df.columns, 1))
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet {SHEET_NS}><dimension ref="A1:{last_col}{len(df) + 1}"/>'
+            f'<cols>{cols}</cols><sheetData><row r="1">{header}</row>'
+            f'{_rows_xml(df, 2, 1, date_xf, lambda local: local)}</sheetData></worksheet>')
+
+
+def _extend_sheet(sheet, df, date_xf):
+    """Add df's rows after the last row of an existing sheet"""
+    prefix = _declared_namespaces(sheet).get(MAIN_NS)
+    if prefix is None:
+        raise ValueError("unexpected worksheet part (no SpreadsheetML namespace on the root element)")
+
+    def q(local):
+        return f"{prefix}:{local}" if prefix else local
+
+    last_row = 1
+    start = sheet.rfind(f'<{q("row")} ')
+    if start != -1:
+        last_row = int(re.match(rf'<{re.escape(q("row"))}\b[^>]*\br="(\d+)"', sheet[start:]).group(1))
+    rows = _rows_xml(df, last_row + 1, last_row, date_xf, q)
+
+    empty = re.search(rf'<{re.escape(q("sheetData"))}\s*/>', sheet)
+    if empty:
+        sheet = f'{sheet[:empty.start()]}<{q("sheetData")}>{rows}</{q("sheetData")}>{sheet[empty.end():]}'
+    else:
+        end = sheet.rindex(f'</{q("sheetData")}>')
+        sheet = sheet[:end] + rows + sheet[end:]
+
+    new_last = last_row + len(df)
+    last_col = get_column_letter(len(df.columns))
+    m = re.search(rf'<{re.escape(q("dimension"))} ref="[A-Z]+\d+(?::([A-Z]+)\d+)?"\s*/>', sheet)
+    if m:
+        if m.group(1) and column_index_from_string(m.group(1)) > len(df.columns):
+            last_col = m.group(1)
+        sheet = sheet[:m.start()] + f'<{q("dimension")} ref="A1:{last_col}{new_last}"/>' + sheet[m.end():]
+    return sheet
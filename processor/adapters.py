@@ -0,0 +1,231 @@
+import pandas as pd
+from datetime import datetime
+
+from util.dates import parse_dates_bulk, format_dates
+from util.feed_catalogue import catalogue
+
+# ---------------------------------------------------------------------------
+# Source adapters
+# ---------------------------------------------------------------------------
+# Each portal's raw item layout is handled by one adapter object. normalize_items
+# groups the batch by 'source' and hands every adapter only its own rows, so a
+# portal costs a single dict lookup instead of a walk down an if/elif chain.
+#
+# Adding a portal:
+#
+#     @register_adapter('my_portal')
+#     class MyPortalAdapter(SourceAdapter):
+#         main_header = 'My Portal Opportunities'
+#
+#         def apply(self, rows, present, fields):
+#             fields['tender_number'] = rows['ref_no']
+
+# Columns every adapter returns (one row per raw item)
+ADAPTER_FIELDS = [
+    'main_header', 'sub_header', 'tender_number', 'calling_entity',
+    'sourcing_doc', 'close_date', 'close_time', 'closing_override',
+    'published', 'published_iso', 'is_award', 'keep',
+]
+
+ADAPTERS = {}
+PREFIX_ADAPTERS = []
+
+
+def value_or(rows, present, col, default):
+    """Column equivalent of item.get(col, default): default only when the key is missing"""
+    return rows[col].where(present[col], default)
+
+
+class SourceAdapter:
+    """
+    Base adapter: maps a batch of raw rows from one source onto ADAPTER_FIELDS.
+
+    Subclasses set main_header and override apply() (and raw_published() if
+    the portal has no usable publish date).
+    """
+    main_header = ''
+    default_category = 'General'
+
+    def normalize(self, rows, present):
+        """
+        Args:
+            rows: DataFrame slice holding only this source's items
+            present: boolean DataFrame (same shape) telling which keys were set
+
+        Returns:
+            DataFrame: ADAPTER_FIELDS columns indexed like rows
+        """
+        fields = pd.DataFrame(index=rows.index, columns=ADAPTER_FIELDS, dtype=object)
+        fields['main_header'] = self.main_header
+        fields['sub_header'] = value_or(rows, present, 'category', self.default_category)
+        fields['tender_number'] = ''
+        fields['calling_entity'] = ''
+        fields['sourcing_doc'] = None
+        fields['close_date'] = rows['close_date']
+        fields['close_time'] = rows['close_time']
+        fields['closing_override'] = rows['closing_date']
+        fields['published_iso'] = False
+        fields['is_award'] = rows['_is_award']
+        fields['keep'] = True
+
+        # pub_date / publish_date_str (client specific keys) win over 'published'
+        published = self.raw_published(rows)
+        published = published.where(rows['publish_date_str'] == '', rows['publish_date_str'])
+        fields['published'] = published.where(rows['pub_date'] == '', rows['pub_date'])
+
+        self.apply(rows, present, fields)
+        return fields
+
+    def raw_published(self, rows):
+        return rows['published']
+
+    def apply(self, rows, present, fields):
+        pass
+
+
+def register_adapter(*sources, prefix=None):
+    """
+    Class decorator registering an adapter instance for exact source names
+    and/or a source prefix (e.g. 'ST Logistics (Tenders)').
+    """
+    def wrap(cls):
+        adapter = cls()
+        for source in sources:
+            ADAPTERS[source] = adapter
+        if prefix:
+            PREFIX_ADAPTERS.append((prefix, adapter))
+        return cls
+    return wrap
+
+
+def get_adapter(source):
+    """Adapter for a source name (exact match, then prefix, then GeBIZ RSS)"""
+    adapter = ADAPTERS.get(source)
+    if adapter is not None:
+        return adapter
+    for prefix, candidate in PREFIX_ADAPTERS:
+        if source.startswith(prefix):
+            ADAPTERS[source] = candidate
+            return candidate
+    return DEFAULT_ADAPTER
+
+
+@register_adapter('ariba')
+class AribaAdapter(SourceAdapter):
+    main_header = 'SAP Ariba - Singapore'
+
+    def apply(self, rows, present, fields):
+        fields['sourcing_doc'] = rows['doc_id']
+        fields['tender_number'] = rows['rfi_id']
+        fields['calling_entity'] = value_or(rows, present, 'buyer', 'SAP Ariba')
+
+        # close_date_raw carries the time, e.g. "13 Jan 2026 12:00 GMT+08:00"
+        raw_close = rows.loc[rows['close_date_raw'] != '', 'close_date_raw']
+        if raw_close.empty:
+            return
+        parsed = parse_dates_bulk(raw_close, fuzzy=True, wall_time=True)
+        ok = raw_close.map(lambda v: parsed.get(v) is not None)
+        raw_close = raw_close[ok]
+        fields.loc[raw_close.index, 'close_date'] = format_dates(raw_close, parsed, '%d %b %Y')
+        fields.loc[raw_close.index, 'close_time'] = format_dates(raw_close, parsed, '%H:%M')
+
+
+@register_adapter('sesami')
+class SesamiAdapter(SourceAdapter):
+    main_header = 'Sesami Business Opportunities'
+
+
+@register_adapter('SIT')
+class SITAdapter(SourceAdapter):
+    main_header = 'SIT Procurement Opportunities'
+
+    def apply(self, rows, present, fields):
+        fields['tender_number'] = rows['ref_no']
+        fields['calling_entity'] = 'Singapore Institute of Technology'
+
+
+@register_adapter('JPMC Brunei')
+class JPMCAdapter(SourceAdapter):
+    main_header = 'JPMC Brunei Tenders'
+
+    def raw_published(self, rows):
+        # No publish date on the portal; use today so the items pass the date filter
+        return pd.Series(datetime.now().strftime('%d %b %Y'), index=rows.index, dtype=object)
+
+    def apply(self, rows, present, fields):
+        fields['tender_number'] = rows['ref_no']
+        fields['calling_entity'] = 'Jerudong Park Medical Centre'
+
+
+@register_adapter('TenderBoard')
+class TenderBoardAdapter(SourceAdapter):
+    main_header = 'TenderBoard Opportunities'
+
+    def apply(self, rows, present, fields):
+        sub_header = rows['industry'].where(rows['industry'] != '', fields['sub_header'])
+        fields['sub_header'] = sub_header.where(sub_header != '', 'General')
+        fields['tender_number'] = rows['ref_no']
+        fields['calling_entity'] = value_or(rows, present, 'buyer', 'TenderBoard')
+
+        # SIT tenders listed on TenderBoard keep their ref/closing date in the title
+        is_sit = fields['calling_entity'].str.upper().str.contains('SINGAPORE INSTITUTE OF TECHNOLOGY', regex=False)
+        if not is_sit.any():
+            return
+        title = rows['title']
+        need_ref = is_sit & (fields['tender_number'] == '')
+        fields.loc[need_ref, 'tender_number'] = title[need_ref].str.extract(r'(TO\d+[A-Za-z]?)', expand=False).fillna('')
+        need_close = is_sit & (fields['close_date'] == '')
+        last_date = title[need_close].str.findall(r'(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})').str[-1]
+        fields.loc[need_close, 'close_date'] = last_date.fillna('')
+
+
+@register_adapter('ST Logistics', prefix='ST Logistics')
+class STLogisticsAdapter(SourceAdapter):
+    main_header = 'ST Logistics Business Opportunities'
+
+    def apply(self, rows, present, fields):
+        fields['tender_number'] = rows['ref_no']
+        fields['calling_entity'] = 'ST Logistics'
+        has_close = rows['closing_date'] != ''
+        fields.loc[has_close, 'close_date'] = rows.loc[has_close, 'closing_date']
+        # Already sends YYYY-MM-DD (keep the date part as-is)
+        fields['published_iso'] = fields['published'].str.match(r'^\d{4}-\d{2}-\d{2}')
+
+
+@register_adapter('gebiz_selenium')
+class GeBizSeleniumAdapter(SourceAdapter):
+    default_category = 'Business Opportunities'
+
+    def apply(self, rows, present, fields):
+        # Category looks like "Business Opportunities ⇒ Medical Supplies"
+        category = fields['sub_header']
+        has_arrow = category.str.contains('⇒', regex=False)
+        split_cat = category.str.split('⇒')
+        main_part = split_cat.str[0].str.strip().where(has_arrow, category)
+        fields['main_header'] = 'GEBIZ - ' + main_part
+        fields['sub_header'] = split_cat.str[1].fillna('').str.strip().where(has_arrow, category)
+        fields['tender_number'] = rows['document_no']
+        fields['calling_entity'] = rows['agency']
+        has_close = rows['closing_date_str'] != ''
+        fields.loc[has_close, 'closing_override'] = rows.loc[has_close, 'closing_date_str']
+        fields['is_award'] = rows['_is_award'] | (rows['search_type'] == 'AWD')
+
+
+@register_adapter('rss')
+class GeBizRSSAdapter(SourceAdapter):
+    """Default adapter: GeBIZ RSS feeds, headers come from the feed mapping"""
+
+    def apply(self, rows, present, fields):
+        feed_urls = rows['feed_url']
+        feeds = catalogue()
+        entries = {url: feeds.lookup(url) for url in pd.unique(feed_urls)}
+        main_header = feed_urls.map(lambda u: entries[u].main if entries[u] else '')
+        fields['main_header'] = main_header.where(main_header == '', 'GEBIZ - ' + main_header)
+        fields['sub_header'] = feed_urls.map(lambda u: entries[u].sub if entries[u] else '')
+        # No main header -> feed not in config (e.g. HTML fallback), skip
+        fields['keep'] = main_header != ''
+        is_awd_feed = (rows['source'] == 'rss') & feed_urls.str.contains('_AWD_', regex=False)
+        fields['is_award'] = rows['_is_award'] | is_awd_feed
+
+
+DEFAULT_ADAPTER = ADAPTERS['rss']
@@ -0,0 +1,147 @@
+import re
+from collections import namedtuple
+
+# ---------------------------------------------------------------------------
+# Combined GeBIZ summary extractor
+# ---------------------------------------------------------------------------
+# Same rules as extract_tender_number / extract_calling_entity /
+# extract_closing_info in processor.normalize, but all patterns are compiled
+# once at import and every field is pulled from one call. Each rule carries
+# the literal keyword(s) it needs; the text is upper-cased once and rules whose
+# keyword is absent are skipped without running the regex.
+
+SummaryFields = namedtuple('SummaryFields', [
+    'tender_number', 'calling_entity', 'closing_date', 'closing_time', 'published_date',
+])
+
+EMPTY_FIELDS = SummaryFields('', '', '', '', '')
+
+# (pattern, keywords that must appear in the upper-cased text or None)
+TENDER_NUMBER_RULES = [
+    (re.compile(r'ITQ[:\s#]*([A-Z0-9\-/]{4,})', re.IGNORECASE), ('ITQ',)),
+    (re.compile(r'ITT[:\s#]*([A-Z0-9\-/]{4,})', re.IGNORECASE), ('ITT',)),
+    (re.compile(r'Quotation No\.?[:\s#]*([A-Z0-9\-/]+)', re.IGNORECASE), ('QUOTATION NO',)),
+    (re.compile(r'Tender No\.?[:\s#]*([A-Z0-9\-/]+)', re.IGNORECASE), ('TENDER NO',)),
+    (re.compile(r'Document No\.?[:\s#]*([A-Z0-9\-/]+)', re.IGNORECASE), ('DOCUMENT NO',)),
+    (re.compile(r'Doc\s*([0-9]{8,})', re.IGNORECASE), ('DOC',)),  # Ariba Doc ID
+    (re.compile(r'\b([0-9]{9,15})\b', re.IGNORECASE), None),  # Ariba pure number ID
+    (re.compile(r'\b(Q[/-]?20\d{2}[/-]\d+)\b', re.IGNORECASE), ('20',)),
+    (re.compile(r'\b(T[/-]?20\d{2}[/-]\d+)\b', re.IGNORECASE), ('20',)),
+    (re.compile(r'\b([A-Z]{2,}\d{6,}[A-Z]{2,}\d{5,})\b', re.IGNORECASE), None),  # e.g. HDB000ETT25000296
+]
+
+ENTITY_KEYWORDS = ('AGENCY', 'ORGANISATION', 'ORGANIZATION', 'BUYER', 'CALLING ENTITY')
+CALLING_ENTITY_RULES = [
+    (re.compile(r'(?:Agency|Organisation|Organization|Buyer|Calling Entity)[:\s]+([^|\n\r]+?)\s*\|',
+                re.IGNORECASE | re.MULTILINE), ENTITY_KEYWORDS),
+    (re.compile(r'(?:Agency|Organisation|Organization|Buyer|Calling Entity)[:\s]+([^|\n\r:]+?)(?:\s+(?:Document|Quotation|Tender|Supply|Delivery|Installation))',
+                re.IGNORECASE | re.MULTILINE), ENTITY_KEYWORDS),
+    (re.compile(r'(?:Agency|Organisation|Organization)[:\s]+([A-Z][^|\n\r.]+?)(?:\.|,|\n|$)',
+                re.IGNORECASE | re.MULTILINE), ENTITY_KEYWORDS[:3]),
+]
+ENTITY_NOISE = re.compile(
+    r'\s+(?:Document|Quotation|Tender|Supply|Delivery|Installation|Commissioning|ITQ|ITT).*$', re.IGNORECASE)
+
+CLOSING_INFO_RULES = [
+    re.compile(r'Closing (?:on|Date)[:\s]+([0-9]{1,2}[/\-\s][A-Za-z0-9]{1,3}[/\-\s][0-9]{2,4})\s+([0-9]{1,2}:[0-9]{2}(?::[0-9]{2})?(?:\s*[AP]M)?)', re.IGNORECASE),
+    re.compile(r'Closing (?:on|Date)[:\s]+([0-9]{1,2}[/\-\s][A-Za-z0-9]{1,3}[/\-\s][0-9]{2,4})', re.IGNORECASE),
+]
+CLOSING_SECONDS = re.compile(r':\d{2}(?=\s*[APap][Mm]|$)')
+
+PUBLISHED_RULES = [
+    (re.compile(r'(?:Published|Posted|Date)[:\s]+([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})', re.IGNORECASE),
+     ('PUBLISHED', 'POSTED', 'DATE')),
+    (re.compile(r'([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})', re.IGNORECASE), None),
+]
+
+
+def _has_keyword(upper, keywords):
+    if keywords is None:
+        return True
+    for keyword in keywords:
+        if keyword in upper:
+            return True
+    return False
+
+
+def _clean_entity(entity):
+    """Same clean-up/validation as extract_calling_entity(); '' if rejected"""
+    entity = entity.strip()
+    if '|' in entity:
+        entity = entity.split('|')[0].strip()
+    # Stop at colon if it appears (but keep prefixes like "NUS:")
+    parts = entity.split(':')
+    if len(parts) > 1 and len(parts[0]) > 5:
+        entity = parts[0].strip()
+    entity = ENTITY_NOISE.sub('', entity)
+    if entity and 3 < len(entity) < 100:
+        return entity
+    return ''
+
+
+def extract_summary_fields(title, summary, need=None):
+    """
+    Extract tender number, calling entity, closing date/time and published
+    date from a GeBIZ title/summary in one call.
+
+    Args:
+        title: item title
+        summary: item summary / description text
+        need: optional set of SummaryFields names to extract (default: all)
+
+    Returns:
+        SummaryFields: '' for every field that was not found (or not needed)
+    """
+    title = title or ''
+    summary = summary or ''
+    if not title and not summary:
+        return EMPTY_FIELDS
+    summary_upper = summary.upper()
+    upper = title.upper() + ' ' + summary_upper
+
+    tender_number = ''
+    if need is None or 'tender_number' in need:
+        text = title + ' ' + summary
+        for pattern, keywords in TENDER_NUMBER_RULES:
+            if not _has_keyword(upper, keywords):
+                continue
+            m = pattern.search(text)
+            if m and m.group(1):
+                tender_number = m.group(1).strip()
+                break
+
+    calling_entity = ''
+    if need is None or 'calling_entity' in need:
+        text = summary + ' ' + title
+        for pattern, keywords in CALLING_ENTITY_RULES:
+            if not _has_keyword(upper, keywords):
+                continue
+            m = pattern.search(text)
+            if m and m.group(1):
+                calling_entity = _clean_entity(m.group(1))
+                if calling_entity:
+                    break
+
+    closing_date = closing_time = ''
+    if (need is None or 'closing_date' in need) and 'CLOSING' in summary_upper:
+        for pattern in CLOSING_INFO_RULES:
+            m = pattern.search(summary)
+            if m:
+                closing_date = m.group(1) or ''
+                closing_time = m.group(2) if pattern.groups > 1 and m.group(2) else ''
+                # Strip seconds only if present (13:00:00 -> 13:00)
+                if closing_time.count(':') >= 2:
+                    closing_time = CLOSING_SECONDS.sub('', closing_time)
+                break
+
+    published_date = ''
+    if (need is None or 'published_date' in need) and ('/' in summary or '-' in summary):
+        for pattern, keywords in PUBLISHED_RULES:
+            if not _has_keyword(summary_upper, keywords):
+                continue
+            m = pattern.search(summary)
+            if m and m.group(1).strip():
+                published_date = m.group(1).strip()
+                break
+
+    return SummaryFields(tender_number, calling_entity, closing_date, closing_time, published_date)
@@ -1,34 +1,16 @@
 import re
 from datetime import datetime
-from dateutil import parser
-import pytz
-import yaml
-from pathlib import Path
-
-# Load feeds config to map URLs to categories
-def load_feed_mapping():
-    """Load feeds.yaml and create a mapping of feed URLs to main/sub categories"""
-    cfg = Path('config/feeds.yaml')
-    if not cfg.exists():
-        return {}
-    
-    data = yaml.safe_load(cfg.read_text()) or {}
-    feeds = data.get('feeds', {})
-    
-    # Create mapping: {feed_url: {'main': '...', 'sub': '...'}}
-    url_mapping = {}
-    for main_cat, subs in feeds.items():
-        for sub_cat, types in subs.items():
-            for feed_type, url in types.items():
-                url_mapping[url] = {
-                    'main': main_cat,
-                    'sub': sub_cat
-                }
-    
-    return url_mapping
+import pandas as pd
 
-# Load mapping once at module level
-FEED_MAPPING = load_feed_mapping()
+from processor.adapters import get_adapter
+from processor.extract import SummaryFields, extract_summary_fields
+from processor.tender import Tender
+from util.dates import parse_date, parse_dates_bulk, format_dates
+from util.feed_catalogue import catalogue
+from util.log import get_logger
+from util.timing import timed
+
+log = get_logger(__name__)
 
 def extract_field(text, label):
     """Extract a field value from text using regex pattern"""
@@ -84,16 +66,11 @@ def extract_date_only(date_str):
     if not date_str:
         return ''
     
-    try:
-        # Default to dayfirst=True for DD/MM/YYYY formats common in Singapore
-        dt = parser.parse(date_str, dayfirst=True)
-        # Convert to Singapore time if timezone-aware
-        if dt.tzinfo:
-            dt = dt.astimezone(pytz.timezone('Asia/Singapore'))
-        
-        return dt.strftime('%Y-%m-%d')
-    except:
+    # DD/MM/YYYY is the default in Singapore; ISO strings are read year-first
+    dt = parse_date(date_str)
+    if dt is None:
         return date_str
+    return dt.strftime('%Y-%m-%d')
 
 def extract_closing_info(summary):
     """Extract closing date and time from summary"""
@@ -172,9 +149,10 @@ def get_category_from_url(feed_url):
     if not feed_url or feed_url == 'HTML_FALLBACK':
         return '', ''
     
-    # Try to find in mapping
-    if feed_url in FEED_MAPPING:
-        return FEED_MAPPING[feed_url]['main'], FEED_MAPPING[feed_url]['sub']
+    # Try to find in the feed catalogue (feeds.yaml)
+    entry = catalogue().lookup(feed_url)
+    if entry is not None:
+        return entry.main, entry.sub
     
     # Fallback: extract from URL if not in mapping
     match = re.search(r'/([^/]+)-CREATE_(?:BO|AWD)_FEED\.xml', feed_url)
@@ -184,292 +162,213 @@ def get_category_from_url(feed_url):
     
     return '', ''
 
-print("DEBUG LOAD: processor.normalize loaded")
+# ---------------------------------------------------------------------------
+# Columnar normalization
+# ---------------------------------------------------------------------------
+# Raw items are loaded into a DataFrame once and every step below works on
+# whole columns (masks, bulk date parsing) instead of looping per item, so
+# large historical GeBIZ runs stay fast. Summaries are scanned once per row
+# with the precompiled extractor in processor.extract.
 
-def normalize_items(items):
+# Raw keys read by the normalizer (missing keys become empty strings)
+RAW_FIELDS = [
+    'title', 'summary', 'link', 'published', 'feed_url', 'source', 'category',
+    'doc_id', 'rfi_id', 'close_date_raw', 'close_date', 'close_time', 'buyer',
+    'ref_no', 'industry', 'closing_date', 'closing_date_str', 'document_no',
+    'agency', 'pub_date', 'publish_date_str', 'itq_itt', 'calling_entity',
+    'opportunity_amount', 'search_type', 'awarded_date_str', 'awarded_to',
+    'award_value',
+]
+
+# Output schema (same keys and order as the export expects, see processor.tender)
+OUTPUT_COLUMNS = [
+    'No.', 'Published Date', 'Awarded Date', 'awarded_to', 'award_value',
+    '_is_award', 'Closing Date', 'Closing Time', 'Date Detected', 'ITQ/ITT',
+    'Calling Entity', 'Description', 'Link', 'Main Header', 'Sub Header',
+    'Sourcing Doc No.', 'Opportunity Amount',
+]
+
+SECONDS_PATTERN = r':\d{2}(?=\s*[APap][Mm]|$)'
+
+
+def _scan_summaries(title, summary, needs):
     """
-    Normalize RSS feed items to required export format
+    Run extract_summary_fields() once for every row that still misses a field.
+
+    Args:
+        title, summary: string Series
+        needs: boolean DataFrame, one column per SummaryFields name to extract
+
+    Returns:
+        DataFrame: SummaryFields columns ('' where not needed / not found)
     """
-    norm = []
-    
-    for idx, item in enumerate(items, 1):
-        title = item.get('title', '')
-        summary = item.get('summary', '')
-        link = item.get('link', '')
-        
-        # Normalize published date to YYYY-MM-DD to avoid ambiguity (MM/DD parsed as DD/MM)
-        raw_pub = item.get('published', '')
-        published = extract_date_only(raw_pub)
-        
-        feed_url = item.get('feed_url', '')
-        source = item.get('source', 'rss')
-        
-        print(f"DEBUG ITEM: T='{title}' S='{source}'")
-        
-        # Skip if no title and no summary (ghost entry)
-        if not title and not summary:
-            print("  SKIP: No title/summary")
-            continue
-        
-        # Skip if no meaningful title (less than 2 chars)
-        if not title or len(title.strip()) < 2:
-            continue
-        
-        feed_url = item.get('feed_url', '')
-        source = item.get('source', 'rss')
-        
-        tender_number = None
-        calling_entity = None
-        sourcing_doc = None
-        
-        # Handle different sources
-        if source == 'ariba':
-            # SAP Ariba specific handling
-            main_header = 'SAP Ariba - Singapore'
-            
-            # Sub Header -> Category or General (since Doc ID moved to own column)
-            sub_header = item.get('category', 'General')
-            
-            # Sourcing Doc No
-            sourcing_doc = item.get('doc_id', '')
-            
-            # ITQ/ITT -> RFI ID
-            tender_number = item.get('rfi_id', '')
-            
-            # Category -> Product and Service Categories
-            # (Already mapped to 'category' key by scraper, ensuring it flows to Category column)
-            
-            # Closing Date/Time
-            # We captured close_date_raw with time in scraper
-            if item.get('close_date_raw'):
-                # Format: 13 Jan 2026 12:00 GMT+08:00
-                raw = item.get('close_date_raw')
-                try:
-                    # Fuzzy parse to handle GMT offsets if needed, or split
-                    dt = parser.parse(raw, fuzzy=True)
-                    item['close_date'] = dt.strftime('%d %b %Y')
-                    item['close_time'] = dt.strftime('%H:%M')
-                    closing_time = dt.strftime('%H:%M')
-                except:
-                    pass
-            
-            # Buyer/Company -> Calling Entity
-            calling_entity = item.get('buyer', 'SAP Ariba')
-        elif source == 'sesami':
-            # Sesami specific handling
-            main_header = 'Sesami Business Opportunities'
-            sub_header = item.get('category', 'General')
-        elif source == 'SIT':
-            main_header = 'SIT Procurement Opportunities'
-            sub_header = item.get('category', 'General')
-            # Custom mappings for SIT
-            tender_number = item.get('ref_no', '')
-            if not tender_number:
-                tender_number = extract_tender_number(title, summary)
-            calling_entity = 'Singapore Institute of Technology'
-            
-        elif source == 'JPMC Brunei':
-            main_header = 'JPMC Brunei Tenders'
-            sub_header = item.get('category', 'General')
-            # Custom mappings for JPMC
-            tender_number = item.get('ref_no', '')
-            calling_entity = 'Jerudong Park Medical Centre'
-            
-            # Force Published Date to today to bypass date filtering
-            # as requested by user ("ignore date filtering... fetch everything... as long as current")
-            # This ensures it passes "Last 24 hours" filter in app_enhanced.py
-            published = datetime.now().strftime('%d %b %Y') # e.g. 01 Jan 2026
-
-        elif source == 'TenderBoard':
-            main_header = 'TenderBoard Opportunities'
-            # Use Industry as Sub Header
-            sub_header = item.get('industry') or item.get('category', 'General')
-            if not sub_header:
-                 sub_header = 'General'
-            
-            # Custom mappings for TenderBoard
-            tender_number = item.get('ref_no')
-            calling_entity = item.get('buyer', 'TenderBoard')
-            
-            # Special Handling for SIT
-            if calling_entity and "SINGAPORE INSTITUTE OF TECHNOLOGY" in calling_entity.upper():
-                # Extract Ref No from Title (e.g. TO2025019)
-                if not tender_number:
-                    m = re.search(r'(TO\d+[A-Za-z]?)', title)
-                    if m:
-                        tender_number = m.group(1)
-                
-                # Extract Dates from Title/Summary if missing
-                if not item.get('close_date'):
-                    matches = re.findall(r'(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})', title)
-                    if matches:
-                         item['close_date'] = matches[-1]
-
-        elif source.startswith('ST Logistics'):
-            main_header = 'ST Logistics Business Opportunities'
-            sub_header = item.get('category', 'General')
-            
-            # Map ST Logistics specific fields
-            tender_number = item.get('ref_no', '')
-            calling_entity = 'ST Logistics'
-            
-            # Handle closing date from stlogs_client output
-            if item.get('closing_date'):
-                item['close_date'] = item.get('closing_date')
+    scan = needs.any(axis=1)
+    names = list(needs.columns)
+    need_sets = {}
+    rows = []
+    for t, s, flags in zip(title[scan].tolist(), summary[scan].tolist(),
+                           needs[scan].itertuples(index=False, name=None)):
+        need = need_sets.get(flags)
+        if need is None:
+            need = need_sets[flags] = frozenset(n for n, f in zip(names, flags) if f)
+        rows.append(extract_summary_fields(t, s, need))
+    found = pd.DataFrame(rows, index=scan.index[scan], columns=SummaryFields._fields, dtype=object)
+    return found.reindex(needs.index, fill_value='')
 
-        elif source == 'gebiz_selenium':
-            cat = item.get('category', 'Business Opportunities')
-            
-            # Check for "Main ⇒ Sub" pattern (common in text)
-            if '⇒' in cat:
-                parts = cat.split('⇒')
-                main_part = parts[0].strip()
-                sub_part = parts[1].strip()
-                main_header = f"GEBIZ - {main_part}"
-                sub_header = sub_part
-            else:
-                main_header = f"GEBIZ - {cat}"
-                sub_header = cat
-            
-            # Map captured fields
-            tender_number = item.get('document_no')
-            calling_entity = item.get('agency')
-            
-            # Map closing date string for later extraction/parsing
-            if item.get('closing_date_str'):
-                item['closing_date'] = item.get('closing_date_str')
-            
-        else:
-            # GeBIZ handling (RSS)
-            # Get main category and sub category from feed URL mapping
-            main_header, sub_header = get_category_from_url(feed_url)
-            
-            # Skip if no main header (shouldn't happen but safety check)
-            if not main_header:
-                continue
-            
-            # Prepend "GEBIZ - " to Main Header
-            main_header = f"GEBIZ - {main_header}"
-            
-            # For GeBIZ/Aruba/Sesami, extraction happens later
-            tender_number = None
-            calling_entity = None
-        
-        # Map specific client keys to standard keys
-        if item.get('pub_date'):
-            published = item.get('pub_date')
-        elif item.get('publish_date_str'):
-            published = item.get('publish_date_str')
-        
-        # Extract published date (no time)
-        # BUG FIX: processing ST Logistics YYYY-MM-DD with extract_date_only(dayfirst=True) caused date swap.
-        # Bypass re-parsing if source is ST Logistics and it looks like YYYY-MM-DD
-        if source.startswith('ST Logistics') and re.match(r'^\d{4}-\d{2}-\d{2}', str(published)):
-            published_date = str(published).split(' ')[0] # Keep YYYY-MM-DD part, ignore time if present
-        else:
-            published_date = extract_date_only(published)
-        
-        # If no published date from RSS, try to extract from summary/title
-        if not published_date:
-            # Try to find date patterns in summary
-            date_patterns = [
-                r'(?:Published|Posted|Date)[:\s]+([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{2,4})',
-                r'([0-9]{1,2}[/-][0-9]{1,2}[/-][0-9]{4})',
-            ]
-            for pattern in date_patterns:
-                m = re.search(pattern, summary, re.IGNORECASE)
-                if m and m.group(1):
-                    published_date = m.group(1)
-                    break
-        
-        # Extract closing date and time
-        if item.get('close_date'):
-            closing_date_raw = item.get('close_date')
-            closing_time = str(item.get('close_time', '')) # Future proofing
+
+def _strip_seconds(times):
+    """HH:MM:SS -> HH:MM (only when seconds are present)"""
+    times = times.copy()
+    has_seconds = times.str.count(':') >= 2
+    if has_seconds.any():
+        times[has_seconds] = times[has_seconds].str.replace(SECONDS_PATTERN, '', regex=True)
+    return times
+
+
+def _load_frame(items):
+    """Load raw items into a string-typed DataFrame with every RAW_FIELDS column"""
+    df = pd.DataFrame.from_records(items)
+    missing = pd.Series(True, index=df.index)
+    present = {}
+    for col in RAW_FIELDS:
+        if col in df.columns:
+            present[col] = df[col].notna()
+            values = df[col].where(present[col], '').astype(str)
+            df[col] = pd.Series(values.to_numpy(dtype=object), index=df.index)
         else:
-            closing_date_raw, closing_time = extract_closing_info(summary)
-            
-        # Ensure Closing Time is HH:MM (strip seconds)
-        if closing_time and closing_time.count(':') >= 2:
-             closing_time = re.sub(r':\d{2}(?=\s*[APap][Mm]|$)', '', closing_time)
-        
-        # Normalize closing date for comparison and export
-        closing_date = extract_date_only(closing_date_raw) if closing_date_raw else ''
-        
-        # GeBIZ RSS often sets pubDate to Closing Date. Detecting this error:
-        if published_date and closing_date and published_date == closing_date:
-            published_date = ''
-            
-        # Extract ITQ/ITT number (merged)
-        if not tender_number:
-            tender_number = item.get('itq_itt') or extract_tender_number(title, summary)
-        
-        # Extract calling entity (improved extraction)
-        if not calling_entity:
-            calling_entity = item.get('calling_entity') or extract_calling_entity(summary, title)
-        
-        # Closing Date override
-        if item.get('closing_date'):
-            closing_date = extract_date_only(item.get('closing_date'))
-            # If closing_date has a time part like "17:00", strict date extraction might lose it if looking for date only.
-            # But the export separates Date and Time.
-            # Sesami "14 Jan 2026 17:00". extract_date_only handles the date.
-            # We need time too.
-            cd_raw = item.get('closing_date')
-            try:
-                dt_close = parser.parse(cd_raw)
-                closing_time = dt_close.strftime('%H:%M')
-            except:
-                pass
-
-        # Date detected
-        date_detected = datetime.now().strftime('%Y-%m-%d')
-        
-        # Description
-        description = title
-        
-        # New columns from Ariba
-        category_val = item.get('category', '')
-        # Only populate Category column if explicitly requested or relevant
-        # But user asked for "another column for category at the end"
-        
-        opp_amount = item.get('opportunity_amount', '')
-        
-        # Determine if this is an Award (for separation in Excel)
-        is_award = item.get('_is_award', False)
-        if not is_award:
-            if source == 'rss' and '_AWD_' in feed_url:
-                is_award = True
-            elif source == 'gebiz_selenium' and item.get('search_type') == 'AWD':
-                is_award = True
-        
-        awarded_date = item.get('awarded_date_str', '')
-        awarded_to = item.get('awarded_to', '')
-        award_value = item.get('award_value', '')
-        
-        norm.append({
-            'No.': idx,
-            'Published Date': published_date,
-            'Awarded Date': awarded_date,
-            'awarded_to': awarded_to,
-            'award_value': award_value,
-            '_is_award': is_award,
-            'Closing Date': closing_date,
-            'Closing Time': closing_time,
-            'Date Detected': date_detected,
-            'ITQ/ITT': tender_number,
-            'Calling Entity': calling_entity,
-            'Description': description,
-            'Link': link,
-            #'_is_award': is_award, # Removed duplicate
-            'Main Header': main_header,
-            'Sub Header': sub_header,
-            'Sourcing Doc No.': sourcing_doc,
-            'Opportunity Amount': opp_amount
-        })
-    
-    # Renumber after filtering
-    for idx, item in enumerate(norm, 1):
-        item['No.'] = idx
-    
-    return norm
+            present[col] = ~missing
+            df[col] = pd.Series('', index=df.index, dtype=object)
+    df['source'] = df['source'].where(present['source'], 'rss')
+    if '_is_award' in df.columns:
+        df['_is_award'] = df['_is_award'].map(bool, na_action='ignore').where(df['_is_award'].notna(), False).astype(bool)
+    else:
+        df['_is_award'] = False
+    return df, pd.DataFrame(present)
+
+
+@timed('normalize_items')
+def normalize_items(items):
+    """
+    Normalize raw collector items to the export format.
+
+    Works column-wise on a DataFrame: rows are grouped by 'source' and each
+    group is mapped by its adapter (see processor.adapters), then missing
+    fields are pulled from one scan of each summary and dates are parsed in
+    bulk (each distinct date string once).
+
+    Args:
+        items: list of raw item dicts from the collectors
+
+    Returns:
+        list: Tender records (dict-style access by OUTPUT_COLUMNS names)
+    """
+    if not items:
+        return []
+
+    df, present = _load_frame(items)
+
+    # Source specific mapping: one adapter per portal, each on its own rows
+    parts = [
+        get_adapter(source).normalize(rows, present.loc[rows.index])
+        for source, rows in df.groupby('source', sort=False)
+    ]
+    fields = pd.concat(parts).reindex(df.index)
+
+    # Skip ghost entries, items without a meaningful title and rows an adapter dropped
+    keep = (df['title'].str.strip().str.len() >= 2) & fields['keep'].astype(bool)
+    df, fields = df[keep], fields[keep]
+    if df.empty:
+        log.info("📊 Normalize: 0/%d items kept", len(items))
+        return []
+    title, summary = df['title'], df['summary']
+    idx = df.index
+    tender_number = fields['tender_number'].copy()
+    calling_entity = fields['calling_entity'].copy()
+    close_date = fields['close_date']
+    close_time = fields['close_time']
+    closing_override = fields['closing_override']
+
+    # --- Published date ---
+    published = fields['published']
+    iso = fields['published_iso'].astype(bool)
+    published_date = format_dates(published, parse_dates_bulk(published[~iso]))
+    published_date[iso] = published[iso].str.split(' ').str[0]
+
+    # --- Fields the adapters left empty: one scan per title/summary ---
+    tender_number = tender_number.where(tender_number != '', df['itq_itt'])
+    calling_entity = calling_entity.where(calling_entity != '', df['calling_entity'])
+    from_summary = close_date == ''
+    no_pub = published_date == ''
+    found = _scan_summaries(title, summary, pd.DataFrame({
+        'tender_number': tender_number == '',
+        'calling_entity': calling_entity == '',
+        'closing_date': from_summary,
+        'published_date': no_pub,
+    }))
+    tender_number = tender_number.where(tender_number != '', found['tender_number'])
+    calling_entity = calling_entity.where(calling_entity != '', found['calling_entity'])
+    # If no published date, use the one found in the summary
+    published_date[no_pub] = found.loc[no_pub, 'published_date']
+
+    # --- Closing date / time ---
+    closing_raw = close_date.where(~from_summary, found['closing_date'])
+    closing_time = _strip_seconds(close_time.where(~from_summary, found['closing_time']))
+    closing_date = format_dates(closing_raw, parse_dates_bulk(closing_raw))
+
+    # GeBIZ RSS often sets pubDate to Closing Date
+    same_day = (published_date != '') & (published_date == closing_date)
+    published_date[same_day] = ''
+
+    # --- Closing date override (Sesami / GeBIZ Selenium "14 Jan 2026 17:00") ---
+    override = closing_override != ''
+    if override.any():
+        raw = closing_override[override]
+        parsed = parse_dates_bulk(raw)
+        closing_date[override] = format_dates(raw, parsed)
+        times = format_dates(raw, parsed, '%H:%M', keep_unparsed=False)
+        has_time = times != ''
+        closing_time[has_time.index[has_time]] = times[has_time]
+
+    out = pd.DataFrame({
+        'No.': range(1, len(df) + 1),
+        'Published Date': published_date,
+        'Awarded Date': df['awarded_date_str'],
+        'awarded_to': df['awarded_to'],
+        'award_value': df['award_value'],
+        '_is_award': fields['is_award'].astype(bool),
+        'Closing Date': closing_date,
+        'Closing Time': closing_time,
+        'Date Detected': datetime.now().strftime('%Y-%m-%d'),
+        'ITQ/ITT': tender_number,
+        'Calling Entity': calling_entity,
+        'Description': title,
+        'Link': df['link'],
+        'Main Header': fields['main_header'],
+        'Sub Header': fields['sub_header'],
+        'Sourcing Doc No.': fields['sourcing_doc'],
+        'Opportunity Amount': df['opportunity_amount'],
+    }, index=idx, columns=OUTPUT_COLUMNS)
+
+    log.info("📊 Normalize: %d/%d items kept", len(out), len(items),
+             extra={'kept': len(out), 'items': len(items)})
+    return _to_tenders(out)
+
+
+def _parse_column(values):
+    """Series of date strings -> list of parsed datetimes (None where empty/unparseable)"""
+    parsed = parse_dates_bulk(values)
+    return [parsed.get(v) for v in values.tolist()]
+
+
+def _to_tenders(frame):
+    """DataFrame with OUTPUT_COLUMNS -> list of Tender records (NaN -> None)"""
+    columns = []
+    for col in OUTPUT_COLUMNS:
+        values = frame[col].tolist()
+        if frame[col].dtype == object:
+            values = [None if v != v else v for v in values]  # NaN != NaN
+        columns.append(values)
+    columns.append(_parse_column(frame['Published Date']))
+    columns.append(_parse_column(frame['Closing Date']))
+    columns.append(_parse_column(frame['Awarded Date']))
+    return [Tender(*row) for row in zip(*columns)]
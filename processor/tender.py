@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+# Export column name -> Tender attribute (same order as normalize.OUTPUT_COLUMNS)
+COLUMN_FIELDS = {
+    'No.': 'no',
+    'Published Date': 'published_date',
+    'Awarded Date': 'awarded_date',
+    'awarded_to': 'awarded_to',
+    'award_value': 'award_value',
+    '_is_award': 'is_award',
+    'Closing Date': 'closing_date',
+    'Closing Time': 'closing_time',
+    'Date Detected': 'date_detected',
+    'ITQ/ITT': 'itq_itt',
+    'Calling Entity': 'calling_entity',
+    'Description': 'description',
+    'Link': 'link',
+    'Main Header': 'main_header',
+    'Sub Header': 'sub_header',
+    'Sourcing Doc No.': 'sourcing_doc_no',
+    'Opportunity Amount': 'opportunity_amount',
+}
+
+# Date column -> attribute holding its parsed value
+PARSED_DATES = {
+    'Published Date': 'published_dt',
+    'Closing Date': 'closing_dt',
+    'Awarded Date': 'awarded_dt',
+}
+
+
+@dataclass(slots=True)
+class Tender:
+    """
+    One normalized tender.
+
+    Replaces the per-item dicts returned by normalize_items: attributes are
+    stored in __slots__ and the date columns are parsed once (Asia/Singapore,
+    tz-aware) so later stages don't re-parse strings or probe several keys.
+
+    Dict-style access by export column name (tender['Published Date'],
+    tender.get('_is_award')) is kept for existing callers.
+    """
+    no: int
+    published_date: str
+    awarded_date: str
+    awarded_to: str
+    award_value: str
+    is_award: bool
+    closing_date: str
+    closing_time: str
+    date_detected: str
+    itq_itt: str
+    calling_entity: str
+    description: str
+    link: str
+    main_header: str
+    sub_header: str
+    sourcing_doc_no: Optional[str]
+    opportunity_amount: str
+    published_dt: Optional[datetime] = None
+    closing_dt: Optional[datetime] = None
+    awarded_dt: Optional[datetime] = None
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, COLUMN_FIELDS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in COLUMN_FIELDS:
+            raise KeyError(key)
+        setattr(self, COLUMN_FIELDS[key], value)
+        if key in PARSED_DATES:
+            from util.dates import parse_date   # keeps this module free of pandas
+
+            setattr(self, PARSED_DATES[key], parse_date(value))
+
+    def __contains__(self, key):
+        return key in COLUMN_FIELDS
+
+    def get(self, key, default=None):
+        attr = COLUMN_FIELDS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def keys(self):
+        return COLUMN_FIELDS.keys()
+
+    def to_dict(self):
+        """Plain dict keyed by export column name (the old normalize_items format)"""
+        return {key: getattr(self, attr) for key, attr in COLUMN_FIELDS.items()}
+
+    def copy(self):
+        return self.to_dict()
+
+
+def as_records(items):
+    """Tender objects -> dicts (other items are passed through unchanged)"""
+    return [item.to_dict() if isinstance(item, Tender) else item for item in items]
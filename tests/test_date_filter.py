@@ -0,0 +1,55 @@
+"""
+Date filtering of normalized tenders and raw items, including dates that
+parse but lie outside the range pandas can represent.
+"""
+from datetime import datetime, timedelta
+
+from processor.normalize import normalize_items
+from util.date_filter import DateIndex, filter_by_date
+from util.date_window import DateWindow
+
+TODAY = datetime.now().strftime('%d/%m/%Y')
+LAST_WEEK = (datetime.now() - timedelta(days=5)).strftime('%d/%m/%Y')
+
+
+def raw_items():
+    return [
+        {'title': 'Today', 'published': TODAY, 'source': 'sesami'},
+        {'title': 'Last week', 'published': LAST_WEEK, 'source': 'sesami'},
+        {'title': 'Typo', 'published': '01/01/2300', 'source': 'sesami'},
+    ]
+
+
+def titles(items):
+    return [item.get('title') or item['Description'] for item in items]
+
+
+def test_out_of_range_date_counts_as_undated_for_raw_items():
+    items = raw_items()
+    assert titles(filter_by_date(items, mode='last_7_days')) == ['Today', 'Last week']
+    assert titles(filter_by_date(items, mode='last_7_days', include_items_without_dates=True)) == [
+        'Today', 'Last week', 'Typo']
+
+
+def test_out_of_range_date_counts_as_undated_for_tenders():
+    tenders = normalize_items(raw_items())
+    assert tenders[2].published_dt.year == 2300
+    assert len(filter_by_date(tenders, mode='today')) == 1
+    assert len(filter_by_date(tenders, mode='last_7_days', include_items_without_dates=True)) == 3
+
+
+def test_date_index_with_out_of_range_date():
+    index = DateIndex(normalize_items(raw_items()))
+    assert len(index.undated) == 1
+    assert len(filter_by_date(index, mode='today')) == 1
+    assert len(filter_by_date(index, mode='last_7_days', include_items_without_dates=True)) == 3
+
+
+def test_window_covers_only_narrower_windows():
+    fetched = DateWindow.resolve('last_7_days')
+    assert fetched.covers(DateWindow.resolve('today'))
+    assert not fetched.covers(DateWindow.resolve('last_14_days'))
+    assert not fetched.covers(DateWindow.resolve('all'))
+    custom = DateWindow.resolve('custom', '2025-01-01', '2025-01-31')
+    assert custom.covers(DateWindow.resolve('custom', '2025-01-10', '2025-01-20'))
+    assert not custom.covers(DateWindow.resolve('custom', '2025-01-10'))
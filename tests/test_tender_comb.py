@@ -0,0 +1,238 @@
+"""
+Incremental Tender Comb appends on workbooks saved by Excel.
+
+The fixture packages below are laid out the way Excel (default namespace,
+mc:Ignorable extension prefixes, shared strings, relative relationship
+targets, HeadingPairs/TitlesOfParts in docProps/app.xml) and the Open XML
+SDK (SpreadsheetML under an 'x:' prefix) write them. After every append the
+result must load in openpyxl with the old rows untouched and the new rows
+in place.
+"""
+import zipfile
+from datetime import datetime
+import xml.etree.ElementTree as ET
+
+import pytest
+from openpyxl import load_workbook
+
+from exporter.excel import COLUMNS
+from exporter.tender_comb import APP_PROPS_NS, VT_NS, append_incremental
+
+MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+MC = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+DAILY_SHEET = 'GeBIZ_01_10_2025'
+
+
+def excel_package(path, prefix=''):
+    """Write a two-sheet Tender Comb workbook as Excel (prefix='') or the Open XML SDK (prefix='x') saves it"""
+    p = f'{prefix}:' if prefix else ''
+    main = f'xmlns:{prefix}="{MAIN}"' if prefix else f'xmlns="{MAIN}"'
+    excel_ns = ('' if prefix else
+                f' xmlns:mc="{MC}" mc:Ignorable="x14ac xr xr2 xr3"'
+                ' xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac"'
+                ' xmlns:xr="http://schemas.microsoft.com/office/spreadsheetml/2014/revision"'
+                ' xmlns:xr2="http://schemas.microsoft.com/office/spreadsheetml/2015/revision2"'
+                ' xmlns:xr3="http://schemas.microsoft.com/office/spreadsheetml/2016/revision3"')
+    dy = '' if prefix else ' x14ac:dyDescent="0.25"'
+
+    strings = list(COLUMNS) + ['ITQ-OLD-1', 'Old agency', 'Old tender one', 'https://example.org/old-1',
+                               'ITQ-OLD-2', 'Old tender two', 'https://example.org/old-2']
+    index = {s: i for i, s in enumerate(strings)}
+
+    def text(ref, value):
+        return f'<{p}c r="{ref}" t="s"><{p}v>{index[value]}</{p}v></{p}c>'
+
+    def header_row():
+        cells = ''.join(text(f"{chr(65 + i)}1", c) for i, c in enumerate(COLUMNS))
+        return f'<{p}row r="1" spans="1:12"{dy}>{cells}</{p}row>'
+
+    def tender_row(r, no, ref, description, link):
+        return (f'<{p}row r="{r}" spans="1:12"{dy}><{p}c r="A{r}"><{p}v>{no}</{p}v></{p}c>'
+                f'<{p}c r="B{r}" s="1"><{p}v>45931</{p}v></{p}c>{text(f"F{r}", ref)}'
+                f'{text(f"G{r}", "Old agency")}{text(f"H{r}", description)}{text(f"I{r}", link)}</{p}row>')
+
+    def sheet(rows, last_row):
+        return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+                f'<{p}worksheet {main} xmlns:r="{REL}"{excel_ns}>'
+                f'<{p}dimension ref="A1:L{last_row}"/><{p}sheetViews><{p}sheetView workbookViewId="0"/></{p}sheetViews>'
+                f'<{p}sheetFormatPr defaultRowHeight="15"{dy}/><{p}sheetData>{rows}</{p}sheetData>'
+                f'<{p}pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/>'
+                f'</{p}worksheet>')
+
+    workbook_ns = ('' if prefix else
+                   f' xmlns:mc="{MC}" mc:Ignorable="x15 xr xr6 xr10 xr2"'
+                   ' xmlns:x15="http://schemas.microsoft.com/office/spreadsheetml/2010/11/main"'
+                   ' xmlns:xr="http://schemas.microsoft.com/office/spreadsheetml/2014/revision"'
+                   ' xmlns:xr6="http://schemas.microsoft.com/office/spreadsheetml/2016/revision6"'
+                   ' xmlns:xr10="http://schemas.microsoft.com/office/spreadsheetml/2016/revision10"'
+                   ' xmlns:xr2="http://schemas.microsoft.com/office/spreadsheetml/2015/revision2"')
+    revision = ('' if prefix else
+                '<xr:revisionPtr revIDLastSave="0" documentId="8_{6A0C}" xr6:coauthVersionLast="47" '
+                'xr6:coauthVersionMax="47" xr10:uidLastSave="{00000000-0000-0000-0000-000000000000}"/>')
+    parts = {
+        '[Content_Types].xml':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet2.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '<Override PartName="/docProps/core.xml" '
+            'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+            '<Override PartName="/docProps/app.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/></Types>',
+        '_rels/.rels':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId3" Type="{REL}/extended-properties" Target="docProps/app.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/'
+            'metadata/core-properties" Target="docProps/core.xml"/>'
+            f'<Relationship Id="rId1" Type="{REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        'docProps/app.xml':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            f'<Properties xmlns="{APP_PROPS_NS}" xmlns:vt="{VT_NS}"><Application>Microsoft Excel</Application>'
+            '<DocSecurity>0</DocSecurity><ScaleCrop>false</ScaleCrop><HeadingPairs>'
+            '<vt:vector size="4" baseType="variant"><vt:variant><vt:lpstr>Worksheets</vt:lpstr></vt:variant>'
+            '<vt:variant><vt:i4>2</vt:i4></vt:variant><vt:variant><vt:lpstr>Named Ranges</vt:lpstr></vt:variant>'
+            '<vt:variant><vt:i4>1</vt:i4></vt:variant></vt:vector></HeadingPairs><TitlesOfParts>'
+            f'<vt:vector size="3" baseType="lpstr"><vt:lpstr>Master</vt:lpstr><vt:lpstr>{DAILY_SHEET}</vt:lpstr>'
+            '<vt:lpstr>Tenders</vt:lpstr></vt:vector></TitlesOfParts><LinksUpToDate>false</LinksUpToDate>'
+            '<SharedDoc>false</SharedDoc><HyperlinksChanged>false</HyperlinksChanged>'
+            '<AppVersion>16.0300</AppVersion></Properties>',
+        'docProps/core.xml':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><dc:creator>Tender Desk</dc:creator>'
+            '<dcterms:created xsi:type="dcterms:W3CDTF">2025-01-06T02:11:09Z</dcterms:created>'
+            '</cp:coreProperties>',
+        'xl/workbook.xml':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            f'<{p}workbook {main} xmlns:r="{REL}"{workbook_ns}>'
+            f'<{p}fileVersion appName="xl" lastEdited="7" lowestEdited="7" rupBuild="27328"/>'
+            f'<{p}workbookPr defaultThemeVersion="166925"/>{revision}'
+            f'<{p}bookViews><{p}workbookView xWindow="-120" yWindow="-120" windowWidth="29040" '
+            f'windowHeight="15840" activeTab="1"/></{p}bookViews><{p}sheets>'
+            f'<{p}sheet name="Master" sheetId="1" r:id="rId1"/>'
+            f'<{p}sheet name="{DAILY_SHEET}" sheetId="2" r:id="rId2"/></{p}sheets>'
+            f'<{p}definedNames><{p}definedName name="Tenders">Master!$A$1:$L$3</{p}definedName></{p}definedNames>'
+            f'<{p}calcPr calcId="191029"/></{p}workbook>',
+        'xl/_rels/workbook.xml.rels':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId3" Type="{REL}/styles" Target="styles.xml"/>'
+            f'<Relationship Id="rId2" Type="{REL}/worksheet" Target="worksheets/sheet2.xml"/>'
+            f'<Relationship Id="rId1" Type="{REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId4" Type="{REL}/sharedStrings" Target="sharedStrings.xml"/></Relationships>',
+        'xl/styles.xml':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            f'<{p}styleSheet {main}'
+            + ('' if prefix else
+               f' xmlns:mc="{MC}" mc:Ignorable="x14ac x16r2"'
+               ' xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac"'
+               ' xmlns:x16r2="http://schemas.microsoft.com/office/spreadsheetml/2015/02/main"')
+            + f'><{p}fonts count="1"' + ('' if prefix else ' x14ac:knownFonts="1"')
+            + f'><{p}font><{p}sz val="11"/><{p}color theme="1"/><{p}name val="Calibri"/><{p}family val="2"/>'
+            f'<{p}scheme val="minor"/></{p}font></{p}fonts><{p}fills count="2"><{p}fill><{p}patternFill '
+            f'patternType="none"/></{p}fill><{p}fill><{p}patternFill patternType="gray125"/></{p}fill></{p}fills>'
+            f'<{p}borders count="1"><{p}border><{p}left/><{p}right/><{p}top/><{p}bottom/><{p}diagonal/>'
+            f'</{p}border></{p}borders><{p}cellStyleXfs count="1"><{p}xf numFmtId="0" fontId="0" fillId="0" '
+            f'borderId="0"/></{p}cellStyleXfs><{p}cellXfs count="2"><{p}xf numFmtId="0" fontId="0" fillId="0" '
+            f'borderId="0" xfId="0"/><{p}xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" '
+            f'applyNumberFormat="1"/></{p}cellXfs><{p}cellStyles count="1"><{p}cellStyle name="Normal" xfId="0" '
+            f'builtinId="0"/></{p}cellStyles><{p}dxfs count="0"/><{p}tableStyles count="0" '
+            f'defaultTableStyle="TableStyleMedium2" defaultPivotStyle="PivotStyleLight16"/></{p}styleSheet>',
+        'xl/sharedStrings.xml':
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            f'<{p}sst {main} count="{len(strings)}" uniqueCount="{len(strings)}">'
+            + ''.join(f'<{p}si><{p}t>{s}</{p}t></{p}si>' for s in strings) + f'</{p}sst>',
+        'xl/worksheets/sheet1.xml': sheet(
+            header_row() + tender_row(2, 1, 'ITQ-OLD-1', 'Old tender one', 'https://example.org/old-1'), 2),
+        'xl/worksheets/sheet2.xml': sheet(
+            header_row() + tender_row(2, 1, 'ITQ-OLD-2', 'Old tender two', 'https://example.org/old-2'), 2),
+    }
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+    return path
+
+
+def tender(ref, published='2025-10-01'):
+    return {'No.': 0, 'Published Date': published, 'Closing Date': '2025-10-20', 'Closing Time': '16:00',
+            'Date Detected': '2025-10-01', 'ITQ/ITT': ref, 'Calling Entity': 'New agency',
+            'Description': f'Tender {ref}', 'Link': f'https://example.org/{ref}',
+            'Main Header': 'GEBIZ - Services', 'Sub Header': 'Others', 'Sourcing Doc No.': ''}
+
+
+def sheet_rows(path, name):
+    wb = load_workbook(path)
+    try:
+        return [list(row) for row in wb[name].iter_rows(values_only=True)], wb.sheetnames
+    finally:
+        wb.close()
+
+
+@pytest.fixture(params=['', 'x'], ids=['excel', 'prefixed'])
+def workbook(request, tmp_path):
+    return excel_package(tmp_path / 'Tender Comb.xlsx', prefix=request.param)
+
+
+def test_extend_existing_daily_sheet(workbook):
+    added = append_incremental([tender('ITQ-OLD-2'), tender('ITQ-NEW-1')], workbook, sheet_name=DAILY_SHEET)
+    assert added == 1
+
+    rows, sheetnames = sheet_rows(workbook, DAILY_SHEET)
+    assert sheetnames == ['Master', DAILY_SHEET]
+    assert rows[0] == COLUMNS
+    assert rows[1][5] == 'ITQ-OLD-2' and rows[1][1] == datetime(2025, 10, 1)
+    assert rows[2][:2] == [2, datetime(2025, 10, 1)]
+    assert rows[2][5:8] == ['ITQ-NEW-1', 'New agency', 'Tender ITQ-NEW-1']
+    master, _ = sheet_rows(workbook, 'Master')
+    assert [row[5] for row in master] == ['ITQ/ITT', 'ITQ-OLD-1']
+
+    wb = load_workbook(workbook)
+    assert wb[DAILY_SHEET]['B3'].number_format == 'dd/mm/yyyy'
+    assert wb[DAILY_SHEET].dimensions == 'A1:L3'
+
+
+def test_new_sheet_registered_everywhere(workbook):
+    assert append_incremental([tender('ITQ-NEW-1'), tender('ITQ-NEW-2')], workbook, sheet_name='GeBIZ_02_10_2025') == 2
+
+    rows, sheetnames = sheet_rows(workbook, 'GeBIZ_02_10_2025')
+    assert sheetnames == ['Master', DAILY_SHEET, 'GeBIZ_02_10_2025']
+    assert [row[5] for row in rows] == ['ITQ/ITT', 'ITQ-NEW-1', 'ITQ-NEW-2']
+    assert load_workbook(workbook)['GeBIZ_02_10_2025']['A1'].font.b
+
+    with zipfile.ZipFile(workbook) as z:
+        app = ET.fromstring(z.read('docProps/app.xml'))
+        workbook_xml = z.read('xl/workbook.xml').decode('utf-8')
+    ns = {'p': APP_PROPS_NS, 'vt': VT_NS}
+    titles = [t.text for t in app.iterfind('p:TitlesOfParts/vt:vector/vt:lpstr', ns)]
+    assert titles == ['Master', DAILY_SHEET, 'GeBIZ_02_10_2025', 'Tenders']
+    assert app.find('p:TitlesOfParts/vt:vector', ns).get('size') == '4'
+    assert [c.text for c in app.iterfind('p:HeadingPairs/vt:vector/vt:variant/vt:i4', ns)] == ['3', '1']
+    # Extension namespaces Excel lists in mc:Ignorable must still be declared
+    for declaration in ('xmlns:x15=', 'xmlns:xr6=', 'xmlns:xr10=', 'xmlns:xr2='):
+        assert declaration in workbook_xml or 'xmlns:x=' in workbook_xml
+
+
+def test_repeated_appends_reuse_styles_and_keys(workbook):
+    append_incremental([tender('ITQ-NEW-1')], workbook, sheet_name='GeBIZ_02_10_2025')
+    with zipfile.ZipFile(workbook) as z:
+        styles = z.read('xl/styles.xml')
+    assert append_incremental([tender('ITQ-NEW-1')], workbook, sheet_name='GeBIZ_02_10_2025') == 0
+    assert append_incremental([tender('ITQ-NEW-2')], workbook, sheet_name='GeBIZ_02_10_2025') == 1
+    with zipfile.ZipFile(workbook) as z:
+        assert z.read('xl/styles.xml') == styles
+
+    rows, _ = sheet_rows(workbook, 'GeBIZ_02_10_2025')
+    assert [row[:1] + row[5:6] for row in rows[1:]] == [[1, 'ITQ-NEW-1'], [2, 'ITQ-NEW-2']]
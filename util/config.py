@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+from util.log import get_logger
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Hot-reloaded config files
+# ---------------------------------------------------------------------------
+# A ConfigFile parses its YAML once into a compiled value (e.g. the feed
+# catalogue) and hands out that value on every get(). At most every
+# CONFIG_CHECK_SECONDS a get() stats the file; when mtime or size changed it
+# parses and compiles the new version and swaps it in with one assignment.
+# Readers always see either the old or the new value, never a half-built
+# one, and a file that fails to parse (or goes missing) keeps the last good
+# value:
+#
+#     FEEDS = ConfigFile('config/feeds.yaml', FeedCatalogue.from_config)
+#     FEEDS.get().lookup(url)
+#
+# Edits are picked up by every worker without a restart. Relative paths are
+# resolved against the project root, not the current directory.
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_CHECK_SECONDS = float(os.environ.get('CONFIG_CHECK_SECONDS', 2))
+
+
+class ConfigFile:
+    """A YAML file compiled by compile(data), recompiled when the file changes"""
+
+    def __init__(self, path, compile, check_interval=None):
+        self.path = PROJECT_ROOT / path   # an absolute path stays as it is
+        self.compile = compile
+        self.check_interval = CONFIG_CHECK_SECONDS if check_interval is None else check_interval
+        self.version = 0          # incremented on every (re)load
+        self._value = None
+        self._stamp = None        # (mtime_ns, size) of the loaded file, 'missing' if absent
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The compiled config (reloaded first if the file changed since the last check)"""
+        value = self._value
+        if value is None or time.monotonic() >= self._next_check:
+            self.refresh()   # first call waits here while another thread does the initial load
+            value = self._value
+        return value
+
+    def refresh(self, force=False):
+        """Check the file now; reload if it changed (or if force). Returns True if reloaded."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            stamp = self._file_stamp()
+            if not force and self._value is not None and stamp == self._stamp:
+                return False
+            if stamp == 'missing' and self._value is not None:
+                # Deleted or mid-replace: keep serving the last good version
+                if self._stamp != 'missing':
+                    log.warning("⚠ %s disappeared, keeping the previous version", self.path)
+                self._stamp = stamp
+                return False
+            try:
+                data = yaml.safe_load(self.path.read_text(encoding='utf-8')) if stamp != 'missing' else None
+                value = self.compile(data or {})
+            except Exception as e:
+                if self._value is not None:
+                    log.warning("⚠ %s not reloaded, keeping the previous version: %s", self.path, e)
+                    self._stamp = stamp   # don't retry until the file changes again
+                    return False
+                log.warning("⚠ %s could not be loaded: %s", self.path, e)
+                value = self.compile({})
+            if stamp == 'missing':
+                log.warning("%s not found!", self.path)
+            elif self._value is not None:
+                log.info("🔄 Reloaded %s", self.path)
+            self._value = value
+            self._stamp = stamp
+            self.version += 1
+            return True
+
+    def _file_stamp(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return 'missing'
+        return (st.st_mtime_ns, st.st_size)
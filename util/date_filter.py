@@ -1,172 +1,184 @@
-from datetime import datetime, timedelta
-from dateutil import parser
-import pytz
+from bisect import bisect_left, bisect_right
+import numpy as np
+import pandas as pd
+
+from processor.tender import Tender
+from util import dates
+from util.date_window import DateWindow
+from util.log import get_logger
+from util.timing import timed
+
+log = get_logger(__name__)
+
+DATE_FIELDS = ['Published Date', 'Closing Date (fallback)', 'Awarded Date']
 
 def parse_date(date_str):
-    try:
-        # Detect ISO format (YYYY-MM-DD) vs DD/MM/YYYY
-        # If it starts with YYYY (4 digits), assume ISO/Year-First
-        if date_str and len(date_str) >= 4 and date_str[0:4].isdigit() and date_str[4] == '-':
-             return parser.parse(date_str, dayfirst=False)
-        return parser.parse(date_str, dayfirst=True)
-    except:
-        return None
-
-def filter_by_date(items, mode='today', start_date=None, end_date=None, include_items_without_dates=False):
+    # ISO (YYYY-MM-DD) is read year-first, everything else DD/MM/YYYY.
+    # Memoized and tz-aware (Asia/Singapore), see util.dates
+    return dates.parse_date(date_str)
+
+def _date_frame(items):
+    """
+    One row per item: the date field used for filtering and its parsed value.
+
+    The Awarded -> Published -> Closing fallback is applied with masks over
+    the three raw date columns. Normalized Tender records carry their dates
+    pre-parsed; for other items every distinct raw string is parsed once.
+
+    Returns:
+        DataFrame: 'field' (label or '') and 'dt' (UTC datetime64, NaT if none or out of range)
+    """
+    rows = []
+    for item in items:
+        if isinstance(item, Tender):
+            rows.append((True, item.awarded_date, item.published_date, item.closing_date,
+                         item.awarded_dt, item.published_dt, item.closing_dt))
+        else:
+            # Try Title Case (Normalized) then snake_case (Raw)
+            rows.append((False,
+                         item.get('Awarded Date') or item.get('awarded_date') or item.get('awarded_date_str'),
+                         item.get('Published Date') or item.get('published') or item.get('pub_date'),
+                         item.get('Closing Date') or item.get('closing_date') or item.get('close_date'),
+                         None, None, None))
+    frame = pd.DataFrame(rows, dtype=object, columns=[
+        'tender', 'awarded', 'published', 'closing', 'awarded_dt', 'published_dt', 'closing_dt'])
+
+    def has_value(col):
+        return frame[col].map(lambda v: bool(v) and bool(str(v).strip())).astype(bool)
+
+    # 1. Awarded Date (usually implies Award Search), 2. Published Date (most
+    # accurate), 3. Closing Date as proxy (items must be published before closing).
+    # Date Detected is not used (that's when WE detected it, not when it was published)
+    use_awarded = has_value('awarded')
+    use_published = ~use_awarded & has_value('published')
+    use_closing = ~use_awarded & ~use_published & has_value('closing')
+    field = pd.Series('', index=frame.index, dtype=object)
+    field[use_awarded] = 'Awarded Date'
+    field[use_published] = 'Published Date'
+    field[use_closing] = 'Closing Date (fallback)'
+
+    raw = frame['closing'].where(use_closing, None)
+    raw = frame['published'].where(use_published, raw)
+    raw = frame['awarded'].where(use_awarded, raw)
+    dt = frame['closing_dt'].where(use_closing, None)
+    dt = frame['published_dt'].where(use_published, dt)
+    dt = frame['awarded_dt'].where(use_awarded, dt)
+
+    # Plain dict items: parse each distinct string once
+    to_parse = (field != '') & ~frame['tender'].astype(bool)
+    if to_parse.any():
+        raw_str = raw[to_parse].map(str)
+        parsed = {value: parse_date(value) for value in pd.unique(raw_str)}
+        dt[to_parse] = raw_str.map(parsed)
+
+    # Dates pandas can't hold (e.g. a typo'd year 2300) become NaT: the item counts as undated
+    return pd.DataFrame({
+        'field': field,
+        'dt': pd.to_datetime(dt, utc=True, errors='coerce'),
+    })
+
+class DateIndex:
+    """
+    Items kept sorted by their effective filter date (see _date_frame), so
+    the same set can be filtered repeatedly with a bisect range lookup
+    instead of a rescan, e.g. narrowing cached fetch results from
+    last_7_days to last_working_day.
+
+    Pass it to filter_by_date() in place of the item list.
+    """
+    def __init__(self, items):
+        self.items = list(items)
+        frame = _date_frame(self.items)
+        dated = frame['dt'].notna()
+        by_date = frame.loc[dated, 'dt'].sort_values(kind='stable')
+        self._keys = by_date.astype('int64').tolist()  # ns since epoch (UTC)
+        self._positions = by_date.index.to_numpy()
+        self.undated = np.flatnonzero(~dated.to_numpy())
+        field_counts = frame.loc[frame['field'] != '', 'field'].value_counts()
+        self.field_counts = {k: int(field_counts[k]) for k in DATE_FIELDS if k in field_counts}
+
+    def __len__(self):
+        return len(self.items)
+
+    def positions(self, lower=None, upper=None):
+        """Positions (into self.items, date order) of items dated within [lower, upper]"""
+        lo = bisect_left(self._keys, pd.Timestamp(lower).value) if lower is not None else 0
+        hi = bisect_right(self._keys, pd.Timestamp(upper).value) if upper is not None else len(self._keys)
+        return self._positions[lo:hi]
+
+    def between(self, lower=None, upper=None):
+        """Items dated within [lower, upper], oldest first"""
+        return [self.items[pos] for pos in self.positions(lower, upper)]
+
+@timed('filter_by_date')
+def filter_by_date(items, mode='today', start_date=None, end_date=None, include_items_without_dates=False,
+                   window=None):
     """
     Filter items based on date range.
     
     Args:
-        items: list of dicts with date fields
+        items: list of dicts with date fields, or a DateIndex over them
         mode: 'today', 'yesterday', 'last_3_days', 'last_7_days', 'last_24_hours', 'this_week', 'custom', 'specific_date'
         start_date: string 'YYYY-MM-DD' for custom mode
         end_date: string 'YYYY-MM-DD' for custom mode  
         include_items_without_dates: If True, include items without valid dates. Default False (exclude them).
+        window: DateWindow resolved by the caller (overrides mode/start_date/end_date)
     
     Returns:
-        list: Filtered items
+        list: Filtered items (in their original order)
+
+    Bounds are computed once and the Awarded -> Published -> Closing fallback
+    is applied as boolean masks over a datetime column. With a DateIndex the
+    window is a bisect range lookup instead.
     """
     if not items:
         return []
-        
-    sg_tz = pytz.timezone('Asia/Singapore')
-    now = datetime.now(sg_tz)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    cutoff = None
-    end_cutoff = None
-    
-    if mode == 'today':
-        # User implies 'Last 24 Hours' by the label 'Last 24 Hours (Today)'
-        # So we use rolling 24h logic
-        cutoff = now - timedelta(hours=24)
-    elif mode == 'yesterday':
-        cutoff = today_start - timedelta(days=1)
-        end_cutoff = today_start - timedelta(seconds=1)
-    elif mode == 'last_3_days':
-        # User requested: start 1 day earlier for ranges
-        # Originally 2 days back, now 3
-        cutoff = today_start - timedelta(days=3)
-    elif mode == 'last_7_days':
-        # Originally 6, now 7
-        cutoff = today_start - timedelta(days=7)
-    elif mode == 'last_14_days':
-        # Originally 13, now 14
-        cutoff = today_start - timedelta(days=14)
-    elif mode == 'last_31_days':
-        # Originally 30, now 31
-        cutoff = today_start - timedelta(days=31)
-    elif mode == 'last_90_days':
-        # Originally 89, now 90
-        cutoff = today_start - timedelta(days=90)
-    elif mode == 'last_365_days':
-        # Originally 364, now 365
-        cutoff = today_start - timedelta(days=365)
-    elif mode == 'last_24_hours':
-        # Strictly 24 hours back
-        cutoff = now - timedelta(hours=24)
-    elif mode == 'this_week':
-        cutoff = today_start - timedelta(days=today_start.weekday())
-    
-    filtered = []
-    items_without_dates = 0
-    date_field_stats = {'Published Date': 0, 'Closing Date (fallback)': 0, 'Awarded Date': 0}
-    
-    for item in items:
-        # For filtering by publication date:
-        # 1. Try Published Date first (most accurate)
-        # 2. If empty, use Closing Date as proxy (items must be published before closing)
-        # 3. Don't use Date Detected (that's when WE detected it, not when it was published)
-        
-        pub_str = None
-        used_field = None
-        
-        # Check Awarded Date first (if present, usually implies Award Search)
-        awarded_date = item.get('Awarded Date') or item.get('awarded_date') or item.get('awarded_date_str')
-        if awarded_date and str(awarded_date).strip():
-             pub_str = awarded_date
-             used_field = 'Awarded Date'
-        else:
-             # Check Published Date
-             # Try Title Case (Normalized) then snake_case (Raw)
-             published_date = item.get('Published Date') or item.get('published') or item.get('pub_date')
-             if published_date and str(published_date).strip():  # Check for non-empty string
-                 pub_str = published_date
-                 used_field = 'Published Date'
-             else:
-                 # Fall back to Closing Date as a proxy
-                 # Try Title Case (Normalized) then snake_case (Raw)
-                 closing_date = item.get('Closing Date') or item.get('closing_date') or item.get('close_date')
-                 if closing_date and str(closing_date).strip():
-                     pub_str = closing_date
-                     used_field = 'Closing Date (fallback)'
-        
-        # Handle items without any valid date fields
-        if not pub_str:
-            items_without_dates += 1
-            if include_items_without_dates:
-                filtered.append(item)
-            continue
-        
-        # Track which field was used
-        if used_field:
-            date_field_stats[used_field] += 1
-            
-        # Try to parse the date
-        pub_dt = parse_date(str(pub_str))
-        if not pub_dt:
-            items_without_dates += 1
-            if include_items_without_dates:
-                filtered.append(item)
-            continue
-            
-        # Ensure timezone awareness
-        if pub_dt.tzinfo is None:
-            pub_dt = sg_tz.localize(pub_dt)
-        else:
-            pub_dt = pub_dt.astimezone(sg_tz)
-
-        # Custom date range filtering
-        if mode in ['custom', 'specific_date'] and start_date:
-            try:
-                # Start of start_date (00:00:00)
-                s_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                s_dt = sg_tz.localize(s_dt.replace(hour=0, minute=0, second=0, microsecond=0))
-                
-                if pub_dt < s_dt:
-                    continue
-                
-                # End of end_date (23:59:59)
-                if end_date:
-                    e_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                    e_dt = sg_tz.localize(e_dt.replace(hour=23, minute=59, second=59, microsecond=999999))
-                    
-                    if pub_dt > e_dt:
-                        continue
-                        
-            except ValueError as e:
-                print(f"⚠ Invalid date format: {e}")
-                continue
-        
-        # Preset mode filtering
-        elif cutoff:
-            if pub_dt < cutoff:
-                continue
-            if end_cutoff and pub_dt > end_cutoff:
-                continue
-                 
-        filtered.append(item)
+
+    if window is None:
+        # Explicit dates only apply to the custom modes here
+        if mode not in ['custom', 'specific_date']:
+            start_date = end_date = None
+        window = DateWindow.resolve(mode, start_date, end_date)
+    cutoff, end_cutoff = window.bounds()
+    range_error = window.error
+
+    if isinstance(items, DateIndex):
+        index = items
+        kept = index.positions(cutoff, end_cutoff) if range_error is None else index.undated[:0]
+        no_date = index.undated
+        if include_items_without_dates:
+            kept = np.concatenate([kept, no_date])
+        filtered = [index.items[pos] for pos in np.sort(kept)]
+        items_without_dates = len(no_date)
+        used_fields = index.field_counts
+    else:
+        frame = _date_frame(items)
+        has_date = frame['dt'].notna()
+
+        # Items with a date: keep if inside [cutoff, end_cutoff]
+        in_range = has_date & (range_error is None)
+        if cutoff is not None:
+            in_range &= frame['dt'] >= cutoff
+        if end_cutoff is not None:
+            in_range &= frame['dt'] <= end_cutoff
+
+        # Items without any (parseable) date
+        keep = in_range | (~has_date & include_items_without_dates)
+        filtered = [item for item, k in zip(items, keep.tolist()) if k]
+        items_without_dates = int((~has_date).sum())
+        field_counts = frame.loc[frame['field'] != '', 'field'].value_counts()
+        used_fields = {k: int(field_counts[k]) for k in DATE_FIELDS if k in field_counts}
     
     # Log summary
     if items_without_dates > 0:
         action = "included" if include_items_without_dates else "excluded"
-        print(f"📊 Date Filter: {items_without_dates} items without valid dates were {action}")
+        log.info("📊 Date Filter: %d items without valid dates were %s", items_without_dates, action)
     
-    print(f"📊 Date Filter Results: {len(filtered)}/{len(items)} items passed the filter")
+    log.info("📊 Date Filter Results: %d/%d items passed the filter", len(filtered), len(items),
+             extra={'passed': len(filtered), 'items': len(items)})
     
     # Show which date fields were used
-    used_fields = {k: v for k, v in date_field_stats.items() if v > 0}
     if used_fields:
-        print(f"📊 Date Fields Used: {used_fields}")
+        log.info("📊 Date Fields Used: %s", used_fields)
         
     return filtered
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+import pandas as pd
+
+from util.dates import SG_TZ
+from util.log import get_logger
+
+log = get_logger(__name__)
+
+# Preset modes -> days back from the start of today (Asia/Singapore).
+# Ranges start one day earlier than their label (user request), e.g. 7 for last_7_days
+PRESET_DAYS = {
+    'last_3_days': 3,
+    'last_7_days': 7,
+    'last_14_days': 14,
+    'last_31_days': 31,
+    'last_90_days': 90,
+    'last_365_days': 365,
+}
+
+
+class DateWindow:
+    """
+    The date range of one fetch, resolved once and shared by every stage.
+
+    app_enhanced.fetch resolves it from the form, passes it to the collectors
+    (portal searches use start/end) and to filter_by_date, so the RSS client,
+    the GeBIZ/Sesami/JPMC/ST Logistics/TenderBoard searches and the
+    post-filter all agree on the same bounds.
+
+    Attributes:
+        mode: filter mode after resolution ('custom' when explicit dates are given)
+        start: tz-aware lower bound (Asia/Singapore) or None for open
+        end: tz-aware upper bound or None for open
+        error: ValueError from an invalid custom date (window matches nothing)
+    """
+    def __init__(self, mode, start=None, end=None, error=None):
+        self.mode = mode
+        self.start = start
+        self.end = end
+        self.error = error
+
+    def __repr__(self):
+        return f"DateWindow({self.mode!r}, {self.start}, {self.end})"
+
+    @classmethod
+    def resolve(cls, mode='today', start_date=None, end_date=None, now=None):
+        """
+        Build the window for a date mode and optional 'YYYY-MM-DD' dates.
+
+        Explicit dates win over the preset (custom range from 00:00 of
+        start_date to 23:59:59 of end_date, open-ended without end_date).
+        """
+        now = now or datetime.now(SG_TZ)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if mode == 'specific_date' and start_date:
+            end_date = start_date
+        if start_date:
+            try:
+                s_dt = datetime.strptime(start_date, '%Y-%m-%d')
+                start = SG_TZ.localize(s_dt)
+                end = None
+                if end_date:
+                    e_dt = datetime.strptime(end_date, '%Y-%m-%d')
+                    end = SG_TZ.localize(e_dt.replace(hour=23, minute=59, second=59, microsecond=999999))
+            except ValueError as e:
+                log.warning("⚠ Invalid date format: %s", e)
+                return cls('custom', error=e)
+            return cls('custom', start, end)
+
+        if mode in ('today', 'last_24_hours'):
+            # 'Last 24 Hours (Today)' is a rolling 24h window
+            return cls(mode, now - timedelta(hours=24))
+        if mode == 'yesterday':
+            return cls(mode, today_start - timedelta(days=1), today_start - timedelta(seconds=1))
+        if mode == 'last_working_day':
+            # Monday -> Friday, Sunday -> Friday, otherwise yesterday; until now (inclusive)
+            days_back = {0: 3, 6: 2}.get(today_start.weekday(), 1)
+            return cls(mode, today_start - timedelta(days=days_back), now)
+        if mode == 'this_week':
+            return cls(mode, today_start - timedelta(days=today_start.weekday()))
+        if mode in PRESET_DAYS:
+            return cls(mode, today_start - timedelta(days=PRESET_DAYS[mode]))
+        # 'all' / unknown modes: no bounds
+        return cls(mode)
+
+    def contains(self, dt):
+        """True if a tz-aware datetime falls inside the window"""
+        if dt is None or self.error is not None:
+            return False
+        if self.start and dt < self.start:
+            return False
+        if self.end and dt > self.end:
+            return False
+        return True
+
+    def covers(self, other):
+        """True if another window lies inside this one (an open end here covers any end)"""
+        if other.error is not None:
+            return True   # matches nothing
+        if self.start and (other.start is None or other.start < self.start):
+            return False
+        if self.end and (other.end is None or other.end > self.end):
+            return False
+        return True
+
+    def bounds(self):
+        """(start, end) as pandas Timestamps (None for open sides)"""
+        return (pd.Timestamp(self.start) if self.start else None,
+                pd.Timestamp(self.end) if self.end else None)
+
+    def naive_start(self, default=None):
+        """Start as naive SG datetime for the portal clients (default: now)"""
+        if self.start is None:
+            return default or datetime.now()
+        return self.start.replace(tzinfo=None)
+
+    def naive_end(self, default=None):
+        """End as naive SG datetime for the portal clients (default: now)"""
+        if self.end is None:
+            return default or datetime.now()
+        return self.end.replace(tzinfo=None)
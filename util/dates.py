@@ -0,0 +1,137 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from dateutil import parser
+import pandas as pd
+import pytz
+
+SG_TZ = pytz.timezone('Asia/Singapore')
+
+# Known portal layouts, tried with strptime before falling back to dateutil
+# (e.g. GeBIZ "09 Jan 2026", ST Logistics "2026-01-09 17:00:00", "31/12/2025 17:00")
+YEAR_FIRST_FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+]
+DAY_FIRST_FORMATS = [
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y %H:%M:%S',
+]
+MONTH_NAME_FORMATS = [
+    '%d %b %Y',
+    '%d %b %Y %H:%M',
+    '%d %b %Y %I:%M%p',
+    '%d %b %Y %I:%M %p',
+]
+RFC822_FORMAT = '%a, %d %b %Y %H:%M:%S %z'
+
+YEAR_FIRST_RE = re.compile(r'^\d{4}-')
+
+# Distinct date strings per run are few compared to the number of lookups
+PARSE_CACHE_SIZE = 16384
+
+
+def is_year_first(date_str):
+    """True for YYYY-MM-DD... strings (ISO / year-first)"""
+    return bool(YEAR_FIRST_RE.match(date_str))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(date_str, dayfirst, fuzzy):
+    """Parse one stripped string; returns a datetime (naive or aware) or None"""
+    if is_year_first(date_str):
+        formats = YEAR_FIRST_FORMATS
+        dayfirst = False
+    elif dayfirst:
+        formats = DAY_FIRST_FORMATS + MONTH_NAME_FORMATS
+    else:
+        formats = MONTH_NAME_FORMATS
+
+    # Fast path: strptime with the known layouts
+    if date_str[:1].isdigit():
+        for fmt in formats:
+            try:
+                return datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
+    elif ',' in date_str:
+        try:
+            return datetime.strptime(date_str, RFC822_FORMAT)
+        except ValueError:
+            pass
+
+    try:
+        return parser.parse(date_str, dayfirst=dayfirst, fuzzy=fuzzy)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def parse_date(date_str, dayfirst=True, fuzzy=False, wall_time=False):
+    """
+    Parse a date string into a timezone-aware Singapore datetime.
+
+    Year-first strings (YYYY-MM-DD...) are always parsed year-first, so ISO
+    dates are never day/month swapped. Results are memoized per string.
+
+    Args:
+        date_str: date string (anything else is converted with str())
+        dayfirst: Read ambiguous dates like 01/02/2026 as DD/MM/YYYY
+        fuzzy: Let dateutil skip unknown tokens in the fallback parse
+        wall_time: Keep the written clock time of offset-aware strings and
+            just attach Singapore time (e.g. Ariba's "12:00 GMT+08:00", which
+            dateutil reads with the sign inverted)
+
+    Returns:
+        datetime: tz-aware datetime in Asia/Singapore, or None if unparseable
+    """
+    if date_str is None:
+        return None
+    date_str = str(date_str).strip()
+    if not date_str:
+        return None
+
+    dt = _parse_cached(date_str, bool(dayfirst), bool(fuzzy))
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return SG_TZ.localize(dt)
+    if wall_time:
+        return SG_TZ.localize(dt.replace(tzinfo=None))
+    return dt.astimezone(SG_TZ)
+
+
+def parse_dates_bulk(values, fuzzy=False, wall_time=False):
+    """
+    Parse a column of date strings, each distinct value once.
+
+    Args:
+        values: pandas Series of strings ('' for missing)
+        fuzzy: Pass fuzzy=True to dateutil for the fallback values
+        wall_time: See parse_date()
+
+    Returns:
+        dict: {raw string: tz-aware Singapore datetime, or None if unparseable}
+    """
+    return {
+        raw: parse_date(raw, fuzzy=fuzzy, wall_time=wall_time)
+        for raw in pd.unique(values[values != ''])
+    }
+
+
+def format_dates(values, parsed, fmt='%Y-%m-%d', keep_unparsed=True):
+    """
+    Map raw date strings to formatted strings using a parse_dates_bulk() result.
+
+    Unparseable values are kept as-is (keep_unparsed) or blanked.
+    """
+    lookup = {}
+    for raw, dt in parsed.items():
+        if dt is not None:
+            lookup[raw] = dt.strftime(fmt)
+        elif keep_unparsed:
+            lookup[raw] = raw
+    out = values.map(lookup)
+    return out.where(out.notna(), '' if not keep_unparsed else values).fillna('')
@@ -4,6 +4,8 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
+from util.metrics import BROWSER_LAUNCHES
+
 def get_chrome_driver(headless=True):
     """
     Returns a configured Chrome WebDriver instance.
@@ -38,10 +40,13 @@ def get_chrome_driver(headless=True):
     
     try:
         if service:
-            return webdriver.Chrome(service=service, options=options)
+            driver = webdriver.Chrome(service=service, options=options)
         else:
-            return webdriver.Chrome(options=options)
+            driver = webdriver.Chrome(options=options)
+        BROWSER_LAUNCHES.inc(status='ok')
+        return driver
     except Exception as e:
+        BROWSER_LAUNCHES.inc(status='error')
         print(f"Error initializing Chrome Driver in util/driver_setup: {e}")
         # Fallback: Try without service if specific path failed? 
         # Or usually it implies path is wrong. Rethrow.
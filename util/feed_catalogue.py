@@ -0,0 +1,103 @@
+from collections import namedtuple
+from urllib.parse import unquote
+
+from util.config import ConfigFile
+
+# ---------------------------------------------------------------------------
+# Feed catalogue
+# ---------------------------------------------------------------------------
+# config/feeds.yaml indexed once per version, for rss_client (feed list), normalize
+# (URL -> category columns) and gebiz_helper (URLs -> Selenium search
+# categories):
+#
+#     entry = catalogue().lookup(url)      # by URL, or by file name
+#     entry.main, entry.sub                # '2. Services', 'a. Advertising Services'
+#     entry.category                       # 'Services > Advertising Services'
+#
+# Every lookup is a dict access, however many feeds are selected. The
+# catalogue is rebuilt when feeds.yaml changes (util/config.py), so don't
+# keep a reference to it across requests: call catalogue() again.
+
+FeedEntry = namedtuple('FeedEntry', 'url type main sub category name')
+
+
+def clean_key(key):
+    """Strip the list numbering of a feeds.yaml key ('9. Dental...' -> 'Dental...', 'a. Others' -> 'Others')"""
+    return key.split('. ', 1)[1] if '. ' in key else key
+
+
+def feed_name(url):
+    """Feed URL -> file name (last path part, unquoted, without query)"""
+    return unquote(url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1])
+
+
+class FeedCatalogue:
+    """Lookups over the configured feeds: URL, file name and category -> FeedEntry"""
+
+    def __init__(self, feeds):
+        self.feeds = feeds or {}   # the 'feeds' section as configured (the index page renders it)
+        self.entries = []
+        self.by_url = {}
+        self.by_name = {}
+        self.by_category = {}   # 'Main > Sub' -> [FeedEntry]
+        for main, subs in self.feeds.items():
+            if not isinstance(subs, dict):
+                continue
+            for sub, types in subs.items():
+                category = f"{clean_key(main)} > {clean_key(sub)}"
+                for feed_type, url in (types or {}).items():
+                    entry = FeedEntry(url, feed_type.upper(), main, sub, category, feed_name(url))
+                    self.entries.append(entry)
+                    self.by_url[url] = entry
+                    self.by_name.setdefault(entry.name, entry)
+                    self.by_category.setdefault(category, []).append(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, url):
+        """
+        FeedEntry of a configured feed, or None.
+
+        Matches the exact URL first, then the file name, so a bare name
+        ('OthersOthers-CREATE_BO_FEED.xml') or the same feed on another base
+        URL (util/portals.py) is found too.
+        """
+        if not url:
+            return None
+        return self.by_url.get(url) or self.by_name.get(feed_name(url))
+
+    def urls(self, feed_type=None):
+        """Configured feed URLs in file order, optionally only 'BO' or 'AWD'"""
+        return [e.url for e in self.entries if feed_type is None or e.type == feed_type]
+
+    def categorize(self, urls):
+        """
+        Search categories of selected feeds, grouped by type.
+
+        Returns:
+            dict: {'BO': ['Services > Advertising Services', ...], 'AWD': [...]} (first-selected order)
+        """
+        found = {'BO': {}, 'AWD': {}}
+        for url in urls:
+            entry = self.lookup(url)
+            if entry is not None:
+                found.setdefault(entry.type, {})[entry.category] = None   # dict as an ordered set
+        return {feed_type: list(cats) for feed_type, cats in found.items()}
+
+    @classmethod
+    def from_config(cls, data):
+        return cls(data.get('feeds'))
+
+
+FEEDS = ConfigFile('config/feeds.yaml', FeedCatalogue.from_config)
+
+
+def catalogue():
+    """The FeedCatalogue of config/feeds.yaml (current version)"""
+    return FEEDS.get()
+
+
+def load_feeds_config():
+    """Load RSS feed configuration from YAML file (the 'feeds' section, current version)"""
+    return FEEDS.get().feeds
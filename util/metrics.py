@@ -0,0 +1,278 @@
+import math
+import os
+import threading
+
+from util.log import get_logger
+from util.timing import SPAN_OBSERVERS
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Prometheus-style metrics
+# ---------------------------------------------------------------------------
+# Counters, gauges and histograms kept in this process and rendered in the
+# Prometheus text format by /metrics. Most values come from the timing spans
+# (util/timing.py) through observe_span(), so collectors and exporters need
+# no metrics code of their own:
+#
+#     collect.<source>      -> collector latency, items, items/sec
+#                              (cache hits only count as hits, see source_cache.py)
+#     <source>.page         -> pages scraped, page latency
+#     <source>.chrome_start -> browser start latency
+#     rss.feed              -> per-feed latency
+#     export.<format>       -> export latency and rows
+#
+# HTTP status codes, retries and bytes of the RSS client and browser launches
+# are counted where they happen. Every Selenium collector opens
+# <source>.chrome_start and one <source>.page span per results page.
+#
+# The registry is per process: under gunicorn /metrics shows only the
+# counts of the worker that answers the scrape, not totals across workers.
+# Run a single worker (WEB_CONCURRENCY=1) when exact totals matter.
+
+DEFAULT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+PAGE_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60)
+
+REGISTRY = []
+_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels_text(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base for one metric family: name, help text, label names and values per label set"""
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labels)
+        self._values = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self):
+        """(suffix, label text, value) tuples for the exposition"""
+        with _lock:
+            items = sorted(self._values.items())
+        return [('', _labels_text(self.labelnames, key), value) for key, value in items]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_number(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """Gauge set directly, or computed at scrape time by a function returning {label values: value}"""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labels=(), func=None):
+        super().__init__(name, help_text, labels)
+        self.func = func
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self.func is not None:
+            try:
+                values = self.func()
+            except Exception as e:
+                log.exception("⚠ Metric %s failed: %s", self.name, e)
+                values = {}
+            with _lock:
+                self._values = {tuple(map(str, k)): v for k, v in values.items()}
+        return super().samples()
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with _lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        out = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                out.append(('_bucket', _labels_text(self.labelnames, key, ('le', _number(bound))), cumulative))
+            labels = _labels_text(self.labelnames, key)
+            out.append(('_sum', labels, total))
+            out.append(('_count', labels, count))
+        return out
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+    return '\n'.join(metric.render() for metric in REGISTRY) + '\n'
+
+
+# ---------------------------------------------------------------------------
+# Process metrics (read at scrape time)
+# ---------------------------------------------------------------------------
+
+def chrome_processes():
+    """Running Chrome/Chromium and chromedriver processes in this container, by kind"""
+    counts = {('chrome',): 0, ('chromedriver',): 0}
+    if not os.path.isdir('/proc'):
+        return counts
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/comm') as f:
+                comm = f.read().strip().lower()
+        except OSError:
+            continue
+        if 'chromedriver' in comm:
+            counts[('chromedriver',)] += 1
+        elif 'chrom' in comm or comm == 'headless_shell':
+            counts[('chrome',)] += 1
+    return counts
+
+
+def resident_memory():
+    """Resident set size of this worker in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return {}
+    return {(): pages * os.sysconf('SC_PAGE_SIZE')}
+
+
+# ---------------------------------------------------------------------------
+# Metric definitions
+# ---------------------------------------------------------------------------
+
+COLLECTOR_DURATION = Histogram('tender_collector_duration_seconds',
+                               'Time spent in one collector call', ['source'])
+COLLECTOR_ITEMS = Counter('tender_collector_items_total',
+                          'Items returned by collectors', ['source'])
+COLLECTOR_FAILURES = Counter('tender_collector_failures_total',
+                             'Collector calls that raised', ['source'])
+COLLECTOR_CACHE_HITS = Counter('tender_collector_cache_hits_total',
+                               'Collector calls answered by the source cache (not in the latency/items metrics)',
+                               ['source'])
+COLLECTOR_RATE = Gauge('tender_collector_items_per_second',
+                       'Items per second of the last collector call', ['source'])
+PAGES = Counter('tender_collector_pages_total',
+                'Result pages scraped by the Selenium collectors', ['source'])
+PAGE_DURATION = Histogram('tender_collector_page_duration_seconds',
+                          'Time per scraped result page', ['source'], buckets=PAGE_BUCKETS)
+BROWSER_LAUNCHES = Counter('tender_browser_launches_total',
+                           'Chrome WebDriver launches', ['status'])
+BROWSER_START = Histogram('tender_browser_start_seconds',
+                          'Chrome WebDriver start-up time', ['source'], buckets=PAGE_BUCKETS)
+CHROME_PROCESSES = Gauge('tender_chrome_processes',
+                         'Chrome and chromedriver processes currently running', ['kind'],
+                         func=chrome_processes)
+RSS_FEED_DURATION = Histogram('tender_rss_feed_duration_seconds',
+                              'Time to fetch and parse one RSS feed (retries included)',
+                              buckets=PAGE_BUCKETS)
+RSS_RESPONSES = Counter('tender_rss_responses_total',
+                        'RSS HTTP responses by status code (error = no response)', ['status'])
+RSS_RETRIES = Counter('tender_rss_retries_total', 'RSS fetch retries')
+RSS_BYTES = Counter('tender_rss_bytes_total', 'RSS response bytes received')
+EXPORT_DURATION = Histogram('tender_export_duration_seconds',
+                            'Time to write one export', ['format'])
+EXPORT_ROWS = Counter('tender_export_rows_total', 'Rows written by exports', ['format'])
+EXPORT_CACHE = Counter('tender_export_cache_requests_total',
+                       'Export cache lookups', ['result'])
+SOURCE_CACHE = Counter('tender_source_cache_requests_total',
+                       'Source cache lookups (hit, shared = waited for another worker, miss)',
+                       ['source', 'result'])
+PROCESS_MEMORY = Gauge('tender_process_resident_memory_bytes',
+                       'Resident memory of this worker', func=resident_memory)
+
+
+def observe_span(name, duration, attrs, failed=False):
+    """Timing span observer: turn finished spans into metrics (see the table above)"""
+    prefix, _, stage = name.partition('.')
+    if prefix == 'collect':
+        if failed:
+            COLLECTOR_FAILURES.inc(source=stage)
+        if attrs.get('cache') in ('hit', 'shared'):
+            # Nothing was scraped: keep the latency and throughput numbers for real fetches
+            COLLECTOR_CACHE_HITS.inc(source=stage)
+            return
+        COLLECTOR_DURATION.observe(duration, source=stage)
+        items = attrs.get('items')
+        if items is not None:
+            COLLECTOR_ITEMS.inc(items, source=stage)
+            if duration > 0:
+                COLLECTOR_RATE.set(items / duration, source=stage)
+    elif stage == 'page':
+        PAGES.inc(source=prefix)
+        PAGE_DURATION.observe(duration, source=prefix)
+    elif stage == 'chrome_start':
+        BROWSER_START.observe(duration, source=prefix)
+    elif name == 'rss.feed':
+        RSS_FEED_DURATION.observe(duration)
+    elif prefix == 'export':
+        EXPORT_DURATION.observe(duration, format=stage)
+        if attrs.get('items') is not None:
+            EXPORT_ROWS.inc(attrs['items'], format=stage)
+
+
+SPAN_OBSERVERS.append(observe_span)
@@ -0,0 +1,36 @@
+import os
+
+# Portal base URLs, overridable per portal (<PORTAL>_BASE_URL) or all at once
+# (PORTAL_BASE_URL), e.g. to point every collector at the local stub server:
+#
+#     PORTAL_BASE_URL=http://127.0.0.1:8765 python app_enhanced.py
+#
+# Read on every call so load tests can switch targets without a restart.
+PORTAL_DEFAULTS = {
+    'gebiz': 'https://www.gebiz.gov.sg',
+    'ariba': 'https://portal.us.bn.cloud.ariba.com',
+    'sesami': 'https://sesami.online',
+    'jpmc': 'https://jpmcbrunei.com',
+    'tenderboard': 'https://www.tenderboard.biz',
+    'stlogs': 'https://epro.stlogs.com',
+}
+
+
+def base_url(portal):
+    """Base URL of a portal (no trailing slash), honouring the env overrides"""
+    value = (os.environ.get(f'{portal.upper()}_BASE_URL') or os.environ.get('PORTAL_BASE_URL')
+             or PORTAL_DEFAULTS[portal])
+    return value.rstrip('/')
+
+
+def portal_url(portal, path):
+    """Absolute URL for a path on a portal, e.g. portal_url('sesami', '/bizopps/...')"""
+    return base_url(portal) + path
+
+
+def rebase(url):
+    """Move a production URL (e.g. a GeBIZ RSS feed) onto its overridden base, if any"""
+    for portal, default in PORTAL_DEFAULTS.items():
+        if url.startswith(default):
+            return base_url(portal) + url[len(default):]
+    return url
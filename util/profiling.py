@@ -0,0 +1,148 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from pathlib import Path
+
+from util.log import get_logger
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Opt-in profiling of single requests
+# ---------------------------------------------------------------------------
+# A /fetch posted with profile=1 (or every fetch, with PROFILE_FETCH=1) runs
+# under a profiler and leaves its artifacts in output/profiles/:
+#
+#     with RequestProfile('fetch-12') as prof:
+#         ...
+#     prof.paths   # [.../fetch-12-20260105-080000.html, ...-.txt]
+#
+# pyinstrument (sampling, wall clock, HTML flamegraph) is used when it is
+# installed; otherwise cProfile writes a .pstats file (snakeviz, pstats) and
+# a text summary. PROFILER=cprofile forces cProfile. Only the thread that
+# entered the block is profiled. The newest PROFILE_KEEP runs are kept.
+
+PROFILE_DIR = Path(os.environ.get('OUTPUT_DIR', 'output')) / 'profiles'
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 20))
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.005))  # pyinstrument sampling interval (s)
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def profile_requested(value=None):
+    """True if the request asked for profiling (profile=1) or PROFILE_FETCH is on"""
+    if value is not None and str(value).strip().lower() in TRUE_VALUES:
+        return True
+    return os.environ.get('PROFILE_FETCH', '').strip().lower() in TRUE_VALUES
+
+
+def _pyinstrument():
+    if os.environ.get('PROFILER', '').lower() == 'cprofile':
+        return None
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+    return Profiler
+
+
+class RequestProfile:
+    """Profile the enclosed block and save the artifacts under PROFILE_DIR"""
+
+    def __init__(self, name, folder=None):
+        self.name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+        self.folder = Path(folder) if folder else PROFILE_DIR
+        self.paths = []
+        self.kind = None
+        self._profiler = None
+
+    def __enter__(self):
+        profiler_cls = _pyinstrument()
+        try:
+            if profiler_cls is not None:
+                self._profiler = profiler_cls(interval=PROFILE_INTERVAL)
+                self._profiler.start()
+                self.kind = 'pyinstrument'
+            else:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+                self.kind = 'cprofile'
+        except Exception as e:
+            # e.g. another profiler already active in this process
+            log.warning("⚠ Profiling %s not started: %s", self.name, e)
+            self._profiler = None
+            self.kind = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is None:
+            return False
+        try:
+            self.paths = self._save()
+            log.info("🔬 Profile of %s saved: %s", self.name, ', '.join(p.name for p in self.paths))
+        except Exception as e:
+            log.warning("⚠ Saving profile of %s failed: %s", self.name, e)
+        finally:
+            self._profiler = None
+        prune(self.folder)
+        return False
+
+    def _save(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        stem = self.folder / f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}"
+        if self.kind == 'pyinstrument':
+            self._profiler.stop()
+            html = stem.with_suffix('.html')
+            html.write_text(self._profiler.output_html(), encoding='utf-8')
+            text = stem.with_suffix('.txt')
+            text.write_text(self._profiler.output_text(unicode=True, color=False), encoding='utf-8')
+            return [html, text]
+
+        self._profiler.disable()
+        stats_path = stem.with_suffix('.pstats')
+        self._profiler.dump_stats(str(stats_path))
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(60)
+        text = stem.with_suffix('.txt')
+        text.write_text(out.getvalue(), encoding='utf-8')
+        return [stats_path, text]
+
+
+def list_profiles(folder=None):
+    """Profile artifacts, newest first: dicts with name, size, modified"""
+    folder = Path(folder) if folder else PROFILE_DIR
+    if not folder.is_dir():
+        return []
+    files = sorted((p for p in folder.iterdir() if p.is_file()), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [{'name': p.name, 'size': p.stat().st_size,
+             'modified': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(p.stat().st_mtime))}
+            for p in files]
+
+
+def profile_path(name, folder=None):
+    """Path of a saved artifact by file name, or None (no path components allowed)"""
+    folder = Path(folder) if folder else PROFILE_DIR
+    if not re.fullmatch(r'[A-Za-z0-9_.-]+', name or '') or name.startswith('.'):
+        return None
+    path = folder / name
+    return path if path.is_file() else None
+
+
+def prune(folder=None, keep=PROFILE_KEEP):
+    """Keep the artifacts of the newest `keep` profiled runs"""
+    folder = Path(folder) if folder else PROFILE_DIR
+    if not folder.is_dir():
+        return
+    runs = {}
+    for p in folder.iterdir():
+        if p.is_file():
+            runs.setdefault(p.stem, []).append(p)
+    newest = sorted(runs.values(), key=lambda files: max(f.stat().st_mtime for f in files), reverse=True)
+    for files in newest[keep:]:
+        for p in files:
+            try:
+                p.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,176 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from util.log import get_logger
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Fetch results shared by all workers
+# ---------------------------------------------------------------------------
+# A /fetch stores its results under a job id (sent back in a cookie), and
+# /refilter, /export and /export/stream load them from here, so any gunicorn
+# worker can serve them:
+#
+#     store = result_store()
+#     store.put(job_id, {'items': [...], 'metadata': {...}, ...})
+#     result = store.get(job_id)          # None if unknown or expired
+#
+# Results are pickled + zlib'd into output/results.sqlite by default; with
+# REDIS_URL set (and the redis package installed) they go to Redis instead.
+# Every put bumps the job's revision; a worker keeps the last results it
+# loaded and only unpickles again when the revision changed, so get() hands
+# the same objects to every request of the worker: treat them as read-only
+# and put() a new dict to change a job. Jobs older than RESULT_TTL_HOURS are
+# dropped.
+
+RESULT_STORE_PATH = Path(os.environ.get('OUTPUT_DIR', 'output')) / 'results.sqlite'
+RESULT_TTL_HOURS = float(os.environ.get('RESULT_TTL_HOURS', 24))
+MEMO_JOBS = 4   # decoded results kept per process
+
+
+def dumps(result):
+    """Pickle + zlib (the stored form of results)"""
+    return zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def loads(blob):
+    """Inverse of dumps()"""
+    return pickle.loads(zlib.decompress(blob))
+
+
+class _Memo:
+    """Decoded results of the last MEMO_JOBS jobs, by (job id, revision); shared, read-only"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id, rev):
+        with self._lock:
+            entry = self._entries.get(job_id)
+        return entry[1] if entry and entry[0] == rev else None
+
+    def put(self, job_id, rev, result):
+        with self._lock:
+            self._entries.pop(job_id, None)
+            self._entries[job_id] = (rev, result)
+            while len(self._entries) > MEMO_JOBS:
+                self._entries.pop(next(iter(self._entries)))
+
+
+class SQLiteResultStore:
+    """Results in one SQLite file (WAL mode: readers don't block the writer)"""
+
+    def __init__(self, path=RESULT_STORE_PATH, ttl=RESULT_TTL_HOURS * 3600):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._memo = _Memo()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS results ('
+                       'job_id TEXT PRIMARY KEY, rev INTEGER NOT NULL, updated REAL NOT NULL, data BLOB NOT NULL)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def put(self, job_id, result):
+        """Store (or replace) a job's results; returns the new revision"""
+        blob = dumps(result)
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute('SELECT rev FROM results WHERE job_id = ?', (job_id,)).fetchone()
+            rev = (row[0] if row else 0) + 1
+            db.execute('INSERT OR REPLACE INTO results (job_id, rev, updated, data) VALUES (?, ?, ?, ?)',
+                       (job_id, rev, now, blob))
+            db.execute('DELETE FROM results WHERE updated < ?', (now - self.ttl,))
+        self._memo.put(job_id, rev, result)
+        return rev
+
+    def get(self, job_id):
+        """A job's results, or None"""
+        if not job_id:
+            return None
+        with self._connect() as db:
+            row = db.execute('SELECT rev FROM results WHERE job_id = ? AND updated >= ?',
+                             (job_id, time.time() - self.ttl)).fetchone()
+            if row is None:
+                return None
+            result = self._memo.get(job_id, row[0])
+            if result is not None:
+                return result
+            row = db.execute('SELECT rev, data FROM results WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        result = loads(row[1])
+        self._memo.put(job_id, row[0], result)
+        return result
+
+
+class RedisResultStore:
+    """Results in Redis (REDIS_URL), expiring after the TTL"""
+
+    PREFIX = 'tender:result:'
+
+    def __init__(self, url, ttl=RESULT_TTL_HOURS * 3600):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.client.ping()
+        self.ttl = int(ttl)
+        self._memo = _Memo()
+
+    def put(self, job_id, result):
+        key = self.PREFIX + job_id
+        pipe = self.client.pipeline(transaction=True)   # MULTI: readers never see the new rev with old data
+        pipe.hincrby(key, 'rev', 1)
+        pipe.hset(key, 'data', dumps(result))
+        pipe.expire(key, self.ttl)
+        rev = pipe.execute()[0]
+        self._memo.put(job_id, rev, result)
+        return rev
+
+    def get(self, job_id):
+        if not job_id:
+            return None
+        key = self.PREFIX + job_id
+        rev = self.client.hget(key, 'rev')
+        if rev is None:
+            return None
+        result = self._memo.get(job_id, int(rev))
+        if result is not None:
+            return result
+        rev, blob = self.client.hmget(key, 'rev', 'data')
+        if blob is None:
+            return None
+        result = loads(blob)
+        self._memo.put(job_id, int(rev), result)
+        return result
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def result_store():
+    """The process's result store (Redis if REDIS_URL is set and usable, else SQLite)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = os.environ.get('REDIS_URL')
+                if url:
+                    try:
+                        _store = RedisResultStore(url)
+                        log.info("✓ Fetch results shared via Redis")
+                    except Exception as e:
+                        log.warning("⚠ Redis result store unavailable (%s), using %s", e, RESULT_STORE_PATH)
+                if _store is None:
+                    _store = SQLiteResultStore()
+    return _store
@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+
+from util.log import get_logger
+
+log = get_logger(__name__)
+
+# Result-page snapshots for the offline parse benchmark (benchmarks/bench_snapshots.py).
+# With SNAPSHOT_DIR set, every Selenium result page a collector visits is
+# saved as <SNAPSHOT_DIR>/<portal>/page-<n>.html; without it save_page() is a no-op.
+
+
+def snapshot_dir():
+    value = os.environ.get('SNAPSHOT_DIR')
+    return Path(value) if value else None
+
+
+def save_page(driver, portal, page, suffix=''):
+    """
+    Save the current page source of a collector's driver.
+
+    Args:
+        driver: Selenium WebDriver
+        portal: 'gebiz', 'ariba', 'sesami', 'tenderboard', ...
+        page: result page number
+        suffix: optional extra name part (e.g. the GeBIZ search type)
+
+    Returns:
+        Path or None: the written file
+    """
+    root = snapshot_dir()
+    if root is None:
+        return None
+    try:
+        folder = root / portal
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"page-{page}{'-' + suffix if suffix else ''}.html"
+        path.write_text(driver.page_source, encoding='utf-8')
+        log.debug("📸 Saved %s page %s -> %s", portal, page, path)
+        return path
+    except Exception as e:
+        log.warning("⚠ Snapshot of %s page %s failed: %s", portal, page, e)
+        return None
@@ -0,0 +1,267 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from util.log import get_logger
+from util.metrics import SOURCE_CACHE
+from util.result_store import dumps, loads
+from util.timing import current_span
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Per-source response cache
+# ---------------------------------------------------------------------------
+# Raw collector results are kept for SOURCE_CACHE_TTL_MINUTES, keyed by
+# source, category set and date window, and shared by all workers through
+# output/source_cache.sqlite:
+#
+#     items = cached_fetch('gebiz_selenium:BO', lambda cats: client.fetch_advanced(..., categories=cats),
+#                          start=e_start, end=e_end, categories=cat_map['BO'],
+#                          item_category=gebiz_item_category)
+#
+# A request is served from any fresh entry whose categories include the
+# requested ones and whose window covers the requested days (up to the time
+# that entry was fetched). Items of categories that were not requested are
+# dropped via item_category; the date window is applied by the caller's
+# post-filter as usual. While one worker scrapes, others asking for a covered
+# request wait for its result instead of starting the same scrape, for up to
+# SOURCE_CACHE_WAIT_SECONDS; after that (or once the other scrape has been
+# running that long) they scrape themselves. Items are returned as stored:
+# callers that edit them copy them first.
+#
+# The enclosing collect.<source> span gets cache='hit'/'shared'/'miss', so
+# /metrics doesn't count cache answers as collector latency.
+#
+# SOURCE_CACHE_TTL_MINUTES=0 disables the cache.
+
+SOURCE_CACHE_PATH = Path(os.environ.get('OUTPUT_DIR', 'output')) / 'source_cache.sqlite'
+SOURCE_CACHE_TTL_MINUTES = float(os.environ.get('SOURCE_CACHE_TTL_MINUTES', 30))
+SOURCE_CACHE_WAIT_SECONDS = float(os.environ.get('SOURCE_CACHE_WAIT_SECONDS', 60))
+POLL_SECONDS = 2
+
+
+def _day(value):
+    """datetime/date/'YYYY-MM-DD' -> 'YYYY-MM-DD' ('' for open ends)"""
+    if not value:
+        return ''
+    if isinstance(value, str):
+        return value[:10]
+    return value.strftime('%Y-%m-%d')
+
+
+class SourceCache:
+    """Collector results by (source, categories, window) in SQLite, with TTL and superset lookups"""
+
+    def __init__(self, path=SOURCE_CACHE_PATH, ttl=SOURCE_CACHE_TTL_MINUTES * 60,
+                 wait=SOURCE_CACHE_WAIT_SECONDS):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.wait = wait
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS entries ('
+                       'id TEXT PRIMARY KEY, source TEXT NOT NULL, categories TEXT, '
+                       'start TEXT NOT NULL, end TEXT NOT NULL, fetched REAL NOT NULL, '
+                       'status TEXT NOT NULL, data BLOB)')
+            db.execute('CREATE INDEX IF NOT EXISTS entries_source ON entries (source, fetched)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _covering(self, db, source, categories, start, end, status, exact=False):
+        """Fresh entries (of a status) that cover the request, fewest categories first"""
+        now = time.time()
+        max_age = self.ttl if status == 'ready' else self.wait
+        rows = db.execute('SELECT id, categories, start, end, fetched FROM entries '
+                          'WHERE source = ? AND status = ? AND fetched >= ?',
+                          (source, status, now - max_age)).fetchall()
+        found = []
+        for entry_id, cats_json, c_start, c_end, fetched in rows:
+            cats = None if cats_json is None else set(json.loads(cats_json))
+            if categories is not None and (cats is None or not categories <= cats
+                                           or (exact and cats != categories)):
+                continue
+            if categories is None and cats is not None:
+                continue
+            # Days after the entry was fetched can't be in it; up to then an open end is covered
+            fetched_day = datetime.fromtimestamp(fetched).strftime('%Y-%m-%d')
+            wanted_end = min(end or fetched_day, fetched_day)
+            if (c_start and (not start or start < c_start)) or (c_end and c_end < wanted_end):
+                continue
+            found.append((len(cats) if cats else 0, entry_id, cats))
+        return [(entry_id, cats) for _, entry_id, cats in sorted(found, key=lambda f: f[0])]
+
+    def lookup(self, source, categories=None, start=None, end=None, exact=False):
+        """(items, cached categories) from a covering entry (exact: same categories only), or None"""
+        with self._connect() as db:
+            for entry_id, cats in self._covering(db, source, categories, _day(start), _day(end), 'ready', exact):
+                row = db.execute('SELECT data FROM entries WHERE id = ?', (entry_id,)).fetchone()
+                if row is not None:
+                    return loads(row[0]), cats
+        return None
+
+    def pending(self, source, categories=None, start=None, end=None, exact=False):
+        """True if another fetch that will cover the request is running"""
+        with self._connect() as db:
+            return bool(self._covering(db, source, categories, _day(start), _day(end), 'pending', exact))
+
+    def begin(self, source, categories=None, start=None, end=None):
+        """Mark a fetch as running (so others wait for it); returns its entry id"""
+        entry_id = uuid.uuid4().hex
+        cats = None if categories is None else json.dumps(sorted(categories))
+        with self._connect() as db:
+            db.execute('INSERT INTO entries (id, source, categories, start, end, fetched, status) '
+                       'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (entry_id, source, cats, _day(start), _day(end), time.time(), 'pending'))
+        return entry_id
+
+    def finish(self, entry_id, items):
+        """Store a finished fetch's items (None: the fetch failed, drop the marker)"""
+        now = time.time()
+        with self._connect() as db:
+            if items is None:
+                db.execute('DELETE FROM entries WHERE id = ?', (entry_id,))
+            else:
+                db.execute("UPDATE entries SET status = 'ready', fetched = ?, data = ? WHERE id = ?",
+                           (now, dumps(items), entry_id))
+            db.execute("DELETE FROM entries WHERE (status = 'ready' AND fetched < ?) "
+                       "OR (status = 'pending' AND fetched < ?)", (now - self.ttl, now - self.wait))
+
+
+_cache = None
+
+
+def source_cache():
+    """The process's SourceCache, or None when disabled (SOURCE_CACHE_TTL_MINUTES=0)"""
+    global _cache
+    if SOURCE_CACHE_TTL_MINUTES <= 0:
+        return None
+    if _cache is None:
+        _cache = SourceCache()
+    return _cache
+
+
+def _subset(items, requested, cached, item_category):
+    """Items of the requested categories (items whose category is unknown are kept)"""
+    if item_category is None or cached is None or requested == cached:
+        return items
+    kept = []
+    for item in items:
+        category = item_category(item, cached)
+        if category is None or category in requested:
+            kept.append(item)
+    return kept
+
+
+def _mark_span(result):
+    """Record the cache result on the enclosing span (a miss wins over hits of other calls)"""
+    attrs = current_span()
+    if attrs is not None and attrs.get('cache') != 'miss':
+        attrs['cache'] = result
+
+
+def cached_fetch(source, fetch, start=None, end=None, categories=None, item_category=None, refresh=False):
+    """
+    Run a collector through the source cache.
+
+    Args:
+        source: cache namespace, including any option that changes the results
+            (e.g. 'gebiz_selenium:BO', 'ariba:last_7_days:10')
+        fetch: fetch(categories) -> items, called on a miss with the requested categories
+        start, end: date window the collector searches (datetime or 'YYYY-MM-DD'; None = open)
+        categories: requested categories/feeds (None for sources without any)
+        item_category: item_category(item, cached_categories) -> the item's category among
+            cached_categories, or None if unknown; needed to answer from a larger entry
+        refresh: skip the lookup (the result is still stored for others)
+
+    Returns:
+        list: items
+    """
+    cache = source_cache()
+    if cache is None:
+        return fetch(sorted(categories) if categories is not None else None)
+    requested = None if categories is None else set(categories)
+    # A larger cached entry can only be narrowed when items can be attributed to categories
+    exact = item_category is None
+
+    def from_cache():
+        if refresh:
+            return None
+        try:
+            found = cache.lookup(source, requested, start, end, exact)
+        except Exception as e:
+            log.warning("⚠ Source cache lookup for %s failed: %s", source, e)
+            return None
+        if found is None:
+            return None
+        items, cached = found
+        return _subset(items, requested, cached, item_category)
+
+    items = from_cache()
+    if items is not None:
+        SOURCE_CACHE.inc(source=source, result='hit')
+        _mark_span('hit')
+        log.info("♻ %s: %d items from the source cache", source, len(items))
+        return items
+
+    # Someone else is scraping a covering request: wait for it rather than scrape twice,
+    # but only up to cache.wait, then fall through to a direct fetch
+    if not refresh:
+        deadline = time.monotonic() + cache.wait
+        try:
+            while cache.pending(source, requested, start, end, exact) and time.monotonic() < deadline:
+                time.sleep(POLL_SECONDS)
+                items = from_cache()
+                if items is not None:
+                    SOURCE_CACHE.inc(source=source, result='shared')
+                    _mark_span('shared')
+                    log.info("♻ %s: %d items shared from a concurrent fetch", source, len(items))
+                    return items
+        except Exception as e:
+            log.warning("⚠ Source cache wait for %s failed: %s", source, e)
+        items = from_cache()
+        if items is not None:
+            SOURCE_CACHE.inc(source=source, result='shared')
+            _mark_span('shared')
+            return items
+
+    SOURCE_CACHE.inc(source=source, result='miss')
+    _mark_span('miss')
+    try:
+        entry_id = cache.begin(source, requested, start, end)
+    except Exception as e:
+        log.warning("⚠ Source cache unavailable for %s: %s", source, e)
+        return fetch(sorted(requested) if requested is not None else None)
+    items = None
+    try:
+        items = fetch(sorted(requested) if requested is not None else None)
+        return items
+    finally:
+        try:
+            cache.finish(entry_id, items)
+        except Exception as e:
+            log.warning("⚠ Storing %s in the source cache failed: %s", source, e)
+
+
+def gebiz_item_category(item, categories):
+    """'Main > Sub' of a GeBIZ search result among categories, from its Procurement Category text"""
+    text = item.get('category') or ''
+    by_sub = [c for c in categories if c.split(' > ')[-1] in text]
+    both = [c for c in by_sub if c.split(' > ')[0] in text]
+    if len(both) == 1:
+        return both[0]
+    if len(by_sub) == 1:
+        return by_sub[0]
+    return None
+
+
+def feed_item_category(item, feed_urls):
+    """The feed URL an RSS item came from"""
+    url = item.get('feed_url')
+    return url if url in feed_urls else None
@@ -0,0 +1,229 @@
+import itertools
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+
+from util.log import get_logger
+
+log = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Per-run timing spans
+# ---------------------------------------------------------------------------
+# A run (one /fetch or /export request) collects spans for every stage:
+#
+#     run = start_run('fetch')
+#     with span('collect.ariba'):
+#         ...
+#     run.finish()
+#
+# Spans opened while no run is active are not recorded, so library code
+# (collectors, normalize, exporters) can be instrumented unconditionally.
+# The last MAX_RUNS runs are kept for /timings, in the process that ran
+# them: under gunicorn /timings lists the runs of whichever worker answers,
+# and a run id ('<pid>-<n>') is only found on its own worker (404 on the
+# others, never another worker's run). A fetch's totals also go into the
+# Settings sheet of its exports, which any worker can serve.
+#
+# Finished spans are also passed to SPAN_OBSERVERS (util/metrics.py feeds
+# /metrics from them), with or without a run. The with-block gets the
+# span's attrs dict and may add results to it:
+#
+#     with span('collect.ariba') as s:
+#         items = fetch()
+#         s['items'] = len(items)
+#
+# Code further down can annotate the innermost open span via current_span()
+# (util/source_cache.py marks collector spans answered from the cache).
+
+MAX_RUNS = 20
+RUNS = deque(maxlen=MAX_RUNS)
+
+# Callables observer(name, duration, attrs, failed) called for every finished span
+SPAN_OBSERVERS = []
+
+_current_run = ContextVar('timing_run', default=None)
+_current_attrs = ContextVar('timing_span_attrs', default=None)
+_run_ids = itertools.count(1)
+
+
+class Run:
+    """Spans recorded during one run"""
+
+    def __init__(self, name):
+        self.id = f"{os.getpid()}-{next(_run_ids)}"   # unique across workers
+        self.name = name
+        self.started = datetime.now()
+        self.spans = []   # dicts: name, start (s since run start), duration, depth, attrs
+        self.duration = None
+        self._t0 = time.perf_counter()
+        self._depth = 0
+        self._token = None
+
+    def finish(self):
+        """Stop the run clock and detach the run from the current context"""
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._t0
+        if self._token is not None:
+            _current_run.reset(self._token)
+            self._token = None
+        return self
+
+    def summary(self):
+        """
+        Totals per span name (first-seen order)
+
+        Returns:
+            list: dicts with name, calls, total, max (seconds)
+        """
+        totals = {}
+        for s in self.spans:
+            entry = totals.setdefault(s['name'], {'name': s['name'], 'calls': 0, 'total': 0.0, 'max': 0.0})
+            entry['calls'] += 1
+            entry['total'] += s['duration']
+            entry['max'] = max(entry['max'], s['duration'])
+        return list(totals.values())
+
+    def metadata(self):
+        """Summary as Settings-sheet rows ('Timing: <span>' -> '1.23s (3x, max 0.80s)')"""
+        rows = {'Timing: total': f"{self.elapsed():.2f}s"}
+        for entry in self.summary():
+            text = f"{entry['total']:.2f}s"
+            if entry['calls'] > 1:
+                text += f" ({entry['calls']}x, max {entry['max']:.2f}s)"
+            rows[f"Timing: {entry['name']}"] = text
+        return rows
+
+    def elapsed(self):
+        return self.duration if self.duration is not None else time.perf_counter() - self._t0
+
+    def to_dict(self, spans=True):
+        data = {
+            'id': self.id,
+            'name': self.name,
+            'started': self.started.strftime('%Y-%m-%d %H:%M:%S'),
+            'duration': round(self.elapsed(), 4),
+            'finished': self.duration is not None,
+            'summary': [{**e, 'total': round(e['total'], 4), 'max': round(e['max'], 4)} for e in self.summary()],
+        }
+        if spans:
+            data['spans'] = [{**s, 'start': round(s['start'], 4), 'duration': round(s['duration'], 4)}
+                             for s in self.spans]
+        return data
+
+
+def start_run(name):
+    """Start a run and make it current for this context (thread/request)"""
+    run = Run(name)
+    run._token = _current_run.set(run)
+    RUNS.append(run)
+    return run
+
+
+def current_run():
+    return _current_run.get()
+
+
+def current_span():
+    """attrs dict of the innermost open span in this context, or None"""
+    return _current_attrs.get()
+
+
+def get_run(run_id):
+    for run in RUNS:
+        if run.id == run_id:
+            return run
+    return None
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Time the enclosed block as a span of the current run and report it to
+    SPAN_OBSERVERS (no-op when there is neither). Yields the attrs dict.
+    """
+    run = _current_run.get()
+    if run is None and not SPAN_OBSERVERS:
+        yield attrs
+        return
+    start = time.perf_counter()
+    failed = False
+    if run is not None:
+        run._depth += 1
+    outer = _current_attrs.get()
+    _current_attrs.set(attrs)
+    try:
+        yield attrs
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        end = time.perf_counter()
+        _current_attrs.set(outer)
+        if run is not None:
+            run._depth -= 1
+            run.spans.append({'name': name, 'start': start - run._t0, 'duration': end - start,
+                              'depth': run._depth, 'attrs': attrs})
+        for observer in SPAN_OBSERVERS:
+            try:
+                observer(name, end - start, attrs, failed)
+            except Exception as e:
+                log.exception("⚠ Span observer failed for %s: %s", name, e)
+
+
+def timed(name=None):
+    """Decorator: every call of the function is a span (default name: module.function)"""
+    def wrap(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+
+class OpenSpan:
+    """A span started with start_span(); end() records it (once)"""
+
+    def __init__(self, name, attrs):
+        self._cm = span(name, **attrs)
+        self._cm.__enter__()
+
+    def end(self):
+        if self._cm is not None:
+            self._cm.__exit__(None, None, None)
+            self._cm = None
+
+
+def start_span(name, **attrs):
+    """Span for code that can't be wrapped in a with-block; call .end() when done"""
+    return OpenSpan(name, attrs)
+
+
+class Laps:
+    """
+    Consecutive spans for loop iterations that exit in many places (pagination):
+    next() ends the previous lap and starts a new one, close() ends the last.
+    """
+    def __init__(self, name):
+        self.name = name
+        self._span = None
+
+    def next(self, **attrs):
+        self.close()
+        self._span = start_span(self.name, **attrs)
+
+    def close(self):
+        if self._span is not None:
+            self._span.end()
+            self._span = None
+
+
+def laps(name):
+    return Laps(name)